@@ -0,0 +1,73 @@
+from django.contrib import admin
+
+from django_project.admin_filters import ReferenceListFilter
+from django_project.reference import reference_table
+from .models import (
+    Accommodation,
+    Amenity,
+    Institution,
+    PaymentMethod,
+    PropertyType,
+    RentStatistic,
+)
+
+
+class PropertyTypeFilter(ReferenceListFilter):
+    title = "property type"
+    parameter_name = "property_type"
+    model = PropertyType
+
+
+class InstitutionFilter(ReferenceListFilter):
+    title = "institution"
+    parameter_name = "educational_institutions"
+    model = Institution
+    lookup = "name"
+
+
+@admin.register(Accommodation)
+class AccommodationAdmin(admin.ModelAdmin):
+    list_display = [
+        "title",
+        "city",
+        "property_type_label",
+        "monthly_rent",
+        "is_available",
+        "is_verified",
+        "created_at",
+    ]
+    list_filter = [
+        "is_available",
+        "is_verified",
+        "furnished",
+        "gender_restriction",
+        PropertyTypeFilter,
+        InstitutionFilter,
+    ]
+    search_fields = ["title", "city", "address"]
+    prepopulated_fields = {"slug": ["title"]}
+    raw_id_fields = ["owner"]
+    filter_horizontal = ["educational_institutions", "amenities", "accepted_payments"]
+
+    @admin.display(description="property type", ordering="property_type__name")
+    def property_type_label(self, obj):
+        # From the registry, so the changelist needs no join per row.
+        return reference_table(PropertyType).get().labels.get(obj.property_type_id)
+
+
+@admin.register(Institution)
+class InstitutionAdmin(admin.ModelAdmin):
+    list_display = ["__str__", "name", "city", "province", "latitude", "longitude"]
+    list_filter = ["province"]
+
+
+@admin.register(PropertyType, PaymentMethod, Amenity)
+class LookupAdmin(admin.ModelAdmin):
+    list_display = ["__str__", "name", "description"]
+
+
+@admin.register(RentStatistic)
+class RentStatisticAdmin(admin.ModelAdmin):
+    list_display = ["dimension", "key", "metric", "count", "median", "computed_at"]
+    list_filter = ["dimension", "metric"]
+    search_fields = ["key"]
@@ -0,0 +1,82 @@
+"""
+Async twins of the public views in accomodations.api.views, served instead of
+them when ``settings.ASYNC_PUBLIC_API`` is on (see django_project.async_views).
+"""
+
+from django.conf import settings
+from rest_framework.response import Response
+
+from django_project.async_views import AsyncListView, AsyncRetrieveView
+from django_project.cache import acache_response
+from django_project.conditional import aconditional_get
+from django_project.sparse_fields import nested_field_names, sparse_representation
+from ..models import AccommodationListing
+from . import views
+from .serializers import AccommodationDetailSerializer
+
+
+class BaseListView(AsyncListView):
+    @aconditional_get
+    @acache_response(local=True)
+    async def get(self, request, *args, **kwargs):
+        return await self.respond(self.list)
+
+
+class InstitutionListView(BaseListView):
+    view_class = views.InstitutionListView
+
+
+class PropertyTypeListView(BaseListView):
+    view_class = views.PropertyTypeListView
+
+
+class PaymentMethodListView(BaseListView):
+    view_class = views.PaymentMethodListView
+
+
+class AmenityListView(BaseListView):
+    view_class = views.AmenityListView
+
+
+class AccommodationListView(AsyncListView):
+    view_class = views.AccommodationListView
+
+    @acache_response()
+    async def get(self, request, *args, **kwargs):
+        return await self.respond(self.list)
+
+
+class RentStatisticListView(AsyncListView):
+    view_class = views.RentStatisticListView
+
+    async def get(self, request, *args, **kwargs):
+        return await self.respond(self.list)
+
+
+class AccommodationDetailView(AsyncRetrieveView):
+    view_class = views.AccommodationDetailView
+
+    @aconditional_get
+    @acache_response()
+    async def get(self, request, *args, **kwargs):
+        return await self.respond(self.retrieve)
+
+    async def retrieve(self):
+        if settings.ACCOMMODATION_READ_MODEL:
+            view = self.api_view
+            detail_data = (
+                await AccommodationListing.objects.filter(
+                    slug=view.kwargs[view.lookup_field]
+                )
+                .values_list("detail_data", flat=True)
+                .afirst()
+            )
+            if detail_data is not None:
+                return Response(
+                    sparse_representation(
+                        detail_data,
+                        view.request,
+                        nested_field_names(AccommodationDetailSerializer),
+                    )
+                )
+        return await super().retrieve()
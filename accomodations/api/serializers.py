@@ -1,38 +1,50 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
+
+from django_project.reference import ReferencePrimaryKeyField, ReferenceSerializer
+from django_project.sparse_fields import (
+    SparseFieldsMixin,
+    nested_field_names,
+    sparse_representation,
+)
 from ..models import (
     Institution,
     PropertyType,
     PaymentMethod,
     Amenity,
     Accommodation,
+    AccommodationListing,
+    RentStatistic,
 )
+from ..constants import INSTITUTION_LABELS, PROPERTY_TYPE_LABELS
+from ..validators import validate_listing_terms
 
 
-class InstitutionSerializer(serializers.ModelSerializer):
+class InstitutionSerializer(ReferenceSerializer):
     class Meta:
         model = Institution
         fields = ["id", "name", "city", "province"]
 
 
-class PropertyTypeSerializer(serializers.ModelSerializer):
+class PropertyTypeSerializer(ReferenceSerializer):
     class Meta:
         model = PropertyType
         fields = ["id", "name", "description"]
 
 
-class PaymentMethodSerializer(serializers.ModelSerializer):
+class PaymentMethodSerializer(ReferenceSerializer):
     class Meta:
         model = PaymentMethod
         fields = ["id", "name", "description"]
 
 
-class AmenitySerializer(serializers.ModelSerializer):
+class AmenitySerializer(ReferenceSerializer):
     class Meta:
         model = Amenity
         fields = ["id", "name", "description"]
 
 
-class AccommodationListSerializer(serializers.ModelSerializer):
+class AccommodationListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     property_type = PropertyTypeSerializer(read_only=True)
     educational_institutions = InstitutionSerializer(many=True, read_only=True)
     amenities = AmenitySerializer(many=True, read_only=True)
@@ -60,7 +72,7 @@ class AccommodationListSerializer(serializers.ModelSerializer):
         ]
 
 
-class AccommodationDetailSerializer(serializers.ModelSerializer):
+class AccommodationDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     property_type = PropertyTypeSerializer(read_only=True)
     educational_institutions = InstitutionSerializer(many=True, read_only=True)
     amenities = AmenitySerializer(many=True, read_only=True)
@@ -100,7 +112,30 @@ class AccommodationDetailSerializer(serializers.ModelSerializer):
         ]
 
 
+class AccommodationListingSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer returning the pre-rendered AccommodationListing payload.
+
+    Accommodations without a read-model row (not yet rebuilt) are rendered
+    live with ``fallback_class`` so the response shape never changes.
+    """
+
+    fallback_class = AccommodationListSerializer
+
+    def to_representation(self, instance):
+        try:
+            data = instance.listing.list_data
+        except AccommodationListing.DoesNotExist:
+            return self.fallback_class(instance, context=self.context).data
+        return sparse_representation(
+            data, self.context.get("request"), nested_field_names(self.fallback_class)
+        )
+
+
 class AccommodationCreateUpdateSerializer(serializers.ModelSerializer):
+    # Property type and the many-to-many lookups validate against the registry.
+    serializer_related_field = ReferencePrimaryKeyField
+
     class Meta:
         model = Accommodation
         fields = [
@@ -113,6 +148,7 @@ class AccommodationCreateUpdateSerializer(serializers.ModelSerializer):
             "province",
             "postal_code",
             "monthly_rent",
+            "admin_fee",
             "deposit_amount",
             "max_occupants",
             "bathrooms",
@@ -133,32 +169,10 @@ class AccommodationCreateUpdateSerializer(serializers.ModelSerializer):
         """
         Comprehensive validation for accommodation data.
         """
-        # Validate rent and deposit
-        if data.get("monthly_rent", 0) <= 0:
-            raise serializers.ValidationError(
-                {"monthly_rent": "Rent must be a positive value."}
-            )
-
-        if data.get("deposit_amount", 0) < 0:
-            raise serializers.ValidationError(
-                {"deposit_amount": "Deposit cannot be negative."}
-            )
-
-        # Validate occupancy
-        if data.get("max_occupants", 1) < 1:
-            raise serializers.ValidationError(
-                {"max_occupants": "At least one occupant is required."}
-            )
-
-        # Validate available from date
-        from datetime import date
-
-        available_from = data.get("available_from")
-        if available_from and available_from < date.today():
-            raise serializers.ValidationError(
-                {"available_from": "Available date must be in the future."}
-            )
-
+        try:
+            validate_listing_terms(data)
+        except DjangoValidationError as error:
+            raise serializers.ValidationError(error.message_dict)
         return data
 
     def create(self, validated_data):
@@ -206,3 +220,32 @@ class AccommodationCreateUpdateSerializer(serializers.ModelSerializer):
             instance.accepted_payments.set(accepted_payments)
 
         return instance
+
+
+class RentStatisticSerializer(serializers.ModelSerializer):
+    label = serializers.SerializerMethodField()
+
+    key_labels = {
+        "institution": INSTITUTION_LABELS,
+        "property_type": PROPERTY_TYPE_LABELS,
+    }
+
+    class Meta:
+        model = RentStatistic
+        fields = [
+            "dimension",
+            "key",
+            "label",
+            "metric",
+            "count",
+            "minimum",
+            "p25",
+            "median",
+            "p75",
+            "maximum",
+            "histogram",
+            "computed_at",
+        ]
+
+    def get_label(self, obj) -> str:
+        return self.key_labels.get(obj.dimension, {}).get(obj.key, obj.key)
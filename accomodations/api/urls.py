@@ -1,16 +1,17 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from . import async_views, views
 from .views import (
-    InstitutionListView,
-    PropertyTypeListView,
-    PaymentMethodListView,
-    AmenityListView,
-    AccommodationListView,
-    AccommodationDetailView,
+    AccommodationFacetsView,
+    AccommodationExportView,
     LandlordAccommodationViewSet,
 )
 
+# Public reads are served by the async twins of their views under ASGI.
+public = async_views if settings.ASYNC_PUBLIC_API else views
+
 # Create a router for landlord accommodation viewset
 router = DefaultRouter()
 router.register(
@@ -21,19 +22,48 @@ router.register(
 
 urlpatterns = [
     # Public Metadata Endpoints
-    path("institutions/", InstitutionListView.as_view(), name="Institution-list"),
-    path("property-types/", PropertyTypeListView.as_view(), name="property-type-list"),
     path(
-        "payment-methods/", PaymentMethodListView.as_view(), name="payment-method-list"
+        "institutions/",
+        public.InstitutionListView.as_view(),
+        name="Institution-list",
+    ),
+    path(
+        "property-types/",
+        public.PropertyTypeListView.as_view(),
+        name="property-type-list",
     ),
-    path("amenities/", AmenityListView.as_view(), name="amenity-list"),
+    path(
+        "payment-methods/",
+        public.PaymentMethodListView.as_view(),
+        name="payment-method-list",
+    ),
+    path("amenities/", public.AmenityListView.as_view(), name="amenity-list"),
     # Public Accommodation Endpoints
-    path("accommodations/", AccommodationListView.as_view(), name="accommodation-list"),
+    path(
+        "accommodations/",
+        public.AccommodationListView.as_view(),
+        name="accommodation-list",
+    ),
+    path(
+        "accommodations/facets/",
+        AccommodationFacetsView.as_view(),
+        name="accommodation-facets",
+    ),
+    path(
+        "accommodations/export/",
+        AccommodationExportView.as_view(),
+        name="accommodation-export",
+    ),
     path(
         "accommodations/<slug:slug>/",
-        AccommodationDetailView.as_view(),
+        public.AccommodationDetailView.as_view(),
         name="accommodation-detail",
     ),
+    path(
+        "rent-statistics/",
+        public.RentStatisticListView.as_view(),
+        name="rent-statistic-list",
+    ),
     # Landlord Accommodation Endpoints
     path("", include(router.urls)),
 ]
@@ -1,34 +1,110 @@
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
 
 
-from rest_framework import viewsets, generics, permissions, filters as drf_filters
-from rest_framework.exceptions import PermissionDenied
+from rest_framework import viewsets, generics, permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
 
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
-from ..models import Accommodation, Institution, PropertyType, PaymentMethod, Amenity
+from django_project.cache import (
+    NamespacedCacheMixin,
+    cache_response,
+    fill_reads,
+    model_namespace,
+    object_namespace,
+)
+from django_project.conditional import (
+    NamespaceValidatorsMixin,
+    UpdatedAtValidatorsMixin,
+    conditional_get,
+)
+from django_project.exports import EXPORT_FORMAT_PARAM, StreamingExportMixin
+from django_project.metrics import SerializerTimingMixin
+from django_project.pagination import ListingPagination
+from django_project.sparse_fields import (
+    SparseQuerysetMixin,
+    nested_field_names,
+    sparse_representation,
+)
+from django_project.values_serialization import ValuesListMixin
+from ..models import (
+    Accommodation,
+    AccommodationListing,
+    Institution,
+    PropertyType,
+    PaymentMethod,
+    Amenity,
+    RentStatistic,
+)
 from .serializers import (
     AccommodationListSerializer,
+    AccommodationListingSerializer,
     AccommodationDetailSerializer,
     AccommodationCreateUpdateSerializer,
     InstitutionSerializer,
     PropertyTypeSerializer,
     PaymentMethodSerializer,
     AmenitySerializer,
+    RentStatisticSerializer,
+)
+from ..bulk import (
+    RELATION_FIELDS,
+    apply_values,
+    insert_accommodations,
+    refresh_derived_data,
+    update_accommodations,
+)
+from ..facets import compute_facets, facet_cache_key
+from ..filters import (
+    AccommodationFilter,
+    AccommodationOrderingFilter,
+    AccommodationSearchFilter,
+    RentStatisticFilter,
 )
-from ..filters import AccommodationFilter
+
+# Lookup tables embedded in accommodation payloads.
+LOOKUP_NAMESPACES = [
+    model_namespace(model)
+    for model in (Institution, PropertyType, PaymentMethod, Amenity)
+]
+ACCOMMODATION_LIST_NAMESPACES = [model_namespace(Accommodation), *LOOKUP_NAMESPACES]
+# Most listings one batch request may create or update.
+BATCH_MAX_ITEMS = 200
+
+
+def batch_columns(rows):
+    """
+    The instances of ``(index, accommodation, relations)`` batch rows and
+    their related ids per relation, as accomodations.bulk takes them.
+    """
+    return (
+        [accommodation for _, accommodation, _ in rows],
+        {
+            relation: [related[relation] for _, _, related in rows]
+            for relation in RELATION_FIELDS
+        },
+    )
 
 
-class BaseListView(generics.ListAPIView):
+class BaseListView(
+    SerializerTimingMixin,
+    NamespaceValidatorsMixin,
+    NamespacedCacheMixin,
+    generics.ListAPIView,
+):
     """
     Base class for list views with common configurations.
     """
 
     permission_classes = [permissions.AllowAny]
 
-    @method_decorator(cache_page(60 * 15))
+    @conditional_get
+    @cache_response(local=True)
     def list(self, request, *args, **kwargs):
         """
         Cached list method with optional caching.
@@ -52,6 +128,7 @@ class InstitutionListView(BaseListView):
         return Institution.objects.distinct()
 
     serializer_class = InstitutionSerializer
+    cache_namespaces = [model_namespace(Institution)]
 
 
 class PropertyTypeListView(BaseListView):
@@ -69,6 +146,7 @@ class PropertyTypeListView(BaseListView):
         return PropertyType.objects.distinct()
 
     serializer_class = PropertyTypeSerializer
+    cache_namespaces = [model_namespace(PropertyType)]
 
 
 class PaymentMethodListView(BaseListView):
@@ -86,6 +164,7 @@ class PaymentMethodListView(BaseListView):
         return PaymentMethod.objects.distinct()
 
     serializer_class = PaymentMethodSerializer
+    cache_namespaces = [model_namespace(PaymentMethod)]
 
 
 class AmenityListView(BaseListView):
@@ -101,31 +180,61 @@ class AmenityListView(BaseListView):
         return Amenity.objects.distinct()
 
     serializer_class = AmenitySerializer
+    cache_namespaces = [model_namespace(Amenity)]
 
 
-class AccommodationListView(generics.ListAPIView):
+class AccommodationListView(
+    SerializerTimingMixin,
+    NamespacedCacheMixin,
+    SparseQuerysetMixin,
+    ValuesListMixin,
+    generics.ListAPIView,
+):
     """
     Comprehensive accommodation listing with advanced filtering.
     """
 
-    queryset = (
-        Accommodation.objects.select_related("property_type")
-        .prefetch_related("educational_institutions", "amenities", "accepted_payments")
-        .filter(is_available=True)
-    )
+    queryset = Accommodation.objects.filter(is_available=True)
+    sparse_prefetch_related = ["educational_institutions", "amenities"]
     serializer_class = AccommodationListSerializer
     permission_classes = [permissions.AllowAny]
     filterset_class = AccommodationFilter
+    pagination_class = ListingPagination
 
     filter_backends = [
-        drf_filters.SearchFilter,
-        drf_filters.OrderingFilter,
-        DjangoFilterBackend,  # Use DjangoFilterBackend for compatibility
+        DjangoFilterBackend,  # Annotates distance, so it runs before ordering
+        AccommodationOrderingFilter,
+        AccommodationSearchFilter,  # Ranks results, so it runs after ordering
     ]
 
     search_fields = ["title", "description", "address", "city", "province"]
-    ordering_fields = ["monthly_rent", "created_at"]
+    ordering_fields = ["monthly_rent", "created_at", "distance"]
     ordering = ["-created_at"]
+    keyset_ordering_fields = ["monthly_rent", "created_at"]
+    cache_namespaces = ACCOMMODATION_LIST_NAMESPACES
+
+    def use_read_model(self):
+        return settings.ACCOMMODATION_READ_MODEL and not getattr(
+            self, "swagger_fake_view", False
+        )
+
+    def get_queryset(self):
+        """
+        Serve rows from the AccommodationListing read model when it is enabled.
+        """
+        if self.use_read_model():
+            return Accommodation.objects.select_related("listing").filter(
+                is_available=True
+            )
+        return super().get_queryset()
+
+    def get_serializer_class(self):
+        if self.use_read_model():
+            return AccommodationListingSerializer
+        return super().get_serializer_class()
+
+    def use_values_serialization(self):
+        return super().use_values_serialization() and not self.use_read_model()
 
     @extend_schema(
         description="Search and filter accommodations",
@@ -133,7 +242,31 @@ class AccommodationListView(generics.ListAPIView):
         parameters=[
             OpenApiParameter(
                 name="search",
-                description="Search across title, description, address",
+                description=(
+                    "Full-text search across title, city, province, address and "
+                    "description, ranked by relevance unless ordering is given"
+                ),
+                required=False,
+            ),
+            OpenApiParameter(
+                name="near",
+                description=(
+                    "Institution id or code; only listings within radius_km "
+                    "(default 10) of it, orderable with ordering=distance"
+                ),
+                required=False,
+            ),
+            OpenApiParameter(
+                name="fields",
+                description="Comma-separated fields to return, e.g. id,title,slug",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="expand",
+                description=(
+                    "Comma-separated nested fields to include when fields is "
+                    "given; on its own, returns all scalars plus these"
+                ),
                 required=False,
             ),
             OpenApiParameter(
@@ -144,7 +277,7 @@ class AccommodationListView(generics.ListAPIView):
             ),
         ],
     )
-    @method_decorator(cache_page(60 * 15))
+    @cache_response()
     def list(self, request, *args, **kwargs):
         """
         Cached list method with advanced filtering.
@@ -152,19 +285,121 @@ class AccommodationListView(generics.ListAPIView):
         return super().list(request, *args, **kwargs)
 
 
-class AccommodationDetailView(generics.RetrieveAPIView):
+class AccommodationFacetsView(NamespacedCacheMixin, generics.GenericAPIView):
     """
-    Retrieve detailed information about a specific accommodation.
+    Facet counts for the accommodation search sidebar.
     """
 
-    queryset = Accommodation.objects.select_related("property_type").prefetch_related(
-        "educational_institutions", "amenities", "accepted_payments"
+    queryset = Accommodation.objects.filter(is_available=True)
+    permission_classes = [permissions.AllowAny]
+    filterset_class = AccommodationFilter
+    filter_backends = [AccommodationSearchFilter, DjangoFilterBackend]
+    search_fields = AccommodationListView.search_fields
+    pagination_class = None
+    cache_namespaces = ACCOMMODATION_LIST_NAMESPACES
+
+    @extend_schema(
+        description=(
+            "Counts per property type, amenity, institution, gender restriction, "
+            "furnished flag and rent bucket for the filtered accommodations. "
+            "Accepts the same query parameters as the accommodation list."
+        ),
+        tags=["Public Accommodations"],
+        responses={200: dict},
     )
+    def get(self, request, *args, **kwargs):
+        """
+        Cached facet counts keyed by the normalized filter parameters.
+        """
+        namespaces = self.get_cache_namespaces()
+        cache_key = facet_cache_key(request.query_params, namespaces)
+        facets = cache.get(cache_key)
+        if facets is None:
+            with fill_reads(namespaces):
+                facets = compute_facets(self.filter_queryset(self.get_queryset()))
+            cache.set(cache_key, facets, settings.API_CACHE_TIMEOUT)
+        return Response(facets)
+
+
+class AccommodationExportView(StreamingExportMixin, generics.GenericAPIView):
+    """
+    Every available accommodation matching the list filters, streamed.
+    """
+
+    queryset = Accommodation.objects.filter(is_available=True)
+    serializer_class = AccommodationListSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filterset_class = AccommodationFilter
+    filter_backends = [DjangoFilterBackend, AccommodationSearchFilter]
+    search_fields = AccommodationListView.search_fields
+    pagination_class = None
+    export_filename = "accommodations"
+
+    @extend_schema(
+        description=(
+            "Stream all accommodations matching the list filters as NDJSON or "
+            "CSV; nested lookups are exported as their codes in CSV"
+        ),
+        tags=["Public Accommodations"],
+        parameters=[
+            OpenApiParameter(
+                name=EXPORT_FORMAT_PARAM,
+                description="ndjson (default) or csv",
+                required=False,
+            ),
+        ],
+        responses={200: AccommodationListSerializer(many=True)},
+    )
+    def get(self, request, *args, **kwargs):
+        return self.export(request)
+
+
+class RentStatisticListView(SerializerTimingMixin, generics.ListAPIView):
+    """
+    Market rent context per city, institution and property type.
+    """
+
+    queryset = RentStatistic.objects.all()
+    serializer_class = RentStatisticSerializer
+    permission_classes = [permissions.AllowAny]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = RentStatisticFilter
+
+    @extend_schema(
+        description=(
+            "Median, quartiles, range and histogram of monthly rent, deposit "
+            "and admin fee, precomputed per city, institution and property type"
+        ),
+        tags=["Public Accommodations"],
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+
+class AccommodationDetailView(
+    SerializerTimingMixin,
+    UpdatedAtValidatorsMixin,
+    NamespacedCacheMixin,
+    SparseQuerysetMixin,
+    generics.RetrieveAPIView,
+):
+    """
+    Retrieve detailed information about a specific accommodation.
+    """
+
+    queryset = Accommodation.objects.all()
+    sparse_prefetch_related = [
+        "educational_institutions",
+        "amenities",
+        "accepted_payments",
+    ]
     serializer_class = AccommodationDetailSerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = "slug"
+    cache_namespaces = [object_namespace(Accommodation, "{slug}"), *LOOKUP_NAMESPACES]
 
-    @method_decorator(cache_page(60 * 15))
+    @conditional_get
+    @cache_response()
     @extend_schema(
         description="Get detailed accommodation information",
         tags=["Public Accommodations"],
@@ -173,10 +408,24 @@ class AccommodationDetailView(generics.RetrieveAPIView):
         """
         Cached detail retrieval with performance optimizations.
         """
+        if settings.ACCOMMODATION_READ_MODEL:
+            detail_data = (
+                AccommodationListing.objects.filter(slug=kwargs[self.lookup_field])
+                .values_list("detail_data", flat=True)
+                .first()
+            )
+            if detail_data is not None:
+                return Response(
+                    sparse_representation(
+                        detail_data,
+                        request,
+                        nested_field_names(AccommodationDetailSerializer),
+                    )
+                )
         return super().retrieve(request, *args, **kwargs)
 
 
-class LandlordAccommodationViewSet(viewsets.ModelViewSet):
+class LandlordAccommodationViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     """
     Comprehensive management of landlord accommodations.
     """
@@ -220,3 +469,80 @@ class LandlordAccommodationViewSet(viewsets.ModelViewSet):
         Set the owner during accommodation creation.
         """
         serializer.save(owner=self.request.user)
+
+    @extend_schema(
+        description=(
+            "Create or replace up to 200 listings in one transaction. Items "
+            "with the slug of one of your listings replace it; the others are "
+            "created. Invalid items are skipped and reported by index."
+        ),
+        request=AccommodationCreateUpdateSerializer(many=True),
+        tags=["Landlord Accommodations"],
+    )
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        """
+        Validate every item, then write all valid ones with bulk inserts, one
+        bulk update and per-relation link diffs instead of a save per item.
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError("Expected a non-empty list of listings.")
+        if len(items) > BATCH_MAX_ITEMS:
+            raise ValidationError(f"At most {BATCH_MAX_ITEMS} listings per batch.")
+
+        slugs = [item.get("slug") for item in items if isinstance(item, dict)]
+        existing = self.get_queryset().prefetch_related(None).in_bulk(
+            [slug for slug in slugs if slug], field_name="slug"
+        )
+        results, created, updated = [], [], []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results.append(
+                    {
+                        "index": index,
+                        "status": "invalid",
+                        "errors": {"non_field_errors": ["Expected an object."]},
+                    }
+                )
+                continue
+            slug = item.get("slug")
+            instance = existing.get(slug) if slug else None
+            if slug and instance is None:
+                results.append({"index": index, "status": "not_found", "slug": slug})
+                continue
+            serializer = AccommodationCreateUpdateSerializer(
+                instance, data=item, context=self.get_serializer_context()
+            )
+            if not serializer.is_valid():
+                results.append(
+                    {"index": index, "status": "invalid", "errors": serializer.errors}
+                )
+                continue
+            accommodation = instance or Accommodation(owner=request.user)
+            relations = apply_values(accommodation, serializer.validated_data)
+            (updated if instance else created).append(
+                (index, accommodation, relations)
+            )
+
+        fields = [
+            name
+            for name in AccommodationCreateUpdateSerializer.Meta.fields
+            if name not in RELATION_FIELDS
+        ]
+        with transaction.atomic():
+            if created:
+                insert_accommodations(*batch_columns(created))
+            if updated:
+                objs, relations = batch_columns(updated)
+                update_accommodations(objs, fields, relations)
+            ids = [accommodation.pk for _, accommodation, _ in created + updated]
+            transaction.on_commit(lambda: refresh_derived_data(ids))
+
+        for status, rows in [("created", created), ("updated", updated)]:
+            results.extend(
+                {"index": index, "status": status, "slug": accommodation.slug}
+                for index, accommodation, _ in rows
+            )
+        results.sort(key=lambda result: result["index"])
+        return Response({"results": results})
@@ -0,0 +1,60 @@
+"""Bitmask encoding of accommodation amenities and accepted payment methods."""
+
+from .constants import AMENITY_CHOICES, PAYMENT_TYPES
+
+# Bit positions follow the order of the choices, so new codes must only ever
+# be appended. A signed 64-bit column leaves 63 usable bits.
+AMENITY_BITS = {code: 1 << index for index, (code, _) in enumerate(AMENITY_CHOICES)}
+PAYMENT_BITS = {code: 1 << index for index, (code, _) in enumerate(PAYMENT_TYPES)}
+
+assert len(AMENITY_BITS) <= 63 and len(PAYMENT_BITS) <= 63
+
+# Mask column -> (many-to-many relation it mirrors, code bits)
+MASK_FIELDS = {
+    "amenity_mask": ("amenities", AMENITY_BITS),
+    "payment_mask": ("accepted_payments", PAYMENT_BITS),
+}
+
+SYNC_CHUNK_SIZE = 1000
+
+
+def to_mask(bits, codes):
+    """
+    Fold a collection of codes into a bitmask, ignoring unknown codes.
+    """
+    mask = 0
+    for code in codes:
+        mask |= bits.get(code, 0)
+    return mask
+
+
+def from_mask(bits, mask):
+    """
+    Expand a bitmask back into its codes, in choice order.
+    """
+    return [code for code, bit in bits.items() if mask & bit]
+
+
+def sync_masks(accommodation_ids):
+    """
+    Recompute the amenity and payment masks of the given accommodations.
+
+    Uses one grouped query per relation and chunk plus a single bulk update,
+    so it doubles as the bulk backfill.
+    """
+    from .models import Accommodation
+
+    accommodation_ids = list(set(accommodation_ids))
+    for start in range(0, len(accommodation_ids), SYNC_CHUNK_SIZE):
+        chunk = accommodation_ids[start : start + SYNC_CHUNK_SIZE]
+        accommodations = {pk: Accommodation(pk=pk) for pk in chunk}
+        for field, (relation, bits) in MASK_FIELDS.items():
+            for accommodation in accommodations.values():
+                setattr(accommodation, field, 0)
+            rows = Accommodation.objects.filter(
+                pk__in=chunk, **{f"{relation}__isnull": False}
+            ).values_list("pk", f"{relation}__name")
+            for pk, code in rows:
+                accommodation = accommodations[pk]
+                setattr(accommodation, field, getattr(accommodation, field) | bits.get(code, 0))
+        Accommodation.objects.bulk_update(accommodations.values(), list(MASK_FIELDS))
@@ -0,0 +1,264 @@
+"""
+Bulk writes of accommodations, for imports and batch API requests.
+
+Bulk inserts skip ``Model.save()`` and the post_save and m2m_changed handlers
+in accomodations.signals, so callers follow them with ``refresh_derived_data``,
+which brings every derived column and table up to date in one pass per kind.
+"""
+
+from collections import Counter
+
+from django.db import connections, router
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import slugify
+
+from django_project.cache import bump_namespaces, model_namespace, object_namespace
+from .bitmasks import sync_masks
+from .geo import grid_cell, refresh_campus_distances
+from .listings import refresh_listings
+from .models import Accommodation
+from .rent_stats import STAT_DIMENSIONS, recompute_rent_statistics
+from .search import update_search_vectors
+
+RELATION_FIELDS = ["educational_institutions", "amenities", "accepted_payments"]
+BULK_BATCH_SIZE = 1000
+# Room left in the slug column for a "-<n>" suffix.
+SLUG_SUFFIX_LENGTH = 6
+
+
+def unique_slugs(titles):
+    """
+    A slug per title that is unique in the table and within ``titles``,
+    found in at most two queries. Clashes get ``-2``, ``-3``... suffixes.
+    """
+    max_length = Accommodation._meta.get_field("slug").max_length
+    bases = [
+        slugify(title)[: max_length - SLUG_SUFFIX_LENGTH].strip("-") or "accommodation"
+        for title in titles
+    ]
+    taken = set(
+        Accommodation.objects.filter(slug__in=set(bases)).values_list("slug", flat=True)
+    )
+    counts = Counter(bases)
+    clashing = {base for base in bases if base in taken or counts[base] > 1}
+    if clashing:
+        prefixes = Q()
+        for base in clashing:
+            prefixes |= Q(slug__startswith=f"{base}-")
+        taken.update(
+            Accommodation.objects.filter(prefixes).values_list("slug", flat=True)
+        )
+
+    slugs = []
+    for base in bases:
+        slug, suffix = base, 2
+        while slug in taken:
+            slug, suffix = f"{base}-{suffix}", suffix + 1
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def reserve_ids(connection, model, count):
+    """
+    Take ``count`` primary keys from the table's sequence, for rows loaded
+    with COPY, which cannot return the keys it assigns.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s)) "
+            "FROM generate_series(1, %s)",
+            [model._meta.db_table, model._meta.pk.column, count],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def copy_rows(connection, objs, fields):
+    """
+    Load model instances with PostgreSQL ``COPY ... FROM STDIN``.
+    """
+    model = type(objs[0])
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(field.column) for field in fields)
+    sql = f"COPY {quote(model._meta.db_table)} ({columns}) FROM STDIN"
+    with connection.cursor() as cursor:
+        with cursor.cursor.copy(sql) as copy:
+            for obj in objs:
+                copy.write_row(
+                    [
+                        field.get_db_prep_save(field.pre_save(obj, True), connection)
+                        for field in fields
+                    ]
+                )
+
+
+def insert_rows(objs):
+    """
+    Insert instances of one model: COPY on PostgreSQL, bulk_create elsewhere.
+
+    Primary keys are set on the instances either way.
+    """
+    if not objs:
+        return
+    model = type(objs[0])
+    connection = connections[router.db_for_write(model)]
+    if connection.vendor != "postgresql":
+        model._default_manager.bulk_create(objs, batch_size=BULK_BATCH_SIZE)
+        return
+
+    fields = model._meta.concrete_fields
+    if model._meta.auto_created:
+        # Through rows are never read back by id.
+        fields = [field for field in fields if not field.primary_key]
+    else:
+        for obj, pk in zip(objs, reserve_ids(connection, model, len(objs))):
+            obj.pk = pk
+    copy_rows(connection, objs, fields)
+
+
+def through_rows(relation, links):
+    """
+    Through-table instances for ``(accommodation_id, related_id)`` pairs.
+    """
+    field = Accommodation._meta.get_field(relation)
+    through = field.remote_field.through
+    source = f"{field.m2m_field_name()}_id"
+    target = f"{field.m2m_reverse_field_name()}_id"
+    return [
+        through(**{source: accommodation_id, target: related_id})
+        for accommodation_id, related_id in links
+    ]
+
+
+def insert_accommodations(accommodations, relations):
+    """
+    Insert new accommodations with their many-to-many links.
+
+    ``relations`` maps names from RELATION_FIELDS to one list of related ids
+    per accommodation. Slugs and grid cells are filled in as ``save()`` would,
+    except that slugs are made unique. Run inside a transaction.
+    """
+    unnamed = [
+        accommodation for accommodation in accommodations if not accommodation.slug
+    ]
+    slugs = unique_slugs([accommodation.title for accommodation in unnamed])
+    for accommodation, slug in zip(unnamed, slugs):
+        accommodation.slug = slug
+    for accommodation in accommodations:
+        accommodation.geo_cell = grid_cell(
+            accommodation.latitude, accommodation.longitude
+        )
+    insert_rows(accommodations)
+
+    for relation, related_ids in relations.items():
+        links = [
+            (accommodation.pk, related_id)
+            for accommodation, ids in zip(accommodations, related_ids)
+            for related_id in dict.fromkeys(ids)
+        ]
+        insert_rows(through_rows(relation, links))
+    return accommodations
+
+
+def apply_values(accommodation, validated_data):
+    """
+    Set validated serializer data on an instance, returning the related ids
+    of the many-to-many relations it carries instead of setting them.
+    """
+    relations = {}
+    for name, value in validated_data.items():
+        if name in RELATION_FIELDS:
+            relations[name] = [obj.pk for obj in value]
+        else:
+            setattr(accommodation, name, value)
+    return relations
+
+
+def replace_links(relation, related_ids):
+    """
+    Bring the links of one relation to ``{accommodation_id: [related_id]}``,
+    deleting and inserting only the difference.
+    """
+    field = Accommodation._meta.get_field(relation)
+    through = field.remote_field.through
+    source = f"{field.m2m_field_name()}_id"
+    target = f"{field.m2m_reverse_field_name()}_id"
+    wanted = {
+        (accommodation_id, related_id)
+        for accommodation_id, ids in related_ids.items()
+        for related_id in ids
+    }
+    current = through.objects.filter(**{f"{source}__in": related_ids}).values_list(
+        "pk", source, target
+    )
+    present, stale = set(), []
+    for pk, *link in current:
+        link = tuple(link)
+        if link in wanted:
+            present.add(link)
+        else:
+            stale.append(pk)
+    if stale:
+        through.objects.filter(pk__in=stale).delete()
+    insert_rows(through_rows(relation, sorted(wanted - present)))
+
+
+def update_accommodations(accommodations, fields, relations):
+    """
+    Write ``fields`` of existing accommodations in one bulk update and replace
+    their many-to-many links, with ``relations`` shaped as for
+    ``insert_accommodations``. Run inside a transaction.
+    """
+    now = timezone.now()
+    for accommodation in accommodations:
+        accommodation.geo_cell = grid_cell(
+            accommodation.latitude, accommodation.longitude
+        )
+        accommodation.updated_at = now
+    Accommodation.objects.bulk_update(
+        accommodations,
+        [*fields, "geo_cell", "updated_at"],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    for relation, related_ids in relations.items():
+        replace_links(
+            relation,
+            {
+                accommodation.pk: ids
+                for accommodation, ids in zip(accommodations, related_ids)
+            },
+        )
+
+
+def refresh_derived_data(accommodation_ids):
+    """
+    Update what accomodations.signals maintains for accommodations written in
+    bulk: search vectors, amenity and payment masks, campus distances, the
+    listing read model, rent statistics and cached API responses.
+
+    Run after the writes commit, the way the signal handlers defer their work.
+    """
+    accommodation_ids = list(set(accommodation_ids))
+    if not accommodation_ids:
+        return
+    accommodations = Accommodation.objects.filter(pk__in=accommodation_ids)
+    update_search_vectors(accommodations)
+    sync_masks(accommodation_ids)
+    refresh_campus_distances(accommodation_ids=accommodation_ids)
+    refresh_listings(accommodation_ids)
+    for dimension, path in STAT_DIMENSIONS.items():
+        keys = set(
+            accommodations.filter(**{f"{path}__isnull": False})
+            .values_list(path, flat=True)
+            .order_by()
+        )
+        if keys:
+            recompute_rent_statistics(dimension, keys)
+    bump_namespaces(
+        model_namespace(Accommodation),
+        *[
+            object_namespace(Accommodation, slug)
+            for slug in accommodations.values_list("slug", flat=True)
+        ],
+    )
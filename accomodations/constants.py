@@ -151,3 +151,20 @@ GENDER_CHOICES = [
     ("female", "Female Only"),
     ("male", "Male Only"),
 ]
+
+# Code -> display label, built once for __str__, facets and the registry.
+INSTITUTION_LABELS = dict(INSTITUTIONS)
+PROPERTY_TYPE_LABELS = dict(PROPERTY_TYPE_CHOICES)
+PAYMENT_LABELS = dict(PAYMENT_TYPES)
+AMENITY_LABELS = dict(AMENITY_CHOICES)
+GENDER_LABELS = dict(GENDER_CHOICES)
+
+# Monthly rent buckets for facet counts: (lower bound, upper bound), lower
+# inclusive and upper exclusive; None leaves the top bucket open-ended.
+RENT_BUCKETS = [
+    (0, 2000),
+    (2000, 3500),
+    (3500, 5000),
+    (5000, 7500),
+    (7500, None),
+]
@@ -0,0 +1,143 @@
+"""Facet counts for the accommodation search sidebar."""
+
+import json
+
+from django.db.models import Count, Q
+
+from django_project.cache import namespaced_key
+
+from .constants import (
+    AMENITY_CHOICES,
+    GENDER_CHOICES,
+    GENDER_LABELS,
+    INSTITUTIONS,
+    PROPERTY_TYPE_LABELS,
+    RENT_BUCKETS,
+)
+from .models import Accommodation
+
+FACET_CACHE_PREFIX = "accommodation-facets"
+
+# Query parameters that change paging, ordering or the fields rendered but not
+# the result set.
+NON_FILTER_PARAMS = {
+    "page",
+    "page_size",
+    "cursor",
+    "pagination",
+    "ordering",
+    "format",
+    "fields",
+    "expand",
+}
+
+
+def facet_cache_key(query_params, namespaces):
+    """
+    Cache key for a filter combination, independent of parameter order, under
+    the current versions of ``namespaces``.
+    """
+    params = sorted(
+        (key, sorted(value for value in values if value))
+        for key, values in query_params.lists()
+        if key not in NON_FILTER_PARAMS
+    )
+    params = [(key, values) for key, values in params if values]
+    return namespaced_key(FACET_CACHE_PREFIX, namespaces, json.dumps(params))
+
+
+def rent_bucket_label(low, high):
+    return f"{low}+" if high is None else f"{low}-{high}"
+
+
+def rent_bucket_filter(low, high):
+    condition = Q(monthly_rent__gte=low)
+    if high is not None:
+        condition &= Q(monthly_rent__lt=high)
+    return condition
+
+
+def grouped_counts(queryset, field):
+    """
+    ``{value: count}`` for one GROUP BY query over ``field``.
+    """
+    rows = (
+        queryset.filter(**{f"{field}__isnull": False})
+        .values(field)
+        .annotate(count=Count("pk", distinct=True))
+        .order_by()
+    )
+    return {row[field]: row["count"] for row in rows}
+
+
+def compute_facets(queryset):
+    """
+    Count the filtered accommodations per facet value.
+
+    Runs four aggregate queries regardless of how many facet values exist:
+    one for the scalar facets and one GROUP BY each for property types,
+    amenities and institutions.
+    """
+    base = Accommodation.objects.filter(pk__in=queryset.values("pk"))
+
+    scalar = base.aggregate(
+        total=Count("pk"),
+        furnished_yes=Count("pk", filter=Q(furnished=True)),
+        furnished_no=Count("pk", filter=Q(furnished=False)),
+        **{
+            f"gender_{code}": Count("pk", filter=Q(gender_restriction=code))
+            for code in GENDER_LABELS
+        },
+        **{
+            f"rent_{index}": Count("pk", filter=rent_bucket_filter(low, high))
+            for index, (low, high) in enumerate(RENT_BUCKETS)
+        },
+    )
+
+    property_types = (
+        base.values("property_type_id", "property_type__name")
+        .annotate(count=Count("pk"))
+        .order_by("property_type__name")
+    )
+    amenities = grouped_counts(base, "amenities__name")
+    institutions = grouped_counts(base, "educational_institutions__name")
+
+    return {
+        "count": scalar["total"],
+        "property_type": [
+            {
+                "id": row["property_type_id"],
+                "value": row["property_type__name"],
+                "label": PROPERTY_TYPE_LABELS.get(row["property_type__name"]),
+                "count": row["count"],
+            }
+            for row in property_types
+        ],
+        "amenities": [
+            {"value": code, "label": label, "count": amenities[code]}
+            for code, label in AMENITY_CHOICES
+            if code in amenities
+        ],
+        "educational_institutions": [
+            {"value": code, "label": label, "count": institutions[code]}
+            for code, label in INSTITUTIONS
+            if code in institutions
+        ],
+        "gender_restriction": [
+            {"value": code, "label": label, "count": scalar[f"gender_{code}"]}
+            for code, label in GENDER_CHOICES
+        ],
+        "furnished": [
+            {"value": True, "count": scalar["furnished_yes"]},
+            {"value": False, "count": scalar["furnished_no"]},
+        ],
+        "monthly_rent": [
+            {
+                "value": rent_bucket_label(low, high),
+                "min": low,
+                "max": high,
+                "count": scalar[f"rent_{index}"],
+            }
+            for index, (low, high) in enumerate(RENT_BUCKETS)
+        ],
+    }
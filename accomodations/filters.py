@@ -1,27 +1,52 @@
 import django_filters
-from .models import Accommodation, Institution, PropertyType, Amenity, PaymentMethod
+from django.contrib.postgres.search import SearchRank
+from django.db.models import F, Min
+from rest_framework import filters as drf_filters
+from rest_framework.settings import api_settings
+
+from django_project.reference import code_choices, id_choices, reference_table
+from .bitmasks import AMENITY_BITS, PAYMENT_BITS, to_mask
+from .constants import AMENITY_CHOICES, PAYMENT_TYPES
+from .geo import CAMPUS_DISTANCE_MAX_KM, DEFAULT_RADIUS_KM
+from .models import (
+    Accommodation,
+    Institution,
+    PropertyType,
+    Amenity,
+    PaymentMethod,
+    RentStatistic,
+)
+from .search import build_search_query, full_text_search_enabled
 
 
 class AccommodationFilter(django_filters.FilterSet):
     city = django_filters.CharFilter(field_name="city", lookup_expr="icontains")
     province = django_filters.CharFilter(field_name="province", lookup_expr="icontains")
-    property_type = django_filters.ModelChoiceFilter(
-        queryset=PropertyType.objects.all()
-    )
-    educational_institutions = django_filters.ModelMultipleChoiceFilter(
-        queryset=Institution.objects.all(),
+    # Lookup filters validate against the in-process reference registry, so
+    # they cost no queries beyond the filtering itself.
+    property_type = django_filters.ChoiceFilter(choices=id_choices(PropertyType))
+    educational_institutions = django_filters.MultipleChoiceFilter(
         field_name="educational_institutions__name",
-        to_field_name="name",
+        choices=code_choices(Institution),
     )
-    payment_methods = django_filters.ModelMultipleChoiceFilter(
-        queryset=PaymentMethod.objects.all(),
+    payment_methods = django_filters.MultipleChoiceFilter(
         field_name="accepted_payments__name",
-        to_field_name="name",
+        choices=code_choices(PaymentMethod),
     )
-    amenities = django_filters.ModelMultipleChoiceFilter(
-        queryset=Amenity.objects.all(),
+    amenities = django_filters.MultipleChoiceFilter(
         field_name="amenities__name",
-        to_field_name="name",
+        choices=code_choices(Amenity),
+    )
+    # "Has all of" filters: one bitwise predicate instead of an OR join.
+    amenities_all = django_filters.MultipleChoiceFilter(
+        field_name="amenity_mask",
+        choices=AMENITY_CHOICES,
+        method="filter_has_all",
+    )
+    payment_methods_all = django_filters.MultipleChoiceFilter(
+        field_name="payment_mask",
+        choices=PAYMENT_TYPES,
+        method="filter_has_all",
     )
     gender_restriction = django_filters.ChoiceFilter(
         choices=[("any", "Any"), ("male", "Male"), ("female", "Female")]
@@ -36,6 +61,41 @@ class AccommodationFilter(django_filters.FilterSet):
     minimum_lease_period = django_filters.NumberFilter(
         field_name="minimum_lease_period", lookup_expr="lte"
     )
+    # Proximity to a campus (institution id or code), within radius_km.
+    near = django_filters.CharFilter(method="filter_near")
+    radius_km = django_filters.NumberFilter(method="filter_radius_km")
+
+    mask_bits = {"amenity_mask": AMENITY_BITS, "payment_mask": PAYMENT_BITS}
+
+    def filter_has_all(self, queryset, name, value):
+        mask = to_mask(self.mask_bits[name], value)
+        if not mask:
+            return queryset
+        return queryset.alias(**{f"{name}_hits": F(name).bitand(mask)}).filter(
+            **{f"{name}_hits": mask}
+        )
+
+    def filter_near(self, queryset, name, value):
+        """
+        Keep listings near the campus and annotate their ``distance`` in km.
+
+        Reads the precomputed CampusDistance rows, so it is an indexed range
+        scan on (institution, distance_km) rather than a distance computation.
+        """
+        radius = self.form.cleaned_data.get("radius_km") or DEFAULT_RADIUS_KM
+        radius = min(float(radius), CAMPUS_DISTANCE_MAX_KM)
+        if value.isdigit():
+            campuses = [int(value)]
+        else:
+            campuses = reference_table(Institution).get().ids_by_code.get(value, [])
+        return queryset.filter(
+            campus_distances__institution__in=campuses,
+            campus_distances__distance_km__lte=radius,
+        ).annotate(distance=Min("campus_distances__distance_km"))
+
+    def filter_radius_km(self, queryset, name, value):
+        # Applied by filter_near.
+        return queryset
 
     class Meta:
         model = Accommodation
@@ -45,6 +105,8 @@ class AccommodationFilter(django_filters.FilterSet):
             "property_type",
             "educational_institutions",
             "amenities",
+            "amenities_all",
+            "payment_methods_all",
             "gender_restriction",
             "monthly_rent",
             "bathrooms",
@@ -52,4 +114,60 @@ class AccommodationFilter(django_filters.FilterSet):
             "furnished",
             "available_from",
             "minimum_lease_period",
+            "near",
+            "radius_km",
+        ]
+
+
+class RentStatisticFilter(django_filters.FilterSet):
+    dimension = django_filters.ChoiceFilter(choices=RentStatistic.DIMENSION_CHOICES)
+    key = django_filters.CharFilter(field_name="key", lookup_expr="iexact")
+    metric = django_filters.ChoiceFilter(choices=RentStatistic.METRIC_CHOICES)
+
+    class Meta:
+        model = RentStatistic
+        fields = ["dimension", "key", "metric"]
+
+
+class AccommodationSearchFilter(drf_filters.SearchFilter):
+    """
+    Ranked full-text search over the stored search vector on PostgreSQL.
+
+    Other databases fall back to the stock ``icontains`` search across
+    ``search_fields``. Results are ordered by relevance unless the client asks
+    for an explicit ordering, so this backend must run after OrderingFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not full_text_search_enabled(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        query = build_search_query(self.get_search_terms(request))
+        if query is None:
+            return queryset
+
+        queryset = queryset.annotate(
+            search_rank=SearchRank(F("search_vector"), query)
+        ).filter(search_vector=query)
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by("-search_rank", *queryset.query.order_by)
+        return queryset
+
+
+class AccommodationOrderingFilter(drf_filters.OrderingFilter):
+    """
+    OrderingFilter that ignores ``distance`` unless ``?near=`` annotated it.
+
+    Must run after DjangoFilterBackend so the annotation already exists.
+    """
+
+    annotated_fields = {"distance"}
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        fields = super().remove_invalid_fields(queryset, fields, view, request)
+        return [
+            term
+            for term in fields
+            if term.lstrip("-") not in self.annotated_fields
+            or term.lstrip("-") in queryset.query.annotations
         ]
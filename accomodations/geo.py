@@ -0,0 +1,161 @@
+"""Proximity search helpers that work without PostGIS."""
+
+import math
+
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Coordinates are bucketed into a fixed grid of GRID_CELL_DEGREES squares
+# (about 11 km at the equator); a radius search only visits nearby cells.
+GRID_CELL_DEGREES = 0.1
+GRID_COLUMNS = int(360 / GRID_CELL_DEGREES)
+MAX_GRID_CELLS = 400
+
+DEFAULT_RADIUS_KM = 10
+CAMPUS_DISTANCE_MAX_KM = 50
+
+
+def grid_cell(latitude, longitude):
+    """
+    Grid cell number for a coordinate pair, or None without coordinates.
+    """
+    if latitude is None or longitude is None:
+        return None
+    row = int(math.floor((latitude + 90) / GRID_CELL_DEGREES))
+    column = int(math.floor((longitude + 180) / GRID_CELL_DEGREES)) % GRID_COLUMNS
+    return row * GRID_COLUMNS + column
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    ``(min_lat, max_lat, min_lng, max_lng)`` enclosing the search circle.
+    """
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    lng_delta = min(math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)), 180)
+    return (
+        max(latitude - lat_delta, -90),
+        min(latitude + lat_delta, 90),
+        longitude - lng_delta,
+        longitude + lng_delta,
+    )
+
+
+def grid_cells(box):
+    """
+    Grid cells covering a bounding box, or None when there would be too many.
+    """
+    min_lat, max_lat, min_lng, max_lng = box
+    first, last = grid_cell(min_lat, min_lng), grid_cell(max_lat, max_lng)
+    rows = range(first // GRID_COLUMNS, last // GRID_COLUMNS + 1)
+    column_count = int(math.floor((max_lng - min_lng) / GRID_CELL_DEGREES)) + 2
+    if len(rows) * column_count > MAX_GRID_CELLS:
+        return None
+    columns = {(first % GRID_COLUMNS + offset) % GRID_COLUMNS for offset in range(column_count)}
+    return [row * GRID_COLUMNS + column for row in rows for column in columns]
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """
+    Great-circle distance between two points, in Python.
+    """
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def haversine_expression(latitude, longitude, lat_field="latitude", lng_field="longitude"):
+    """
+    Great-circle distance from a point to each row, evaluated by the database.
+
+    Uses only functions Django provides on both PostgreSQL and SQLite, so the
+    refinement runs set-wise in SQL rather than row by row in Python.
+    """
+    origin_lat = Value(math.radians(latitude), output_field=FloatField())
+    origin_lng = Value(math.radians(longitude), output_field=FloatField())
+    a = Power(Sin((Radians(F(lat_field)) - origin_lat) / 2), 2) + Cos(
+        origin_lat
+    ) * Cos(Radians(F(lat_field))) * Power(
+        Sin((Radians(F(lng_field)) - origin_lng) / 2), 2
+    )
+    return Value(2 * EARTH_RADIUS_KM, output_field=FloatField()) * ASin(Sqrt(a))
+
+
+def within_radius(queryset, latitude, longitude, radius_km):
+    """
+    Rows within ``radius_km`` of a point, annotated with ``distance_km``.
+
+    The grid cell and bounding box conditions narrow the candidates through
+    indexes before the haversine refinement runs.
+    """
+    box = bounding_box(latitude, longitude, radius_km)
+    queryset = queryset.filter(
+        latitude__range=(box[0], box[1]), longitude__range=(box[2], box[3])
+    )
+    cells = grid_cells(box)
+    if cells is not None:
+        queryset = queryset.filter(geo_cell__in=cells)
+    return queryset.annotate(
+        distance_km=haversine_expression(latitude, longitude)
+    ).filter(distance_km__lte=radius_km)
+
+
+def refresh_campus_distances(accommodation_ids=None, institution_ids=None):
+    """
+    Recompute the CampusDistance rows for some accommodations or institutions.
+    """
+    from .models import Accommodation, CampusDistance, Institution
+
+    rows = []
+    if accommodation_ids is not None:
+        accommodation_ids = list(accommodation_ids)
+        CampusDistance.objects.filter(accommodation_id__in=accommodation_ids).delete()
+        campuses = list(
+            Institution.objects.filter(
+                latitude__isnull=False, longitude__isnull=False
+            ).values_list("pk", "latitude", "longitude")
+        )
+        accommodations = Accommodation.objects.filter(
+            pk__in=accommodation_ids, latitude__isnull=False, longitude__isnull=False
+        ).values_list("pk", "latitude", "longitude")
+        for accommodation_id, lat, lng in accommodations:
+            for institution_id, campus_lat, campus_lng in campuses:
+                distance = haversine_km(lat, lng, campus_lat, campus_lng)
+                if distance <= CAMPUS_DISTANCE_MAX_KM:
+                    rows.append(
+                        CampusDistance(
+                            accommodation_id=accommodation_id,
+                            institution_id=institution_id,
+                            distance_km=distance,
+                        )
+                    )
+
+    if institution_ids is not None:
+        institution_ids = list(institution_ids)
+        CampusDistance.objects.filter(institution_id__in=institution_ids).delete()
+        campuses = Institution.objects.filter(
+            pk__in=institution_ids, latitude__isnull=False, longitude__isnull=False
+        )
+        for campus in campuses:
+            nearby = within_radius(
+                Accommodation.objects.all(),
+                campus.latitude,
+                campus.longitude,
+                CAMPUS_DISTANCE_MAX_KM,
+            ).values_list("pk", "distance_km")
+            rows.extend(
+                CampusDistance(
+                    accommodation_id=accommodation_id,
+                    institution=campus,
+                    distance_km=distance,
+                )
+                for accommodation_id, distance in nearby
+            )
+
+    CampusDistance.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
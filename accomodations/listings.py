@@ -0,0 +1,111 @@
+"""Maintenance of the denormalized AccommodationListing read model."""
+
+from django.db import transaction
+
+from .models import Accommodation, AccommodationListing
+
+REFRESH_CHUNK_SIZE = 500
+
+LISTING_UPDATE_FIELDS = [
+    "slug",
+    "property_type_code",
+    "institution_codes",
+    "amenity_codes",
+    "payment_codes",
+    "list_data",
+    "detail_data",
+    "refreshed_at",
+]
+
+
+def listing_serializers():
+    """
+    The list and detail serializers listings are rendered with. Reusing one
+    pair across rows builds their fields once instead of once per row.
+    """
+    from .api.serializers import (
+        AccommodationDetailSerializer,
+        AccommodationListSerializer,
+    )
+
+    return AccommodationListSerializer(), AccommodationDetailSerializer()
+
+
+def build_listing(accommodation, serializers=None):
+    """
+    Render an accommodation into an unsaved read-model row.
+
+    The accommodation should come with property_type selected and its three
+    many-to-many relations prefetched. ``serializers`` is a pair from
+    ``listing_serializers()``, when rendering many rows.
+    """
+    list_serializer, detail_serializer = serializers or listing_serializers()
+    return AccommodationListing(
+        accommodation=accommodation,
+        slug=accommodation.slug,
+        property_type_code=accommodation.property_type.name,
+        institution_codes=sorted(
+            {institution.name for institution in accommodation.educational_institutions.all()}
+        ),
+        amenity_codes=[amenity.name for amenity in accommodation.amenities.all()],
+        payment_codes=[method.name for method in accommodation.accepted_payments.all()],
+        list_data=list_serializer.to_representation(accommodation),
+        detail_data=detail_serializer.to_representation(accommodation),
+    )
+
+
+def refresh_listings(accommodation_ids):
+    """
+    Rebuild the read-model rows for the given accommodation ids.
+
+    Available accommodations are upserted; unavailable or deleted ones lose
+    their row.
+    """
+    accommodation_ids = list(set(accommodation_ids))
+    serializers = listing_serializers()
+    for start in range(0, len(accommodation_ids), REFRESH_CHUNK_SIZE):
+        chunk = accommodation_ids[start : start + REFRESH_CHUNK_SIZE]
+        accommodations = (
+            Accommodation.objects.filter(pk__in=chunk, is_available=True)
+            .select_related("property_type")
+            .prefetch_related(
+                "educational_institutions", "amenities", "accepted_payments"
+            )
+        )
+        listings = [
+            build_listing(accommodation, serializers)
+            for accommodation in accommodations
+        ]
+
+        with transaction.atomic():
+            AccommodationListing.objects.filter(pk__in=chunk).exclude(
+                pk__in=[listing.pk for listing in listings]
+            ).delete()
+            AccommodationListing.objects.bulk_create(
+                listings,
+                update_conflicts=True,
+                unique_fields=["accommodation"],
+                update_fields=LISTING_UPDATE_FIELDS,
+            )
+
+
+def schedule_listing_refresh(accommodation_ids):
+    """
+    Refresh the given listings once the surrounding transaction commits.
+
+    The ids are collected straight away, so querysets are evaluated before any
+    pending delete removes the rows they depend on.
+    """
+    accommodation_ids = list(accommodation_ids)
+    if accommodation_ids:
+        transaction.on_commit(lambda: refresh_listings(accommodation_ids))
+
+
+def rebuild_listings():
+    """
+    Rebuild the whole read model, dropping rows for vanished accommodations.
+    """
+    AccommodationListing.objects.exclude(accommodation__is_available=True).delete()
+    ids = Accommodation.objects.filter(is_available=True).values_list("pk", flat=True)
+    refresh_listings(ids.iterator())
+    return AccommodationListing.objects.count()
@@ -0,0 +1,169 @@
+import asyncio
+import statistics
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = [
+    "/api/v1/accommodations/",
+    "/api/v1/accommodations/?ordering=monthly_rent",
+    "/api/v1/accommodations/?pagination=cursor",
+    "/api/v1/amenities/",
+    "/api/v1/institutions/",
+]
+CONNECTION_ERRORS = (OSError, EOFError, asyncio.IncompleteReadError, ValueError)
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.statuses = Counter()
+        self.errors = 0
+        self.elapsed = 0.0
+
+
+async def fetch(reader, writer, host, path):
+    """
+    One keep-alive HTTP/1.1 GET; the status and whether the connection stays
+    open.
+    """
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+        f"Accept: application/json\r\n\r\n".encode()
+    )
+    await writer.drain()
+    status_line, *lines = (
+        (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    )
+    headers = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip().lower()
+
+    if headers.get("transfer-encoding") == "chunked":
+        while size := int((await reader.readline()).split(b";")[0], 16):
+            await reader.readexactly(size + 2)
+        await reader.readline()
+    else:
+        await reader.readexactly(int(headers.get("content-length", 0)))
+    return int(status_line.split()[1]), headers.get("connection") != "close"
+
+
+async def client(base_url, paths, offset, deadline, stats):
+    """
+    Request ``paths`` in turn over one connection until ``deadline``.
+    """
+    url = urlsplit(base_url)
+    connection = None
+    index = offset
+    while time.monotonic() < deadline:
+        path = url.path.rstrip("/") + paths[index % len(paths)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = await asyncio.open_connection(
+                    url.hostname, url.port or 80
+                )
+            status, keep_alive = await fetch(*connection, url.netloc, path)
+        except CONNECTION_ERRORS:
+            stats.errors += 1
+            keep_alive = False
+        else:
+            stats.latencies.append(time.perf_counter() - started)
+            stats.statuses[status] += 1
+        if not keep_alive and connection is not None:
+            connection[1].close()
+            connection = None
+    if connection is not None:
+        connection[1].close()
+
+
+async def load(base_url, paths, concurrency, duration):
+    stats = Stats()
+    started = time.monotonic()
+    deadline = started + duration
+    await asyncio.gather(
+        *[
+            client(base_url, paths, offset, deadline, stats)
+            for offset in range(concurrency)
+        ]
+    )
+    # Requests still in flight at the deadline finish and count.
+    stats.elapsed = time.monotonic() - started
+    return stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests per second and latency of deployments under many "
+        "concurrent keep-alive clients, e.g. the WSGI workers against uvicorn "
+        "workers serving ASYNC_PUBLIC_API: benchmark_concurrency "
+        "wsgi=http://127.0.0.1:8000 asgi=http://127.0.0.1:8001. The client "
+        "runs in one process; run it from another machine for high rates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "targets", nargs="+", help="label=base URL of each deployment."
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Path to request, repeatable; public list endpoints by default.",
+        )
+        parser.add_argument("--concurrency", type=int, default=500)
+        parser.add_argument("--duration", type=float, default=20.0)
+        parser.add_argument(
+            "--warmup",
+            type=float,
+            default=3.0,
+            help="Seconds of load before measuring, to fill caches and pools.",
+        )
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options["targets"]:
+            label, _, base_url = target.rpartition("=")
+            if urlsplit(base_url).scheme != "http":
+                raise CommandError(f"Expected label=http://host:port, got {target}.")
+            targets.append((label or base_url, base_url))
+        paths = options["paths"] or DEFAULT_PATHS
+
+        results = {}
+        for label, base_url in targets:
+            asyncio.run(
+                load(base_url, paths, options["concurrency"], options["warmup"])
+            )
+            stats = asyncio.run(
+                load(base_url, paths, options["concurrency"], options["duration"])
+            )
+            results[label] = self.report(label, stats)
+
+        baseline_label, baseline = next(iter(results.items()))
+        for label, rate in list(results.items())[1:]:
+            if baseline:
+                self.stdout.write(
+                    f"{label}: {rate / baseline:.2f}x the requests/s of "
+                    f"{baseline_label}"
+                )
+
+    def report(self, label, stats):
+        rate = len(stats.latencies) / stats.elapsed
+        ok = sum(count for status, count in stats.statuses.items() if status < 400)
+        line = f"{label:>8}: {rate:8.0f} req/s"
+        if len(stats.latencies) > 1:
+            percentiles = statistics.quantiles(stats.latencies, n=100)
+            line += (
+                f", p50 {percentiles[49] * 1000:6.1f} ms, "
+                f"p99 {percentiles[98] * 1000:7.1f} ms"
+            )
+        line += (
+            f", {len(stats.latencies) - ok} error responses, "
+            f"{stats.errors} connection errors"
+        )
+        self.stdout.write(line)
+        return rate
@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accomodations.api.serializers import AccommodationListSerializer
+from accomodations.models import Accommodation
+from bursaries.api.serializers import BursaryListSerializer
+from bursaries.models import Bursary
+from django_project.values_serialization import ValuesSerializer
+
+TARGETS = {
+    "accommodations": (
+        AccommodationListSerializer,
+        lambda: Accommodation.objects.filter(is_available=True),
+        ["property_type"],
+        ["educational_institutions", "amenities"],
+    ),
+    "bursaries": (
+        BursaryListSerializer,
+        lambda: Bursary.objects.all(),
+        [],
+        ["fields_of_study", "education_levels", "study_levels"],
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows per second of the ModelSerializer list path and the "
+        "values() fast path, queries included."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", choices=list(TARGETS), default="accommodations")
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        serializer_class, queryset, select, prefetch = TARGETS[options["target"]]
+
+        def model_path():
+            rows = queryset().select_related(*select).prefetch_related(*prefetch)
+            return serializer_class(rows[: options["rows"]], many=True).data
+
+        def values_path():
+            fast = ValuesSerializer(serializer_class)
+            return fast.serialize(fast.values_queryset(queryset())[: options["rows"]])
+
+        results = {}
+        for name, path in [("serializer", model_path), ("values", values_path)]:
+            best, count = None, 0
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                count = len(path())
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = count / best if best else 0
+            self.stdout.write(
+                f"{name:>10}: {count} rows in {best * 1000:.1f} ms "
+                f"({results[name]:,.0f} rows/s)"
+            )
+
+        if results["serializer"]:
+            speedup = results["values"] / results["serializer"]
+            self.stdout.write(self.style.SUCCESS(f"Speedup: {speedup:.1f}x"))
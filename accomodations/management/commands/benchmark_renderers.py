@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from accomodations.api.serializers import AccommodationListSerializer
+from accomodations.models import Accommodation
+from django_project.renderers import MessagePackRenderer, ORJSONRenderer
+
+RENDERERS = {
+    "json": JSONRenderer,
+    "orjson": ORJSONRenderer,
+    "msgpack": MessagePackRenderer,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare encode time and payload size of the stock JSON renderer, the "
+        "orjson renderer and the MessagePack renderer on an accommodation page."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100)
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        accommodations = (
+            Accommodation.objects.filter(is_available=True)
+            .select_related("property_type")
+            .prefetch_related("educational_institutions", "amenities")
+        )[: options["rows"]]
+        data = {
+            "count": len(accommodations),
+            "next": None,
+            "previous": None,
+            "results": AccommodationListSerializer(accommodations, many=True).data,
+        }
+
+        baseline = JSONRenderer().render(data)
+        if ORJSONRenderer().render(data) != baseline:
+            self.stdout.write(self.style.WARNING("orjson output differs from json"))
+
+        for name, renderer_class in RENDERERS.items():
+            renderer = renderer_class()
+            started = time.perf_counter()
+            for _ in range(options["iterations"]):
+                payload = renderer.render(data)
+            elapsed = (time.perf_counter() - started) / options["iterations"]
+            self.stdout.write(
+                f"{name:>8}: {elapsed * 1_000_000:8.0f} us/page, "
+                f"{len(payload):7,} bytes ({len(payload) / len(baseline):.0%})"
+            )
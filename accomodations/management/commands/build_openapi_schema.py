@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from django_project.schema import build_schemas, load_artefact
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema of every API version, in YAML and JSON, "
+        "into OPENAPI_SCHEMA_DIR, from where /api/schema/ serves it. Run at "
+        "build or deploy time, after any change to the API."
+    )
+
+    def handle(self, *args, **options):
+        for path in build_schemas():
+            content, etag = load_artefact(path)
+            self.stdout.write(
+                f"{path.relative_to(settings.BASE_DIR)}: {len(content):,} bytes, "
+                f"ETag {etag}"
+            )
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from accomodations.rent_stats import STAT_DIMENSIONS, recompute_rent_statistics
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the rent statistics summary table. Run periodically to catch "
+        "keys that listings moved away from."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dimension",
+            choices=list(STAT_DIMENSIONS),
+            help="Only recompute one dimension.",
+        )
+
+    def handle(self, *args, **options):
+        dimensions = [options["dimension"]] if options["dimension"] else STAT_DIMENSIONS
+        for dimension in dimensions:
+            count = recompute_rent_statistics(dimension)
+            self.stdout.write(
+                self.style.SUCCESS(f"Stored {count} {dimension} statistics.")
+            )
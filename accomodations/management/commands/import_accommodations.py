@@ -0,0 +1,237 @@
+import csv
+import json
+import sys
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, transaction
+
+from accomodations.api.serializers import AccommodationCreateUpdateSerializer
+from accomodations.bulk import (
+    RELATION_FIELDS,
+    insert_accommodations,
+    refresh_derived_data,
+)
+from accomodations.constants import (
+    AMENITY_LABELS,
+    INSTITUTION_LABELS,
+    PAYMENT_LABELS,
+    PROPERTY_TYPE_LABELS,
+)
+from accomodations.models import (
+    Accommodation,
+    Amenity,
+    Institution,
+    PaymentMethod,
+    PropertyType,
+)
+from accomodations.validators import LISTING_TERM_FIELDS, validate_listing_terms
+from django_project.reference import reference_table
+
+# Columns holding lookup codes: the known codes and the lookup model.
+CODE_COLUMNS = {
+    "property_type": (PROPERTY_TYPE_LABELS, PropertyType),
+    "educational_institutions": (INSTITUTION_LABELS, Institution),
+    "amenities": (AMENITY_LABELS, Amenity),
+    "accepted_payments": (PAYMENT_LABELS, PaymentMethod),
+}
+IMPORT_COLUMNS = {
+    *AccommodationCreateUpdateSerializer.Meta.fields,
+    "latitude",
+    "longitude",
+}
+# Separates several codes in one CSV cell; JSONL rows may use lists instead.
+CODE_SEPARATOR = "|"
+
+
+def read_records(stream, file_format):
+    """
+    Yield ``(line number, record)`` pairs; a record that cannot be parsed is
+    yielded as a ValidationError instead.
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+        unknown = set(reader.fieldnames or []) - IMPORT_COLUMNS
+        if unknown:
+            raise CommandError(f"Unknown columns: {', '.join(sorted(unknown))}.")
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError as error:
+            yield line, ValidationError(f"Invalid JSON: {error}")
+            continue
+        if not isinstance(record, dict):
+            yield line, ValidationError("Expected a JSON object.")
+        else:
+            yield line, record
+
+
+def split_codes(value):
+    if isinstance(value, list):
+        return [str(code).strip() for code in value]
+    codes = str(value or "").split(CODE_SEPARATOR)
+    return [code.strip() for code in codes if code.strip()]
+
+
+def resolve_codes(column, codes):
+    """
+    Lookup ids for the codes of one column, validated against the constants
+    and resolved through the reference registry.
+    """
+    labels, model = CODE_COLUMNS[column]
+    ids_by_code = reference_table(model).get().ids_by_code
+    unknown = [code for code in codes if code not in labels or code not in ids_by_code]
+    if unknown:
+        raise ValidationError({column: f"Unknown codes: {', '.join(unknown)}."})
+    return [pk for code in codes for pk in ids_by_code[code]]
+
+
+def build_accommodation(record, owner):
+    """
+    An unsaved, validated Accommodation and its related ids per relation.
+    """
+    unknown = set(record) - IMPORT_COLUMNS
+    if unknown:
+        raise ValidationError(f"Unknown columns: {', '.join(sorted(unknown))}.")
+    values = {
+        column: value
+        for column, value in record.items()
+        if column not in CODE_COLUMNS and value not in ("", None)
+    }
+    property_types = resolve_codes(
+        "property_type", split_codes(record.get("property_type"))
+    )
+    if len(property_types) != 1:
+        raise ValidationError({"property_type": "Exactly one code is required."})
+    relations = {
+        relation: resolve_codes(relation, split_codes(record.get(relation)))
+        for relation in RELATION_FIELDS
+    }
+
+    accommodation = Accommodation(
+        **values, property_type_id=property_types[0], owner=owner
+    )
+    accommodation.full_clean(
+        exclude=["slug", "property_type", "owner"], validate_unique=False
+    )
+    # The rules the API applies, on the values full_clean() converted.
+    validate_listing_terms(
+        {field: getattr(accommodation, field) for field in LISTING_TERM_FIELDS}
+    )
+    return accommodation, relations
+
+
+def describe(error):
+    if hasattr(error, "error_dict"):
+        return "; ".join(
+            f"{field}: {' '.join(messages)}"
+            for field, messages in error.message_dict.items()
+        )
+    return " ".join(error.messages)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import accommodations from a CSV or JSON Lines file in chunked bulk "
+        "transactions (COPY on PostgreSQL). Lookup columns hold codes from "
+        "accomodations.constants, several separated by '|' in CSV. Rows that "
+        "fail are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for stdin.")
+        parser.add_argument(
+            "--owner", required=True, help="Username of the listings' owner."
+        )
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="Input format; guessed from the file extension by default.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or (
+            "csv" if options["path"].lower().endswith(".csv") else "jsonl"
+        )
+        User = get_user_model()
+        try:
+            owner = User._default_manager.get_by_natural_key(options["owner"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user {options['owner']!r}.")
+
+        self.failures = []
+        created = 0
+        started = time.perf_counter()
+        if options["path"] == "-":
+            created = self.import_stream(sys.stdin, file_format, owner, options)
+        else:
+            with open(options["path"], newline="", encoding="utf-8") as stream:
+                created = self.import_stream(stream, file_format, owner, options)
+        elapsed = time.perf_counter() - started
+
+        for line, message in self.failures:
+            self.stderr.write(f"line {line}: {message}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {created} accommodations in {elapsed:.1f}s "
+                f"({created / elapsed if elapsed else 0:.0f} rows/s), "
+                f"{len(self.failures)} rows failed."
+            )
+        )
+
+    def import_stream(self, stream, file_format, owner, options):
+        records = read_records(stream, file_format)
+        created = 0
+        while chunk := list(islice(records, options["chunk_size"])):
+            rows = []
+            for line, record in chunk:
+                try:
+                    if isinstance(record, ValidationError):
+                        raise record
+                    rows.append((line, *build_accommodation(record, owner)))
+                except ValidationError as error:
+                    self.failures.append((line, describe(error)))
+
+            ids = self.load(rows)
+            refresh_derived_data(ids)
+            created += len(ids)
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{created} imported, {len(self.failures)} failed")
+        return created
+
+    def load(self, rows):
+        """
+        Insert a chunk in one transaction, retrying its rows one by one when
+        the database rejects it so a single bad row does not sink the rest.
+        """
+        if not rows:
+            return []
+        accommodations = [accommodation for _, accommodation, _ in rows]
+        try:
+            with transaction.atomic():
+                insert_accommodations(
+                    accommodations,
+                    {
+                        relation: [relations[relation] for _, _, relations in rows]
+                        for relation in RELATION_FIELDS
+                    },
+                )
+        except DatabaseError as error:
+            if len(rows) == 1:
+                self.failures.append((rows[0][0], str(error)))
+                return []
+            for accommodation in accommodations:
+                accommodation.pk, accommodation.slug = None, ""
+                accommodation._state.adding, accommodation._state.db = True, None
+            return [pk for row in rows for pk in self.load([row])]
+        return [accommodation.pk for accommodation in accommodations]
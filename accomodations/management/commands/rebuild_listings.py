@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accomodations.listings import rebuild_listings
+
+
+class Command(BaseCommand):
+    help = "Rebuild the AccommodationListing read model from scratch."
+
+    def handle(self, *args, **options):
+        count = rebuild_listings()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} listings."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from accomodations.geo import refresh_campus_distances
+from accomodations.models import CampusDistance, Institution
+
+
+class Command(BaseCommand):
+    help = "Recompute the precomputed accommodation-to-campus distance table."
+
+    def handle(self, *args, **options):
+        refresh_campus_distances(
+            institution_ids=Institution.objects.values_list("pk", flat=True)
+        )
+        count = CampusDistance.objects.count()
+        self.stdout.write(self.style.SUCCESS(f"Stored {count} campus distances."))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+
+from django_project.startup import profile
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile a cold start of the project in a fresh interpreter: the time "
+        "of each startup phase and of each app's ready(), and import time per "
+        "top-level package (or per module with --modules) from -X importtime."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--role",
+            choices=["web", "api"],
+            help="DJANGO_ROLE to start as; the current one by default.",
+        )
+        parser.add_argument(
+            "--modules",
+            action="store_true",
+            help="List modules by cumulative import time instead of packages.",
+        )
+        parser.add_argument("--limit", type=int, default=20)
+
+    def handle(self, *args, **options):
+        result = profile(options["role"])
+        self.stdout.write(f"Cold start: {result['total'] * 1000:.0f} ms")
+        for name, seconds in result["phases"].items():
+            self.stdout.write(f"  {name:<12}{seconds * 1000:8.1f} ms")
+
+        self.stdout.write("\nready():")
+        for label, seconds in self.slowest(result["ready"], options["limit"]):
+            self.stdout.write(f"  {label:<32}{seconds * 1000:8.1f} ms")
+
+        if options["modules"]:
+            self.stdout.write("\nImports by module (cumulative):")
+            imports = {
+                name: cumulative
+                for name, (_, cumulative) in result["modules"].items()
+            }
+        else:
+            self.stdout.write("\nImports by package:")
+            imports = result["import_times"]
+        for name, seconds in self.slowest(imports, options["limit"]):
+            self.stdout.write(f"  {name:<48}{seconds * 1000:8.1f} ms")
+
+    def slowest(self, times, limit):
+        return sorted(times.items(), key=lambda item: item[1], reverse=True)[:limit]
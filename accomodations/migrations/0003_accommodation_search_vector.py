@@ -0,0 +1,46 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:02
+
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS accommodation_search_gin "
+        "ON accomodations_accommodation USING gin (search_vector)"
+    )
+    Accommodation = apps.get_model("accomodations", "Accommodation")
+    Accommodation.objects.update(
+        search_vector=(
+            SearchVector("title", weight="A", config="english")
+            + SearchVector("city", weight="A", config="english")
+            + SearchVector("province", weight="B", config="english")
+            + SearchVector("address", weight="C", config="english")
+            + SearchVector("description", weight="D", config="english")
+        )
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS accommodation_search_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accomodations', '0002_institution_remove_accommodation_universities_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accommodation',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accomodations', '0003_accommodation_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccommodationListing',
+            fields=[
+                ('accommodation', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='listing', serialize=False, to='accomodations.accommodation')),
+                ('slug', models.SlugField(unique=True)),
+                ('property_type_code', models.CharField(max_length=50)),
+                ('institution_codes', models.JSONField(default=list)),
+                ('amenity_codes', models.JSONField(default=list)),
+                ('payment_codes', models.JSONField(default=list)),
+                ('list_data', models.JSONField()),
+                ('detail_data', models.JSONField()),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
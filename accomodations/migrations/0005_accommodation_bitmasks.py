@@ -0,0 +1,48 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:06
+
+from django.db import migrations, models
+
+from accomodations.constants import AMENITY_CHOICES, PAYMENT_TYPES
+
+
+def backfill_masks(apps, schema_editor):
+    Accommodation = apps.get_model("accomodations", "Accommodation")
+    relations = {
+        "amenity_mask": ("amenities", AMENITY_CHOICES),
+        "payment_mask": ("accepted_payments", PAYMENT_TYPES),
+    }
+    masks = {}
+    for field, (relation, choices) in relations.items():
+        bits = {code: 1 << index for index, (code, _) in enumerate(choices)}
+        rows = Accommodation.objects.filter(
+            **{f"{relation}__isnull": False}
+        ).values_list("pk", f"{relation}__name")
+        for pk, code in rows.iterator():
+            values = masks.setdefault(pk, dict.fromkeys(relations, 0))
+            values[field] |= bits.get(code, 0)
+    Accommodation.objects.bulk_update(
+        [Accommodation(pk=pk, **values) for pk, values in masks.items()],
+        list(relations),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accomodations', '0004_accommodationlisting'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accommodation',
+            name='amenity_mask',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='accommodation',
+            name='payment_mask',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_masks, migrations.RunPython.noop),
+    ]
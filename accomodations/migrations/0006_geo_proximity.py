@@ -0,0 +1,52 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accomodations', '0005_accommodation_bitmasks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accommodation',
+            name='geo_cell',
+            field=models.IntegerField(db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='accommodation',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='accommodation',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='institution',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='institution',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='CampusDistance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('distance_km', models.FloatField()),
+                ('accommodation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='campus_distances', to='accomodations.accommodation')),
+                ('institution', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='listing_distances', to='accomodations.institution')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['institution', 'distance_km'], name='accomodatio_institu_d63c8d_idx')],
+                'constraints': [models.UniqueConstraint(fields=('accommodation', 'institution'), name='unique_campus_distance')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accomodations', '0006_geo_proximity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RentStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('city', 'City'), ('institution', 'Institution'), ('property_type', 'Property type')], max_length=20)),
+                ('key', models.CharField(max_length=100)),
+                ('metric', models.CharField(choices=[('monthly_rent', 'Monthly rent'), ('deposit_amount', 'Deposit amount'), ('admin_fee', 'Admin fee')], max_length=20)),
+                ('count', models.PositiveIntegerField()),
+                ('minimum', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('p25', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('median', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('p75', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('maximum', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('histogram', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['dimension', 'key', 'metric'],
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'key', 'metric'), name='unique_rent_statistic')],
+            },
+        ),
+    ]
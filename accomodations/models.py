@@ -1,11 +1,18 @@
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.utils.text import slugify
+
+from .geo import grid_cell
 from .constants import (
     INSTITUTIONS,
+    INSTITUTION_LABELS,
     PROPERTY_TYPE_CHOICES,
+    PROPERTY_TYPE_LABELS,
     PAYMENT_TYPES,
+    PAYMENT_LABELS,
     AMENITY_CHOICES,
+    AMENITY_LABELS,
     GENDER_CHOICES,
 )
 
@@ -14,13 +21,15 @@ class Institution(models.Model):
     name = models.CharField(max_length=100, choices=INSTITUTIONS)
     city = models.CharField(max_length=100)
     province = models.CharField(max_length=100)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
 
     class Meta:
         verbose_name_plural = "educational institutions"
         ordering = ["name"]
 
     def __str__(self):
-        return dict(INSTITUTIONS)[self.name]
+        return INSTITUTION_LABELS.get(self.name, self.name)
 
 
 class PropertyType(models.Model):
@@ -31,7 +40,7 @@ class PropertyType(models.Model):
         ordering = ["name"]
 
     def __str__(self):
-        return dict(PROPERTY_TYPE_CHOICES)[self.name]
+        return PROPERTY_TYPE_LABELS.get(self.name, self.name)
 
 
 class PaymentMethod(models.Model):
@@ -42,7 +51,7 @@ class PaymentMethod(models.Model):
         ordering = ["name"]
 
     def __str__(self):
-        return dict(PAYMENT_TYPES)[self.name]
+        return PAYMENT_LABELS.get(self.name, self.name)
 
 
 class Amenity(models.Model):
@@ -54,7 +63,7 @@ class Amenity(models.Model):
         ordering = ["name"]
 
     def __str__(self):
-        return dict(AMENITY_CHOICES)[self.name]
+        return AMENITY_LABELS.get(self.name, self.name)
 
 
 class Accommodation(models.Model):
@@ -69,6 +78,10 @@ class Accommodation(models.Model):
     city = models.CharField(max_length=100)
     province = models.CharField(max_length=100)
     postal_code = models.CharField(max_length=10)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    # Grid cell of the coordinates (accomodations.geo), set on save.
+    geo_cell = models.IntegerField(null=True, editable=False, db_index=True)
     monthly_rent = models.DecimalField(max_digits=10, decimal_places=2)
     admin_fee = models.DecimalField(max_digits=10, decimal_places=2)
     deposit_amount = models.DecimalField(max_digits=10, decimal_places=2)
@@ -97,6 +110,13 @@ class Accommodation(models.Model):
     contact_email = models.EmailField()
     whatsapp = models.CharField(max_length=20, blank=True)
     website = models.URLField(blank=True)
+    # Bitmasks over AMENITY_CHOICES and PAYMENT_TYPES (accomodations.bitmasks),
+    # mirrored from the M2M relations by accomodations.signals.
+    amenity_mask = models.BigIntegerField(default=0, editable=False)
+    payment_mask = models.BigIntegerField(default=0, editable=False)
+    # Weighted tsvector maintained by accomodations.signals; the GIN index
+    # lives in migration 0003 because it only exists on PostgreSQL.
+    search_vector = SearchVectorField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -111,8 +131,109 @@ class Accommodation(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+        self.geo_cell = grid_cell(self.latitude, self.longitude)
         super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} - {self.city}"
 
+
+class CampusDistance(models.Model):
+    """
+    Precomputed distance between an accommodation and a nearby campus.
+
+    Maintained by ``accomodations.geo.refresh_campus_distances`` for pairs
+    within ``CAMPUS_DISTANCE_MAX_KM``.
+    """
+
+    accommodation = models.ForeignKey(
+        Accommodation, on_delete=models.CASCADE, related_name="campus_distances"
+    )
+    institution = models.ForeignKey(
+        Institution, on_delete=models.CASCADE, related_name="listing_distances"
+    )
+    distance_km = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["accommodation", "institution"],
+                name="unique_campus_distance",
+            )
+        ]
+        indexes = [models.Index(fields=["institution", "distance_km"])]
+
+    def __str__(self):
+        return f"{self.accommodation_id} -> {self.institution_id}: {self.distance_km:.1f} km"
+
+
+class AccommodationListing(models.Model):
+    """
+    Denormalized read model of an available accommodation.
+
+    Rows are rebuilt by ``accomodations.listings`` whenever the accommodation,
+    its relations or the lookup rows it points at change, so the public
+    endpoints can serve a listing without joins or prefetches.
+    """
+
+    accommodation = models.OneToOneField(
+        Accommodation,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="listing",
+    )
+    slug = models.SlugField(unique=True)
+    property_type_code = models.CharField(max_length=50)
+    institution_codes = models.JSONField(default=list)
+    amenity_codes = models.JSONField(default=list)
+    payment_codes = models.JSONField(default=list)
+    list_data = models.JSONField()
+    detail_data = models.JSONField()
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.slug
+
+
+class RentStatistic(models.Model):
+    """
+    Summary of a cost column across available listings sharing a dimension.
+
+    Rows are recomputed by ``accomodations.rent_stats`` so that reads never
+    aggregate over the listings table.
+    """
+
+    DIMENSION_CHOICES = [
+        ("city", "City"),
+        ("institution", "Institution"),
+        ("property_type", "Property type"),
+    ]
+    METRIC_CHOICES = [
+        ("monthly_rent", "Monthly rent"),
+        ("deposit_amount", "Deposit amount"),
+        ("admin_fee", "Admin fee"),
+    ]
+
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES)
+    key = models.CharField(max_length=100)
+    metric = models.CharField(max_length=20, choices=METRIC_CHOICES)
+    count = models.PositiveIntegerField()
+    minimum = models.DecimalField(max_digits=10, decimal_places=2)
+    p25 = models.DecimalField(max_digits=10, decimal_places=2)
+    median = models.DecimalField(max_digits=10, decimal_places=2)
+    p75 = models.DecimalField(max_digits=10, decimal_places=2)
+    maximum = models.DecimalField(max_digits=10, decimal_places=2)
+    histogram = models.JSONField(default=list)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["dimension", "key", "metric"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dimension", "key", "metric"],
+                name="unique_rent_statistic",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}={self.key} {self.metric}"
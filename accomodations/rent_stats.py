@@ -0,0 +1,127 @@
+"""Precomputed rent statistics per city, institution and property type."""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+
+from .models import Accommodation, RentStatistic
+
+# Dimension -> lookup path from Accommodation to the grouping key.
+STAT_DIMENSIONS = {
+    "city": "city",
+    "institution": "educational_institutions__name",
+    "property_type": "property_type__name",
+}
+STAT_METRICS = ["monthly_rent", "deposit_amount", "admin_fee"]
+HISTOGRAM_BINS = 10
+
+CENTS = Decimal("0.01")
+
+
+def percentile(values, fraction):
+    """
+    Linearly interpolated percentile of an already sorted list.
+    """
+    position = (len(values) - 1) * Decimal(fraction)
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    value = values[lower] + (values[upper] - values[lower]) * (position - lower)
+    return value.quantize(CENTS)
+
+
+def histogram(values, bins=HISTOGRAM_BINS):
+    """
+    Equal-width buckets between the smallest and largest of sorted values.
+    """
+    low, high = values[0], values[-1]
+    if low == high:
+        return [{"min": str(low), "max": str(high), "count": len(values)}]
+    width = (high - low) / bins
+    counts = [0] * bins
+    for value in values:
+        counts[min(int((value - low) / width), bins - 1)] += 1
+    return [
+        {
+            "min": str((low + width * index).quantize(CENTS)),
+            "max": str((low + width * (index + 1)).quantize(CENTS)),
+            "count": count,
+        }
+        for index, count in enumerate(counts)
+    ]
+
+
+def summarize(dimension, key, metric, values):
+    values = sorted(values)
+    return RentStatistic(
+        dimension=dimension,
+        key=key,
+        metric=metric,
+        count=len(values),
+        minimum=values[0],
+        p25=percentile(values, "0.25"),
+        median=percentile(values, "0.5"),
+        p75=percentile(values, "0.75"),
+        maximum=values[-1],
+        histogram=histogram(values),
+    )
+
+
+def recompute_rent_statistics(dimension, keys=None):
+    """
+    Rebuild the statistics of one dimension, for some keys or all of them.
+
+    Keys with no available listings left lose their rows.
+    """
+    path = STAT_DIMENSIONS[dimension]
+    listings = Accommodation.objects.filter(is_available=True)
+    if keys is not None:
+        keys = set(keys)
+        listings = listings.filter(**{f"{path}__in": keys})
+
+    groups = defaultdict(lambda: defaultdict(list))
+    # The pk keeps one row per listing when it links several campuses of
+    # the same institution.
+    rows = listings.values_list("pk", path, *STAT_METRICS).distinct().order_by()
+    for _, key, *amounts in rows.iterator():
+        for metric, amount in zip(STAT_METRICS, amounts):
+            groups[key][metric].append(amount)
+
+    statistics = [
+        summarize(dimension, key, metric, values)
+        for key, metrics in groups.items()
+        for metric, values in metrics.items()
+    ]
+    stale = RentStatistic.objects.filter(dimension=dimension)
+    if keys is not None:
+        stale = stale.filter(key__in=keys)
+    with transaction.atomic():
+        stale.delete()
+        RentStatistic.objects.bulk_create(statistics, batch_size=1000)
+    return len(statistics)
+
+
+def rent_statistic_keys(accommodation):
+    """
+    The statistic keys an accommodation contributes to, per dimension.
+    """
+    return {
+        "city": {accommodation.city},
+        "institution": set(
+            accommodation.educational_institutions.values_list("name", flat=True)
+        ),
+        "property_type": {accommodation.property_type.name},
+    }
+
+
+def schedule_rent_statistics(keys_by_dimension):
+    """
+    Recompute the given statistic keys once the transaction commits.
+    """
+
+    def recompute():
+        for dimension, keys in keys_by_dimension.items():
+            if keys:
+                recompute_rent_statistics(dimension, keys)
+
+    transaction.on_commit(recompute)
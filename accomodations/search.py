@@ -0,0 +1,48 @@
+"""Full-text search support for accommodations."""
+
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connections
+
+SEARCH_CONFIG = "english"
+
+# Title and city carry the most signal, the free-form description the least.
+ACCOMMODATION_SEARCH_VECTOR = (
+    SearchVector("title", weight="A", config=SEARCH_CONFIG)
+    + SearchVector("city", weight="A", config=SEARCH_CONFIG)
+    + SearchVector("province", weight="B", config=SEARCH_CONFIG)
+    + SearchVector("address", weight="C", config=SEARCH_CONFIG)
+    + SearchVector("description", weight="D", config=SEARCH_CONFIG)
+)
+
+
+def full_text_search_enabled(using="default"):
+    """
+    Full-text search needs PostgreSQL; other backends fall back to icontains.
+    """
+    return connections[using].vendor == "postgresql"
+
+
+def build_search_query(terms):
+    """
+    Build a prefix-matching tsquery so partially typed words still match.
+    """
+    words = [re.sub(r"[^\w]", "", term) for term in terms]
+    words = [word for word in words if word]
+    if not words:
+        return None
+    return SearchQuery(
+        " & ".join(f"{word}:*" for word in words),
+        search_type="raw",
+        config=SEARCH_CONFIG,
+    )
+
+
+def update_search_vectors(queryset):
+    """
+    Recompute the stored search vector for every accommodation in the queryset.
+    """
+    if not full_text_search_enabled(queryset.db):
+        return 0
+    return queryset.update(search_vector=ACCOMMODATION_SEARCH_VECTOR)
@@ -0,0 +1,240 @@
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from django_project.cache import (
+    model_namespace,
+    object_namespace,
+    schedule_namespace_bump,
+)
+from .bitmasks import MASK_FIELDS, sync_masks
+from .geo import refresh_campus_distances
+from .listings import schedule_listing_refresh
+from .rent_stats import rent_statistic_keys, schedule_rent_statistics
+from .models import Accommodation, Amenity, Institution, PaymentMethod, PropertyType
+from .search import update_search_vectors
+
+ACCOMMODATION_RELATIONS = {
+    Institution: "educational_institutions",
+    Amenity: "amenities",
+    PaymentMethod: "accepted_payments",
+}
+
+
+@receiver(post_save, sender=Accommodation)
+def refresh_search_vector(sender, instance, raw=False, **kwargs):
+    """
+    Keep the stored search vector in step with the indexed text columns.
+    """
+    if raw:
+        return
+    update_search_vectors(Accommodation.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Accommodation)
+def refresh_listing(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    schedule_listing_refresh([instance.pk])
+
+
+@receiver(post_save, sender=Accommodation)
+def refresh_accommodation_distances(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    transaction.on_commit(
+        lambda: refresh_campus_distances(accommodation_ids=[instance.pk])
+    )
+
+
+@receiver(post_save, sender=Institution)
+def refresh_institution_distances(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    transaction.on_commit(
+        lambda: refresh_campus_distances(institution_ids=[instance.pk])
+    )
+
+
+@receiver(pre_save, sender=Accommodation)
+def remember_stored_accommodation(sender, instance, raw=False, **kwargs):
+    """
+    Note the slug, city and property type of the stored row: changing them
+    leaves a cached detail page and rent statistics behind under the old ones.
+    """
+    instance._stored_values = None
+    if raw or instance._state.adding:
+        return
+    instance._stored_values = (
+        Accommodation.objects.filter(pk=instance.pk)
+        .values("slug", "city", "property_type__name")
+        .first()
+    )
+
+
+def stored_values(instance):
+    """
+    The values ``remember_stored_accommodation`` noted, or an empty dict.
+    """
+    return getattr(instance, "_stored_values", None) or {}
+
+
+@receiver(post_save, sender=Accommodation)
+@receiver(pre_delete, sender=Accommodation)
+def refresh_rent_statistics(sender, instance, raw=False, **kwargs):
+    """
+    Recompute the rent statistics the accommodation contributes to, and those
+    it contributed to before the save.
+    """
+    if raw:
+        return
+    keys = rent_statistic_keys(instance)
+    stored = stored_values(instance)
+    if stored:
+        keys["city"].add(stored["city"])
+        keys["property_type"].add(stored["property_type__name"])
+    schedule_rent_statistics(keys)
+
+
+@receiver(m2m_changed, sender=Accommodation.educational_institutions.through)
+def refresh_institution_rent_statistics(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        codes = {instance.name}
+    elif action == "pre_clear":
+        codes = set(instance.educational_institutions.values_list("name", flat=True))
+    else:
+        codes = set(
+            Institution.objects.filter(pk__in=pk_set).values_list("name", flat=True)
+        )
+    schedule_rent_statistics({"institution": codes})
+
+
+def changed_accommodation_ids(sender, instance, action, reverse, pk_set):
+    """
+    Ids of the accommodations touched by an ``m2m_changed`` event, or None.
+    """
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            return [instance.pk]
+    elif action in ("post_add", "post_remove"):
+        return list(pk_set)
+    elif action == "pre_clear":
+        # The cleared accommodations are unknown once the rows are gone.
+        relation = THROUGH_RELATIONS[sender]
+        return list(
+            Accommodation.objects.filter(**{relation: instance}).values_list(
+                "pk", flat=True
+            )
+        )
+    return None
+
+
+def accommodation_relations_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    Rebuild listings and masks whose institutions, amenities or payments changed.
+    """
+    accommodation_ids = changed_accommodation_ids(
+        sender, instance, action, reverse, pk_set
+    )
+    if not accommodation_ids:
+        return
+    schedule_listing_refresh(accommodation_ids)
+    if THROUGH_RELATIONS[sender] in MASKED_RELATIONS:
+        transaction.on_commit(lambda: sync_masks(accommodation_ids))
+    invalidate_accommodations(
+        Accommodation.objects.filter(pk__in=accommodation_ids).values_list(
+            "slug", flat=True
+        )
+    )
+
+
+THROUGH_RELATIONS = {
+    getattr(Accommodation, relation).through: relation
+    for relation in ACCOMMODATION_RELATIONS.values()
+}
+MASKED_RELATIONS = {relation for relation, _ in MASK_FIELDS.values()}
+
+for through in THROUGH_RELATIONS:
+    m2m_changed.connect(accommodation_relations_changed, sender=through)
+
+
+@receiver(post_save, sender=PropertyType)
+def refresh_property_type_listings(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    accommodation_ids = list(
+        Accommodation.objects.filter(property_type=instance).values_list(
+            "pk", flat=True
+        )
+    )
+    schedule_listing_refresh(accommodation_ids)
+
+
+def refresh_lookup_listings(sender, instance, raw=False, **kwargs):
+    """
+    Rebuild listings and masks embedding a lookup row that was edited or is
+    being deleted.
+    """
+    if raw:
+        return
+    relation = ACCOMMODATION_RELATIONS[sender]
+    accommodation_ids = list(
+        Accommodation.objects.filter(**{relation: instance}).values_list(
+            "pk", flat=True
+        )
+    )
+    schedule_listing_refresh(accommodation_ids)
+    if relation in MASKED_RELATIONS and accommodation_ids:
+        # A renamed code or a deleted row changes the bits of its listings.
+        transaction.on_commit(lambda: sync_masks(accommodation_ids))
+
+
+for lookup_model in ACCOMMODATION_RELATIONS:
+    post_save.connect(refresh_lookup_listings, sender=lookup_model)
+    pre_delete.connect(refresh_lookup_listings, sender=lookup_model)
+
+
+def invalidate_accommodations(slugs):
+    """
+    Expire cached accommodation lists and the given detail pages on commit.
+
+    Registered after the read-model handlers above, so the bump runs once the
+    listings it would otherwise serve stale have been rebuilt.
+    """
+    schedule_namespace_bump(
+        model_namespace(Accommodation),
+        *[object_namespace(Accommodation, slug) for slug in slugs],
+    )
+
+
+@receiver(post_save, sender=Accommodation)
+@receiver(post_delete, sender=Accommodation)
+def invalidate_accommodation_cache(sender, instance, **kwargs):
+    # A renamed slug leaves the detail page cached under the old one.
+    slugs = {instance.slug, stored_values(instance).get("slug", instance.slug)}
+    invalidate_accommodations(slugs)
+
+
+def invalidate_lookup_cache(sender, **kwargs):
+    """
+    Expire the reference list of a lookup table and every cached payload
+    embedding it.
+    """
+    schedule_namespace_bump(model_namespace(sender))
+
+
+for lookup_model in [*ACCOMMODATION_RELATIONS, PropertyType]:
+    post_save.connect(invalidate_lookup_cache, sender=lookup_model)
+    post_delete.connect(invalidate_lookup_cache, sender=lookup_model)
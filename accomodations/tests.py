@@ -1,3 +1,966 @@
-from django.test import TestCase
+import datetime
+import io
+import json
+import tempfile
+from base64 import urlsafe_b64encode
+from decimal import Decimal
+from unittest import skipIf, skipUnless
+from urllib.parse import parse_qsl, urlsplit
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponseNotFound, QueryDict
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from prometheus_client import REGISTRY
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory, APITestCase
+
+from bursaries.api import async_views as bursary_async_views
+from bursaries.api import views as bursary_views
+from bursaries.api.serializers import BursaryListSerializer
+from bursaries.models import Bursary, EducationLevel, FieldOfStudy, StudyLevel
+from django_project.cache import local_responses
+from django_project.metrics import RequestMetricsMiddleware
+from django_project.pagination import KeysetPagination
+from django_project.reference import reference_table
+from django_project.values_serialization import ValuesSerializer
+
+from .api import async_views as accommodation_async_views
+from .api import views as accommodation_views
+from .api.serializers import (
+    AccommodationListSerializer,
+    AmenitySerializer,
+    RentStatisticSerializer,
+)
+from .facets import compute_facets, facet_cache_key
+from .filters import AccommodationFilter
+from .models import (
+    Accommodation,
+    AccommodationListing,
+    Amenity,
+    Institution,
+    PaymentMethod,
+    PropertyType,
+    RentStatistic,
+)
+from .search import SEARCH_CONFIG, build_search_query
+
+
+def create_listings():
+    """
+    Accommodations and bursaries covering every kind of field the list and
+    detail payloads render.
+    """
+    owner = get_user_model().objects.create_user(
+        username="landlord", email="landlord@example.com", password="secret"
+    )
+    flat = PropertyType.objects.create(name="apartment")
+    wifi = Amenity.objects.create(name="wifi")
+    parking = Amenity.objects.create(name="parking")
+    cash = PaymentMethod.objects.create(name="cash")
+    uct = Institution.objects.create(
+        name="UCT", city="Cape Town", province="Western Cape"
+    )
+    for index in range(3):
+        accommodation = Accommodation.objects.create(
+            title=f"Room {index}",
+            description="Close to campus",
+            property_type=flat,
+            address=f"{index} Main Road",
+            city="Cape Town",
+            province="Western Cape",
+            postal_code="7700",
+            monthly_rent=Decimal("4500.5") + index,
+            admin_fee=Decimal("100"),
+            deposit_amount=Decimal("500"),
+            bathrooms=Decimal("1.5"),
+            furnished=bool(index % 2),
+            available_from=datetime.date(2027, 1, 1),
+            owner=owner,
+            contact_phone="0211234567",
+            contact_email="landlord@example.com",
+        )
+        accommodation.accepted_payments.add(cash)
+        if index:
+            accommodation.amenities.add(wifi, parking)
+            accommodation.educational_institutions.add(uct)
+
+    engineering = FieldOfStudy.objects.create(name="Engineering")
+    undergraduate = StudyLevel.objects.create(name=StudyLevel.LEVEL_CHOICES[0][0])
+    matric = EducationLevel.objects.create(name=EducationLevel.LEVEL_CHOICES[0][0])
+    for index in range(2):
+        bursary = Bursary.objects.create(
+            name=f"Bursary {index}",
+            provider="Sasol",
+            content="<p>Funding</p>",
+            application_deadline=datetime.date(2027, 2, 1) if index else None,
+            academic_year="2027",
+        )
+        bursary.fields_of_study.add(engineering)
+        bursary.study_levels.add(undergraduate)
+        if index:
+            bursary.education_levels.add(matric)
+
+
+class ValuesSerializationParityTests(TestCase):
+    """
+    The values() fast path must render byte-for-byte what the serializers do.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_listings()
+
+    def assertParity(self, serializer_class, queryset, query=""):
+        request = Request(APIRequestFactory().get(f"/{query}"))
+        context = {"request": request}
+        expected = serializer_class(queryset, many=True, context=context).data
+
+        fast = ValuesSerializer(serializer_class, context=context)
+        actual = fast.serialize(fast.values_queryset(queryset))
+
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(actual), renderer.render(expected))
+
+    def test_accommodation_list(self):
+        self.assertParity(AccommodationListSerializer, Accommodation.objects.all())
+
+    def test_accommodation_sparse_fields(self):
+        self.assertParity(
+            AccommodationListSerializer,
+            Accommodation.objects.all(),
+            "?fields=id,monthly_rent,property_type&expand=amenities",
+        )
+
+    def test_bursary_list(self):
+        self.assertParity(BursaryListSerializer, Bursary.objects.all())
+
+
+class StreamingExportTests(TestCase):
+    """
+    Exports stream the rows the list endpoints render, as NDJSON or CSV.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_listings()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.get(username="landlord")
+        )
+
+    def test_accommodation_export(self):
+        queryset = Accommodation.objects.filter(is_available=True)
+        expected = AccommodationListSerializer(queryset, many=True).data
+
+        response = self.client.get("/api/v1/accommodations/export/")
+        lines = b"".join(response.streaming_content).splitlines()
+        rendered = json.loads(JSONRenderer().render(expected))
+        self.assertEqual([json.loads(line) for line in lines], rendered)
+
+        response = self.client.get(
+            "/api/v1/accommodations/export/?export_format=csv&fields=title,amenities"
+        )
+        rows = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(rows[0], "title,amenities")
+        self.assertIn("Room 1,parking|wifi", rows)
+
+    def test_bursary_export(self):
+        response = self.client.get(
+            "/api/v1/bursaries/export/?export_format=csv&fields=name,provider"
+        )
+        self.assertEqual(response.status_code, 200)
+        rows = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(rows[0], "name,provider")
+        self.assertCountEqual(rows[1:], ["Bursary 0,Sasol", "Bursary 1,Sasol"])
+
+
+@override_settings(API_CACHE_TIMEOUT=0)
+class AsyncViewParityTests(TestCase):
+    """
+    The async twins of the public views must answer exactly as they do.
+    """
+
+    cases = [
+        ("AccommodationListView", "/", {}),
+        ("AccommodationListView", "/?ordering=monthly_rent&min_rent=4501", {}),
+        ("AccommodationListView", "/?pagination=cursor&fields=id,title", {}),
+        ("AccommodationListView", "/?cursor=invalid", {}),
+        ("AccommodationListView", "/?page=9", {}),
+        ("AccommodationDetailView", "/", {"slug": "room-1"}),
+        ("AccommodationDetailView", "/", {"slug": "missing"}),
+        ("AmenityListView", "/", {}),
+        ("RentStatisticListView", "/", {}),
+        ("BursaryListView", "/?ordering=application_deadline", {}),
+        ("BursaryDetailView", "/", {"slug": "bursary-1"}),
+        ("FieldOfStudyListView", "/", {}),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        create_listings()
+
+    async def get(self, view, path, kwargs, **headers):
+        local_responses.clear()
+        if view.view_is_async:
+            request = AsyncRequestFactory().get(path, headers=headers)
+            return await view.as_view()(request, **kwargs)
+        request = RequestFactory().get(path, headers=headers)
+        return await sync_to_async(lambda: view.as_view()(request, **kwargs).render())()
+
+    async def assertParity(self, name, path, kwargs, **headers):
+        for views, twins in [
+            (accommodation_views, accommodation_async_views),
+            (bursary_views, bursary_async_views),
+        ]:
+            if hasattr(views, name):
+                view_class, twin = getattr(views, name), getattr(twins, name)
+        # Namespace versions, and so ETags, must survive between the two
+        # requests; API_CACHE_TIMEOUT=0 keeps the second from being a hit.
+        await cache.aclear()
+        expected = await self.get(view_class, path, kwargs, **headers)
+        actual = await self.get(twin, path, kwargs, **headers)
+        self.assertEqual(actual.status_code, expected.status_code, (name, path))
+        self.assertEqual(actual.content, expected.content, (name, path))
+        for header in ("Content-Type", "Vary", "Allow", "ETag"):
+            self.assertEqual(actual.get(header), expected.get(header), (name, path))
+
+    async def test_responses_match(self):
+        for case in self.cases:
+            await self.assertParity(*case)
+        await self.assertParity(
+            "AmenityListView", "/", {}, accept="application/msgpack"
+        )
+
+    @override_settings(VALUES_LIST_SERIALIZATION=True)
+    async def test_values_serialization_responses_match(self):
+        for case in self.cases:
+            await self.assertParity(*case)
+
+
+class KeysetPaginationTests(TestCase):
+    """
+    Seeking forwards and backwards visits every row once, in the ordering
+    asked for, with NULLs last and ties broken by primary key in the same
+    direction.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        deadlines = [None, "2027-03-01", "2027-02-01", None, "2027-02-01"]
+        for index, deadline in enumerate(deadlines):
+            Bursary.objects.create(
+                name=f"Bursary {index}",
+                provider="Sasol",
+                content="<p>Funding</p>",
+                application_deadline=deadline,
+                academic_year="2027",
+            )
+
+    def paginate(self, params, view):
+        paginator = KeysetPagination()
+        paginator.page_size = 2
+        request = Request(APIRequestFactory().get("/", params))
+        page = paginator.paginate_queryset(Bursary.objects.all(), request, view)
+        return [bursary.name for bursary in page], paginator
+
+    def walk(self, params, direction, view=bursary_views.BursaryListView()):
+        """
+        The pages reached from ``params`` following ``direction`` links, and
+        the query of the last one.
+        """
+        pages = []
+        while True:
+            page, paginator = self.paginate(params, view)
+            pages.append(page)
+            link = getattr(paginator, f"get_{direction}_link")()
+            if link is None:
+                return pages, params
+            params = dict(parse_qsl(urlsplit(link).query))
+
+    def test_seeks_both_ways(self):
+        for ordering, expected in [
+            ("application_deadline", [2, 4, 1, 0, 3]),
+            ("-application_deadline", [1, 4, 2, 3, 0]),
+        ]:
+            with self.subTest(ordering=ordering):
+                pages, last = self.walk({"ordering": ordering}, "next")
+                names = [name for page in pages for name in page]
+                self.assertEqual(names, [f"Bursary {index}" for index in expected])
+
+                back, _ = self.walk(last, "previous")
+                self.assertEqual(back[::-1], pages)
+
+    def test_defaults_to_primary_key(self):
+        pages, _ = self.walk({}, "next", view=None)
+        names = [name for page in pages for name in page]
+        self.assertEqual(names, [f"Bursary {index}" for index in range(4, -1, -1)])
+
+    def test_rejects_invalid_cursors(self):
+        _, paginator = self.paginate({"ordering": "application_deadline"}, None)
+        foreign = dict(parse_qsl(urlsplit(paginator.get_next_link()).query))
+        for cursor in ["invalid", foreign["cursor"]]:
+            with self.subTest(cursor=cursor), self.assertRaises(NotFound):
+                self.paginate(
+                    {"ordering": "application_deadline", "cursor": cursor},
+                    bursary_views.BursaryListView(),
+                )
+
+    def test_rejects_cursor_values_the_field_cannot_hold(self):
+        for ordering, value in [
+            ("-created_at", "garbage"),
+            ("monthly_rent", "abc"),
+            ("monthly_rent", [1]),
+        ]:
+            cursor = {"o": ordering, "v": value, "pk": 1, "r": 0}
+            encoded = urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+            with self.subTest(cursor=cursor):
+                response = self.client.get(
+                    "/api/v1/accommodations/",
+                    {"pagination": "cursor", "ordering": ordering, "cursor": encoded},
+                )
+                self.assertEqual(response.status_code, 404)
+
+    def test_refuses_search(self):
+        response = self.client.get(
+            "/api/v1/accommodations/", {"pagination": "cursor", "search": "room"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class RequestMetricsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_listings()
+
+    def setUp(self):
+        cache.clear()
+        local_responses.clear()
+
+    def get(self, path, route, names, **labels):
+        """
+        The response to ``path`` and how much each metric in ``names`` grew for
+        ``route`` meanwhile.
+        """
+        labels = {"route": route, "method": "GET", **labels}
+        before = [REGISTRY.get_sample_value(name, labels) or 0 for name in names]
+        response = self.client.get(path)
+        after = [REGISTRY.get_sample_value(name, labels) for name in names]
+        return response, [new - old for old, new in zip(before, after)]
+
+    def test_records_per_route(self):
+        names = [
+            "api_request_duration_seconds_count",
+            "api_request_db_queries_sum",
+            "api_request_serializer_duration_seconds_sum",
+            "api_response_size_bytes_sum",
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response, deltas = self.get(
+                "/api/v1/accommodations/", "accommodation-list", names
+            )
+        requests, db_queries, serializer_seconds, size = deltas
+        self.assertEqual(requests, 1)
+        self.assertEqual(db_queries, len(queries))
+        self.assertGreater(serializer_seconds, 0)
+        self.assertEqual(size, len(response.content))
+        self.assertIn("X-Request-Duration", response)
+
+    def test_records_serializer_time_of_detail(self):
+        _, [serializer_seconds] = self.get(
+            "/api/v1/accommodations/room-1/",
+            "accommodation-detail",
+            ["api_request_serializer_duration_seconds_sum"],
+        )
+        self.assertGreater(serializer_seconds, 0)
+
+    def test_counts_cache_hits_and_misses(self):
+        for result in ["miss", "hit"]:
+            _, [lookups] = self.get(
+                "/api/v1/accommodations/",
+                "accommodation-list",
+                ["api_request_cache_lookups_total"],
+                result=result,
+            )
+            self.assertEqual(lookups, 1, result)
+
+    def test_unresolved_paths_share_a_label(self):
+        labels = {"route": "<unresolved>", "method": "other"}
+        name = "api_request_duration_seconds_count"
+        before = REGISTRY.get_sample_value(name, labels) or 0
+        middleware = RequestMetricsMiddleware(lambda request: HttpResponseNotFound())
+        for path in ["/no/such/path/", "/another/missing/path/"]:
+            middleware(RequestFactory().generic("PROPFIND", path))
+        self.assertEqual(REGISTRY.get_sample_value(name, labels) - before, 2)
+
+
+class ReferenceRegistryTests(TestCase):
+    """
+    Lookup tables are served from memory but never outlive a committed write.
+    """
+
+    def test_filter_choices_follow_writes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Amenity.objects.create(name="wifi")
+        self.assertFalse(AccommodationFilter({"amenities": ["pool"]}).is_valid())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Amenity.objects.create(name="pool")
+        self.assertTrue(AccommodationFilter({"amenities": ["pool"]}).is_valid())
+        with self.assertNumQueries(0):
+            self.assertTrue(AccommodationFilter({"amenities": ["wifi"]}).is_valid())
+
+    def test_representation_follows_writes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            wifi = Amenity.objects.create(name="wifi", description="Fibre")
+        data = AmenitySerializer().to_representation(wifi.pk)
+        self.assertEqual(data["description"], "Fibre")
+
+        table = reference_table(Amenity)
+        stale = table.get()
+        wifi.description = "Uncapped fibre"
+        with self.captureOnCommitCallbacks(execute=True):
+            wifi.save()
+            # Reloaded by another thread before the write committed.
+            table.data = stale
+
+        data = AmenitySerializer().to_representation(wifi.pk)
+        self.assertEqual(data["description"], "Uncapped fibre")
+        with self.assertNumQueries(0):
+            AmenitySerializer().to_representation(wifi.pk)
+
+    def test_unknown_rows_reload_once_per_version(self):
+        wifi = Amenity.objects.create(name="wifi")
+        reference_table(Amenity).get()
+        # Created by another process, which bumped a version not polled yet.
+        pool = Amenity.objects.bulk_create([Amenity(name="pool")])[0]
+
+        with self.assertNumQueries(1):
+            data = AmenitySerializer().to_representation(pool.pk)
+        self.assertEqual(data["name"], "pool")
+        with self.assertNumQueries(0):
+            for pk in [wifi.pk + 100, wifi.pk + 101]:
+                self.assertIsNone(AmenitySerializer().to_representation(pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Amenity.objects.create(name="parking")
+        with self.assertNumQueries(2):
+            self.assertIsNone(AmenitySerializer().to_representation(wifi.pk + 100))
+
+    def test_representation_is_a_copy(self):
+        wifi = Amenity.objects.create(name="wifi", description="Fibre")
+        AmenitySerializer().to_representation(wifi.pk)["description"] = "Changed"
+        data = AmenitySerializer().to_representation(wifi.pk)
+        self.assertEqual(data["description"], "Fibre")
+
+
+class ListingReadModelTests(TestCase):
+    """
+    The denormalized listings follow writes to the rows they embed.
+    """
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_listings()
+
+    def listing(self, title):
+        return AccommodationListing.objects.get(accommodation__title=title)
+
+    def test_relation_change_rebuilds_listing(self):
+        self.assertEqual(self.listing("Room 0").amenity_codes, [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Accommodation.objects.get(title="Room 0").amenities.add(
+                Amenity.objects.get(name="wifi")
+            )
+
+        listing = self.listing("Room 0")
+        self.assertEqual(listing.amenity_codes, ["wifi"])
+        self.assertEqual(
+            [amenity["name"] for amenity in listing.detail_data["amenities"]],
+            ["wifi"],
+        )
+
+    def test_unavailable_accommodation_loses_listing(self):
+        accommodation = Accommodation.objects.get(title="Room 1")
+        accommodation.is_available = False
+        with self.captureOnCommitCallbacks(execute=True):
+            accommodation.save()
+
+        self.assertFalse(
+            AccommodationListing.objects.filter(accommodation=accommodation).exists()
+        )
+
+
+class AmenityMaskFilterTests(TestCase):
+    """
+    ``amenities_all`` keeps the listings that have every requested amenity.
+    """
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_listings()
+
+    def titles(self, amenities):
+        filterset = AccommodationFilter(
+            {"amenities_all": amenities}, queryset=Accommodation.objects.all()
+        )
+        return sorted(filterset.qs.values_list("title", flat=True))
+
+    def test_matches_every_requested_amenity(self):
+        self.assertEqual(self.titles(["wifi"]), ["Room 1", "Room 2"])
+        self.assertEqual(self.titles(["wifi", "parking"]), ["Room 1", "Room 2"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Accommodation.objects.get(title="Room 2").amenities.remove(
+                Amenity.objects.get(name="parking")
+            )
+
+        self.assertEqual(self.titles(["wifi"]), ["Room 1", "Room 2"])
+        self.assertEqual(self.titles(["wifi", "parking"]), ["Room 1"])
+
+
+class SearchFilterTests(TestCase):
+    """
+    ``?search=`` ranks full-text matches on PostgreSQL and falls back to
+    ``icontains`` across ``search_fields`` on other databases.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_listings()
+
+    def setUp(self):
+        cache.clear()
+        local_responses.clear()
+
+    def titles(self, params):
+        response = self.client.get("/api/v1/accommodations/", params)
+        return [row["title"] for row in response.json()["results"]]
+
+    def test_builds_prefix_query(self):
+        self.assertEqual(
+            build_search_query(["cape", "town!", "&"]),
+            SearchQuery("cape:* & town:*", search_type="raw", config=SEARCH_CONFIG),
+        )
+        self.assertIsNone(build_search_query(["!", ""]))
+
+    def test_explicit_ordering_overrides_relevance(self):
+        params = {"search": "room", "ordering": "monthly_rent"}
+        self.assertEqual(self.titles(params), ["Room 0", "Room 1", "Room 2"])
+        params["ordering"] = "-monthly_rent"
+        self.assertEqual(self.titles(params), ["Room 2", "Room 1", "Room 0"])
+
+    @skipIf(connection.vendor == "postgresql", "Full-text search on PostgreSQL")
+    def test_falls_back_to_icontains(self):
+        self.assertEqual(self.titles({"search": "main road 1"}), ["Room 1"])
+        self.assertCountEqual(
+            self.titles({"search": "ROOM"}), ["Room 0", "Room 1", "Room 2"]
+        )
+        self.assertFalse(
+            Accommodation.objects.filter(search_vector__isnull=False).exists()
+        )
+
+    @skipUnless(connection.vendor == "postgresql", "Full-text search needs it")
+    def test_save_refreshes_search_vector(self):
+        accommodation = Accommodation.objects.get(title="Room 0")
+        accommodation.title = "Seaside loft"
+        accommodation.save()
+
+        matches = Accommodation.objects.filter(
+            search_vector=build_search_query(["seasi"])
+        )
+        self.assertEqual(list(matches), [accommodation])
+
+    @skipUnless(connection.vendor == "postgresql", "Full-text search needs it")
+    def test_orders_by_relevance(self):
+        for title, description in [
+            ("Room 0", "A cottage close to campus"),
+            ("Room 2", "Close to campus"),
+        ]:
+            accommodation = Accommodation.objects.get(title=title)
+            accommodation.description = description
+            if title == "Room 2":
+                accommodation.title = "Garden cottage"
+            accommodation.save()
+
+        # A title match outranks a description match, whatever the default
+        # ordering says.
+        self.assertEqual(
+            self.titles({"search": "cottage"}), ["Garden cottage", "Room 0"]
+        )
+
+
+class FacetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_listings()
+
+    def test_counts_per_facet_value(self):
+        facets = compute_facets(Accommodation.objects.filter(furnished=False))
+
+        self.assertEqual(facets["count"], 2)
+        self.assertEqual(
+            [(row["value"], row["count"]) for row in facets["property_type"]],
+            [("apartment", 2)],
+        )
+        self.assertEqual(
+            [(row["value"], row["count"]) for row in facets["amenities"]],
+            [("wifi", 1), ("parking", 1)],
+        )
+        self.assertEqual(
+            [row["count"] for row in facets["furnished"]],
+            [0, 2],
+        )
+        rent = {row["value"]: row["count"] for row in facets["monthly_rent"]}
+        self.assertEqual(rent["3500-5000"], 2)
+        self.assertEqual(sum(rent.values()), 2)
+
+    def test_cache_key_ignores_presentation_params(self):
+        key = facet_cache_key(QueryDict("city=Cape+Town&furnished=true"), [])
+        for extra in ["fields=id,title", "expand=amenities", "ordering=-monthly_rent"]:
+            query = QueryDict(f"furnished=true&{extra}&city=Cape+Town")
+            self.assertEqual(facet_cache_key(query, []), key)
+        self.assertNotEqual(facet_cache_key(QueryDict("city=Durban"), []), key)
+
+
+class CampusProximityTests(TestCase):
+    """
+    ``near`` and ``radius_km`` keep the listings within reach of a campus.
+    """
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_listings()
+            uct = Institution.objects.get(name="UCT")
+            uct.latitude, uct.longitude = -33.9577, 18.4612
+            uct.save()
+        # About 1 km, 5.5 km and 33 km north of the campus.
+        for index, offset in enumerate([0.01, 0.05, 0.3]):
+            accommodation = Accommodation.objects.get(title=f"Room {index}")
+            accommodation.latitude = uct.latitude + offset
+            accommodation.longitude = uct.longitude
+            with self.captureOnCommitCallbacks(execute=True):
+                accommodation.save()
+
+    def distances(self, **params):
+        filterset = AccommodationFilter(params, queryset=Accommodation.objects.all())
+        self.assertTrue(filterset.is_valid(), filterset.errors)
+        return {
+            accommodation.title: round(accommodation.distance)
+            for accommodation in filterset.qs
+        }
+
+    def test_default_radius(self):
+        self.assertEqual(self.distances(near="UCT"), {"Room 0": 1, "Room 1": 6})
+
+    def test_radius_and_institution_id(self):
+        uct = Institution.objects.get(name="UCT")
+        self.assertEqual(self.distances(near="UCT", radius_km=2), {"Room 0": 1})
+        self.assertEqual(
+            self.distances(near=str(uct.pk), radius_km=40),
+            {"Room 0": 1, "Room 1": 6, "Room 2": 33},
+        )
+        self.assertEqual(self.distances(near="unknown"), {})
+
+    def test_moved_accommodation_leaves_radius(self):
+        accommodation = Accommodation.objects.get(title="Room 0")
+        accommodation.latitude += 0.5
+        with self.captureOnCommitCallbacks(execute=True):
+            accommodation.save()
+
+        self.assertEqual(self.distances(near="UCT"), {"Room 1": 6})
+
+
+class RentStatisticTests(TestCase):
+    """
+    Writes keep the statistics of every key they touch current, including the
+    keys an accommodation leaves.
+    """
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_listings()
+
+    def rent_counts(self, dimension):
+        return dict(
+            RentStatistic.objects.filter(
+                dimension=dimension, metric="monthly_rent"
+            ).values_list("key", "count")
+        )
+
+    def test_city_change_moves_listing(self):
+        self.assertEqual(self.rent_counts("city"), {"Cape Town": 3})
+
+        accommodation = Accommodation.objects.get(title="Room 0")
+        accommodation.city = "Durban"
+        with self.captureOnCommitCallbacks(execute=True):
+            accommodation.save()
+
+        self.assertEqual(self.rent_counts("city"), {"Cape Town": 2, "Durban": 1})
+
+    def test_property_type_change_and_delete(self):
+        accommodation = Accommodation.objects.get(title="Room 2")
+        accommodation.property_type = PropertyType.objects.create(name="house")
+        with self.captureOnCommitCallbacks(execute=True):
+            accommodation.save()
+        self.assertEqual(
+            self.rent_counts("property_type"), {"apartment": 2, "house": 1}
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            accommodation.delete()
+        self.assertEqual(self.rent_counts("property_type"), {"apartment": 2})
+        self.assertEqual(self.rent_counts("institution"), {"UCT": 1})
+
+    def test_label(self):
+        statistic = RentStatistic.objects.get(
+            dimension="city", key="Cape Town", metric="monthly_rent"
+        )
+        data = RentStatisticSerializer(statistic).data
+        self.assertEqual(data["label"], "Cape Town")
+        self.assertEqual(data["median"], "4501.50")
+
+        statistic.dimension, statistic.key = "institution", "uct"
+        data = RentStatisticSerializer(statistic).data
+        self.assertEqual(data["label"], "University of Cape Town")
+
+
+class ResponseCacheInvalidationTests(TestCase):
+    """
+    A cached response is never served once a committed write changed it.
+    """
+
+    def setUp(self):
+        cache.clear()
+        local_responses.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            create_listings()
+        self.client = APIClient()
+
+    def save(self, accommodation):
+        with self.captureOnCommitCallbacks(execute=True):
+            accommodation.save()
+
+    def test_write_expires_detail_and_list(self):
+        detail = "/api/v1/accommodations/room-1/"
+        listing = "/api/v1/accommodations/"
+        data = self.client.get(detail).json()
+        self.assertEqual(data["monthly_rent"], "4501.50")
+        self.assertNotIn("admin_fee", data)
+        self.client.get(listing)
+
+        accommodation = Accommodation.objects.get(slug="room-1")
+        accommodation.monthly_rent = Decimal("3900")
+        self.save(accommodation)
+
+        self.assertEqual(self.client.get(detail).json()["monthly_rent"], "3900.00")
+        rows = self.client.get(listing).json()["results"]
+        rents = {row["title"]: row["monthly_rent"] for row in rows}
+        self.assertEqual(rents["Room 1"], "3900.00")
+
+    def test_renamed_slug_expires_old_detail(self):
+        old, new = "/api/v1/accommodations/room-1/", "/api/v1/accommodations/room-one/"
+        self.assertEqual(self.client.get(old).status_code, 200)
+
+        accommodation = Accommodation.objects.get(slug="room-1")
+        accommodation.slug = "room-one"
+        self.save(accommodation)
+
+        self.assertEqual(self.client.get(old).status_code, 404)
+        self.assertEqual(self.client.get(new).status_code, 200)
+
+
+class ConditionalGetTests(TestCase):
+    """
+    Detail validators change with the row and with every lookup it embeds.
+    """
+
+    detail = "/api/v1/accommodations/room-1/"
+
+    def setUp(self):
+        cache.clear()
+        local_responses.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            create_listings()
+        self.client = APIClient()
+
+    def validators(self):
+        response = self.client.get(self.detail)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"], response["Last-Modified"]
+
+    def assertNotModified(self, etag, last_modified):
+        response = self.client.get(self.detail, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        response = self.client.get(self.detail, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_matching_validators(self):
+        self.assertNotModified(*self.validators())
+
+    def test_write_changes_validators(self):
+        etag, _ = self.validators()
+        accommodation = Accommodation.objects.get(slug="room-1")
+        accommodation.monthly_rent = Decimal("3900")
+        with self.captureOnCommitCallbacks(execute=True):
+            accommodation.save()
+
+        response = self.client.get(self.detail, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertNotModified(response["ETag"], response["Last-Modified"])
+
+    def test_lookup_edit_changes_validators(self):
+        etag, _ = self.validators()
+        updated_at = Accommodation.objects.get(slug="room-1").updated_at
+        wifi = Amenity.objects.get(name="wifi")
+        wifi.description = "Uncapped fibre"
+        with self.captureOnCommitCallbacks(execute=True):
+            wifi.save()
+
+        response = self.client.get(self.detail, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        amenities = {row["name"]: row for row in response.json()["amenities"]}
+        self.assertEqual(amenities["wifi"]["description"], "Uncapped fibre")
+        # The listings embedding the amenity are not rewritten.
+        self.assertEqual(
+            Accommodation.objects.get(slug="room-1").updated_at, updated_at
+        )
+
+
+class ImportAccommodationsTests(TestCase):
+    def test_import_skips_bad_rows(self):
+        get_user_model().objects.create_user(
+            username="operator", email="operator@example.com", password="secret"
+        )
+        PropertyType.objects.create(name="single_room")
+        Institution.objects.create(name="uct", city="Cape Town", province="WC")
+        Amenity.objects.create(name="wifi")
+        PaymentMethod.objects.create(name="nsfas")
+        row = {
+            "title": "Residence room",
+            "description": "Close to campus",
+            "property_type": "single_room",
+            "educational_institutions": ["uct"],
+            "address": "1 Main Road",
+            "city": "Cape Town",
+            "province": "Western Cape",
+            "postal_code": "7700",
+            "monthly_rent": "3500",
+            "admin_fee": "0",
+            "deposit_amount": "500",
+            "bathrooms": "1",
+            "available_from": "2027-01-01",
+            "amenities": ["wifi"],
+            "accepted_payments": ["nsfas"],
+            "contact_phone": "0211234567",
+            "contact_email": "operator@example.com",
+        }
+        lines = [
+            row,
+            {**row, "property_type": "castle"},
+            row,
+            {**row, "monthly_rent": "0"},
+            {**row, "available_from": "2020-01-01"},
+        ]
+
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl") as source:
+            source.write("\n".join(json.dumps(line) for line in lines))
+            source.flush()
+            stderr = io.StringIO()
+            call_command(
+                "import_accommodations",
+                source.name,
+                owner="operator",
+                stdout=io.StringIO(),
+                stderr=stderr,
+            )
+
+        errors = stderr.getvalue().splitlines()
+        self.assertEqual(
+            errors,
+            [
+                "line 2: property_type: Unknown codes: castle.",
+                "line 4: monthly_rent: Rent must be a positive value.",
+                "line 5: available_from: Available date must be in the future.",
+            ],
+        )
+        slugs = Accommodation.objects.values_list("slug", flat=True)
+        self.assertCountEqual(slugs, ["residence-room", "residence-room-2"])
+        self.assertEqual(AccommodationListing.objects.count(), 2)
+        accommodation = Accommodation.objects.first()
+        self.assertNotEqual(accommodation.amenity_mask, 0)
+        self.assertEqual(accommodation.educational_institutions.count(), 1)
+
+
+class LandlordBatchTests(APITestCase):
+    def test_batch_creates_updates_and_reports(self):
+        owner = get_user_model().objects.create_user(
+            username="manager", email="manager@example.com", password="secret"
+        )
+        room = PropertyType.objects.create(name="single_room")
+        wifi = Amenity.objects.create(name="wifi")
+        cctv = Amenity.objects.create(name="cctv")
+        uct = Institution.objects.create(name="uct", city="Cape Town", province="WC")
+        nsfas = PaymentMethod.objects.create(name="nsfas")
+        item = {
+            "title": "Garden flat",
+            "description": "Close to campus",
+            "property_type": room.pk,
+            "educational_institutions": [uct.pk],
+            "address": "1 Main Road",
+            "city": "Cape Town",
+            "province": "Western Cape",
+            "postal_code": "7700",
+            "monthly_rent": "3500.00",
+            "admin_fee": "0.00",
+            "deposit_amount": "500.00",
+            "bathrooms": "1.0",
+            "available_from": "2027-01-01",
+            "amenities": [wifi.pk, cctv.pk],
+            "accepted_payments": [nsfas.pk],
+            "contact_phone": "0211234567",
+            "contact_email": "manager@example.com",
+        }
+        url = "/api/v1/landlord/accommodations/batch/"
+        self.client.force_authenticate(owner)
+        self.client.post(url, [item], format="json")
+        existing = Accommodation.objects.get()
+
+        update = {
+            "slug": existing.slug,
+            "monthly_rent": "3900.00",
+            "amenities": [cctv.pk],
+        }
+        response = self.client.post(
+            url,
+            [
+                {**item, **update},
+                item,
+                {**item, "property_type": 999},
+                {**item, "slug": "missing"},
+                {**item, "deposit_amount": "-1.00"},
+            ],
+            format="json",
+        )
+
+        statuses = [result["status"] for result in response.data["results"]]
+        self.assertEqual(
+            statuses, ["updated", "created", "invalid", "not_found", "invalid"]
+        )
+        self.assertEqual(response.data["results"][1]["slug"], "garden-flat-2")
+        existing.refresh_from_db()
+        self.assertEqual(existing.monthly_rent, Decimal("3900.00"))
+        self.assertEqual(list(existing.amenities.all()), [cctv])
+        self.assertEqual(Accommodation.objects.count(), 2)
@@ -0,0 +1,40 @@
+"""
+Listing rules shared by the API serializers and the bulk import, beyond what
+the model fields check.
+"""
+
+from datetime import date
+
+from django.core.exceptions import ValidationError
+
+# Fields the rules read.
+LISTING_TERM_FIELDS = [
+    "monthly_rent",
+    "deposit_amount",
+    "max_occupants",
+    "available_from",
+]
+
+
+def validate_listing_terms(data):
+    """
+    Check rent, deposit, occupancy and availability in ``data``, a mapping of
+    already converted field values, raising ValidationError on the first
+    broken rule.
+    """
+    if data.get("monthly_rent", 0) <= 0:
+        raise ValidationError({"monthly_rent": "Rent must be a positive value."})
+
+    if data.get("deposit_amount", 0) < 0:
+        raise ValidationError({"deposit_amount": "Deposit cannot be negative."})
+
+    if data.get("max_occupants", 1) < 1:
+        raise ValidationError(
+            {"max_occupants": "At least one occupant is required."}
+        )
+
+    available_from = data.get("available_from")
+    if available_from and available_from < date.today():
+        raise ValidationError(
+            {"available_from": "Available date must be in the future."}
+        )
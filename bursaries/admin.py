@@ -0,0 +1,38 @@
+from django.contrib import admin
+
+from django_project.admin_filters import ReferenceListFilter
+from .models import Bursary, EducationLevel, FieldOfStudy, StudyLevel
+
+
+class FieldOfStudyFilter(ReferenceListFilter):
+    title = "field of study"
+    parameter_name = "fields_of_study"
+    model = FieldOfStudy
+    lookup = "name"
+
+
+class StudyLevelFilter(ReferenceListFilter):
+    title = "study level"
+    parameter_name = "study_levels"
+    model = StudyLevel
+    lookup = "name"
+
+
+@admin.register(Bursary)
+class BursaryAdmin(admin.ModelAdmin):
+    list_display = [
+        "name",
+        "provider",
+        "status",
+        "academic_year",
+        "application_deadline",
+    ]
+    list_filter = ["status", "academic_year", FieldOfStudyFilter, StudyLevelFilter]
+    search_fields = ["name", "provider"]
+    prepopulated_fields = {"slug": ["name"]}
+    filter_horizontal = ["fields_of_study", "education_levels", "study_levels"]
+
+
+@admin.register(FieldOfStudy, StudyLevel, EducationLevel)
+class LookupAdmin(admin.ModelAdmin):
+    list_display = ["__str__", "name"]
@@ -0,0 +1,45 @@
+"""
+Async twins of the public views in bursaries.api.views, served instead of them
+when ``settings.ASYNC_PUBLIC_API`` is on (see django_project.async_views).
+"""
+
+from django_project.async_views import AsyncListView, AsyncRetrieveView
+from django_project.cache import acache_response
+from django_project.conditional import aconditional_get
+from . import views
+
+
+class ReferenceListView(AsyncListView):
+    @aconditional_get
+    @acache_response(local=True)
+    async def get(self, request, *args, **kwargs):
+        return await self.respond(self.list)
+
+
+class FieldOfStudyListView(ReferenceListView):
+    view_class = views.FieldOfStudyListView
+
+
+class StudyLevelListView(ReferenceListView):
+    view_class = views.StudyLevelListView
+
+
+class EducationLevelListView(ReferenceListView):
+    view_class = views.EducationLevelListView
+
+
+class BursaryListView(AsyncListView):
+    view_class = views.BursaryListView
+
+    @acache_response()
+    async def get(self, request, *args, **kwargs):
+        return await self.respond(self.list)
+
+
+class BursaryDetailView(AsyncRetrieveView):
+    view_class = views.BursaryDetailView
+
+    @aconditional_get
+    @acache_response()
+    async def get(self, request, *args, **kwargs):
+        return await self.respond(self.retrieve)
@@ -1,26 +1,29 @@
 from rest_framework import serializers
+
+from django_project.reference import ReferenceSerializer
+from django_project.sparse_fields import SparseFieldsMixin
 from ..models import Bursary, FieldOfStudy, StudyLevel, EducationLevel
 
 
-class FieldOfStudySerializer(serializers.ModelSerializer):
+class FieldOfStudySerializer(ReferenceSerializer):
     class Meta:
         model = FieldOfStudy
         fields = ["id", "name"]
 
 
-class StudyLevelSerializer(serializers.ModelSerializer):
+class StudyLevelSerializer(ReferenceSerializer):
     class Meta:
         model = StudyLevel
         fields = ["id", "name"]
 
 
-class EducationLevelSerializer(serializers.ModelSerializer):
+class EducationLevelSerializer(ReferenceSerializer):
     class Meta:
         model = EducationLevel
         fields = ["id", "name"]
 
 
-class BursaryListSerializer(serializers.ModelSerializer):
+class BursaryListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     fields_of_study = FieldOfStudySerializer(many=True, read_only=True)
     education_levels = EducationLevelSerializer(many=True, read_only=True)
     study_levels = StudyLevelSerializer(many=True, read_only=True)
@@ -41,7 +44,7 @@ class BursaryListSerializer(serializers.ModelSerializer):
         ]
 
 
-class BursaryDetailSerializer(serializers.ModelSerializer):
+class BursaryDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     fields_of_study = FieldOfStudySerializer(many=True, read_only=True)
     education_levels = EducationLevelSerializer(many=True, read_only=True)
     study_levels = StudyLevelSerializer(many=True, read_only=True)
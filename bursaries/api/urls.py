@@ -1,27 +1,28 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import (
-    BursaryListView,
-    BursaryDetailView,
-    BursaryManagementViewSet,
-    FieldOfStudyListView,
-    StudyLevelListView,
-    EducationLevelListView,
-)
+from . import async_views, views
+from .views import BursaryExportView, BursaryManagementViewSet
+
+# Public reads are served by the async twins of their views under ASGI.
+public = async_views if settings.ASYNC_PUBLIC_API else views
 
 router = DefaultRouter()
 router.register(r"", BursaryManagementViewSet, basename="bursary")
 
 urlpatterns = [
-    path("", BursaryListView.as_view(), name="bursary-list"),
-    path("<slug:slug>/", BursaryDetailView.as_view(), name="bursary-detail"),
+    path("", public.BursaryListView.as_view(), name="bursary-list"),
+    path("bursaries/export/", BursaryExportView.as_view(), name="bursary-export"),
+    path("<slug:slug>/", public.BursaryDetailView.as_view(), name="bursary-detail"),
     path(
-        "fields-of-study/", FieldOfStudyListView.as_view(), name="field-of-study-list"
+        "fields-of-study/",
+        public.FieldOfStudyListView.as_view(),
+        name="field-of-study-list",
     ),
-    path("study-levels/", StudyLevelListView.as_view(), name="study-level-list"),
+    path("study-levels/", public.StudyLevelListView.as_view(), name="study-level-list"),
     path(
         "education-levels/",
-        EducationLevelListView.as_view(),
+        public.EducationLevelListView.as_view(),
         name="education-level-list",
     ),
     path("", include(router.urls)),
@@ -1,8 +1,6 @@
 from rest_framework import viewsets, permissions, generics, status
 from rest_framework.response import Response
-from drf_spectacular.utils import extend_schema
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from ..models import Bursary, FieldOfStudy, StudyLevel, EducationLevel
 from .serializers import (
     BursaryListSerializer,
@@ -15,45 +13,93 @@ from .serializers import (
 from ..filters import BursaryFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
+from django_project.cache import (
+    NamespacedCacheMixin,
+    cache_response,
+    model_namespace,
+    object_namespace,
+)
+from django_project.conditional import (
+    NamespaceValidatorsMixin,
+    UpdatedAtValidatorsMixin,
+    conditional_get,
+)
+from django_project.exports import EXPORT_FORMAT_PARAM, StreamingExportMixin
+from django_project.metrics import SerializerTimingMixin
+from django_project.pagination import ListingPagination
+from django_project.sparse_fields import SparseQuerysetMixin
+from django_project.values_serialization import ValuesListMixin
 
+# Lookup tables embedded in bursary payloads.
+LOOKUP_NAMESPACES = [
+    model_namespace(model) for model in (FieldOfStudy, StudyLevel, EducationLevel)
+]
 
-class FieldOfStudyListView(generics.ListAPIView):
+
+class FieldOfStudyListView(
+    SerializerTimingMixin,
+    NamespaceValidatorsMixin,
+    NamespacedCacheMixin,
+    generics.ListAPIView,
+):
     queryset = FieldOfStudy.objects.all()
     serializer_class = FieldOfStudySerializer
     permission_classes = [permissions.AllowAny]
+    cache_namespaces = [model_namespace(FieldOfStudy)]
 
-    @method_decorator(cache_page(60 * 60))  # Cache for 1 hour
+    @conditional_get
+    @cache_response(local=True)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
 
-class StudyLevelListView(generics.ListAPIView):
+class StudyLevelListView(
+    SerializerTimingMixin,
+    NamespaceValidatorsMixin,
+    NamespacedCacheMixin,
+    generics.ListAPIView,
+):
     queryset = StudyLevel.objects.all()
     serializer_class = StudyLevelSerializer
     permission_classes = [permissions.AllowAny]
+    cache_namespaces = [model_namespace(StudyLevel)]
 
-    @method_decorator(cache_page(60 * 60))
+    @conditional_get
+    @cache_response(local=True)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
 
-class EducationLevelListView(generics.ListAPIView):
+class EducationLevelListView(
+    SerializerTimingMixin,
+    NamespaceValidatorsMixin,
+    NamespacedCacheMixin,
+    generics.ListAPIView,
+):
     queryset = EducationLevel.objects.all()
     serializer_class = EducationLevelSerializer
     permission_classes = [permissions.AllowAny]
+    cache_namespaces = [model_namespace(EducationLevel)]
 
-    @method_decorator(cache_page(60 * 60))
+    @conditional_get
+    @cache_response(local=True)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
 
 @extend_schema(tags=["Bursaries"])
-class BursaryListView(generics.ListAPIView):
-    queryset = Bursary.objects.select_related().prefetch_related(
-        "fields_of_study", "education_levels", "study_levels"
-    )
+class BursaryListView(
+    SerializerTimingMixin,
+    NamespacedCacheMixin,
+    SparseQuerysetMixin,
+    ValuesListMixin,
+    generics.ListAPIView,
+):
+    queryset = Bursary.objects.all()
+    sparse_prefetch_related = ["fields_of_study", "education_levels", "study_levels"]
     serializer_class = BursaryListSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = ListingPagination
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
@@ -63,28 +109,66 @@ class BursaryListView(generics.ListAPIView):
     search_fields = ["name", "provider", "content"]
     ordering_fields = ["created_at", "application_deadline"]
     ordering = ["-created_at"]
+    keyset_ordering_fields = ["created_at", "application_deadline"]
+    cache_namespaces = [model_namespace(Bursary), *LOOKUP_NAMESPACES]
 
-    @method_decorator(cache_page(60 * 5))  # Cache for 5 minutes
+    @cache_response()
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
 
 @extend_schema(tags=["Bursaries"])
-class BursaryDetailView(generics.RetrieveAPIView):
-    queryset = Bursary.objects.select_related().prefetch_related(
-        "fields_of_study", "education_levels", "study_levels"
+class BursaryExportView(StreamingExportMixin, generics.GenericAPIView):
+    """
+    Every bursary matching the list filters, streamed.
+    """
+
+    queryset = Bursary.objects.all()
+    serializer_class = BursaryListSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filterset_class = BursaryFilter
+    search_fields = BursaryListView.search_fields
+    pagination_class = None
+    export_filename = "bursaries"
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name=EXPORT_FORMAT_PARAM,
+                description="ndjson (default) or csv",
+                required=False,
+            ),
+        ],
+        responses={200: BursaryListSerializer(many=True)},
     )
+    def get(self, request, *args, **kwargs):
+        return self.export(request)
+
+
+@extend_schema(tags=["Bursaries"])
+class BursaryDetailView(
+    SerializerTimingMixin,
+    UpdatedAtValidatorsMixin,
+    NamespacedCacheMixin,
+    SparseQuerysetMixin,
+    generics.RetrieveAPIView,
+):
+    queryset = Bursary.objects.all()
+    sparse_prefetch_related = ["fields_of_study", "education_levels", "study_levels"]
     serializer_class = BursaryDetailSerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = "slug"
+    cache_namespaces = [object_namespace(Bursary, "{slug}"), *LOOKUP_NAMESPACES]
 
-    @method_decorator(cache_page(60 * 5))
+    @conditional_get
+    @cache_response()
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
 
 @extend_schema(tags=["Bursary Management"])
-class BursaryManagementViewSet(viewsets.ModelViewSet):
+class BursaryManagementViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     serializer_class = BursaryCreateUpdateSerializer
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = "slug"
@@ -112,7 +196,7 @@ class BursaryManagementViewSet(viewsets.ModelViewSet):
 
 
 @extend_schema(tags=["Provider Bursaries"])
-class ProviderBursaryViewSet(viewsets.ModelViewSet):
+class ProviderBursaryViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     """
     Manage provider's bursaries.
 
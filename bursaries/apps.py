@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BursariesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'bursaries'
+
+    def ready(self):
+        import bursaries.signals
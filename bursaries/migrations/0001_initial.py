@@ -0,0 +1,71 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:04
+
+import django_ckeditor_5.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EducationLevel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(choices=[('undergraduate', 'Undergraduate'), ('postgraduate', 'Postgraduate')], max_length=50)),
+            ],
+            options={
+                'verbose_name_plural': 'Education Levels',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FieldOfStudy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Fields of Study',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StudyLevel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(choices=[('certificate', 'Certificate'), ('diploma', 'Diploma'), ('degree', 'Degree'), ('honours', 'Honours'), ('masters', 'Masters'), ('phd', 'PhD')], max_length=50)),
+            ],
+            options={
+                'verbose_name_plural': 'Study Levels',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Bursary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('slug', models.SlugField(blank=True, max_length=200, unique=True)),
+                ('provider', models.CharField(max_length=200)),
+                ('content', django_ckeditor_5.fields.CKEditor5Field(verbose_name='Text')),
+                ('application_url', models.URLField(blank=True)),
+                ('application_deadline', models.DateField(blank=True, null=True)),
+                ('academic_year', models.CharField(db_index=True, max_length=4)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('closed', 'Closed'), ('upcoming', 'Upcoming')], default='open', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('education_levels', models.ManyToManyField(related_name='bursaries', to='bursaries.educationlevel')),
+                ('fields_of_study', models.ManyToManyField(related_name='bursaries', to='bursaries.fieldofstudy')),
+                ('study_levels', models.ManyToManyField(related_name='bursaries', to='bursaries.studylevel')),
+            ],
+            options={
+                'verbose_name_plural': 'Bursaries',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from django_project.cache import (
+    model_namespace,
+    object_namespace,
+    schedule_namespace_bump,
+)
+from .models import Bursary, EducationLevel, FieldOfStudy, StudyLevel
+
+BURSARY_RELATIONS = {
+    FieldOfStudy: "fields_of_study",
+    EducationLevel: "education_levels",
+    StudyLevel: "study_levels",
+}
+
+
+def invalidate_bursaries(slugs):
+    """
+    Expire cached bursary lists and the given detail pages on commit.
+    """
+    schedule_namespace_bump(
+        model_namespace(Bursary),
+        *[object_namespace(Bursary, slug) for slug in slugs],
+    )
+
+
+@receiver(post_save, sender=Bursary)
+@receiver(post_delete, sender=Bursary)
+def invalidate_bursary_cache(sender, instance, **kwargs):
+    invalidate_bursaries([instance.slug])
+
+
+def bursary_relations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action not in ("post_add", "post_remove", "post_clear"):
+            return
+        bursaries = Bursary.objects.filter(pk=instance.pk)
+    elif action in ("post_add", "post_remove"):
+        bursaries = Bursary.objects.filter(pk__in=pk_set)
+    elif action == "pre_clear":
+        # The cleared bursaries are unknown once the rows are gone.
+        bursaries = Bursary.objects.filter(**{THROUGH_RELATIONS[sender]: instance})
+    else:
+        return
+    invalidate_bursaries(bursaries.values_list("slug", flat=True))
+
+
+def invalidate_lookup_cache(sender, **kwargs):
+    """
+    Expire the reference list of a lookup table and every cached payload
+    embedding it.
+    """
+    schedule_namespace_bump(model_namespace(sender))
+
+
+THROUGH_RELATIONS = {
+    getattr(Bursary, relation).through: relation
+    for relation in BURSARY_RELATIONS.values()
+}
+
+for through in THROUGH_RELATIONS:
+    m2m_changed.connect(bursary_relations_changed, sender=through)
+
+for lookup_model in BURSARY_RELATIONS:
+    post_save.connect(invalidate_lookup_cache, sender=lookup_model)
+    post_delete.connect(invalidate_lookup_cache, sender=lookup_model)
@@ -0,0 +1,30 @@
+"""
+Admin list filters. Kept apart from django_project.reference so the registry
+can be imported without django.contrib.admin, which the api role leaves out.
+"""
+
+from django.contrib import admin
+
+from .reference import reference_table
+
+
+class ReferenceListFilter(admin.SimpleListFilter):
+    """
+    Admin sidebar filter over a lookup relation, with its options taken from
+    the registry. Subclasses set ``model``, ``parameter_name`` (the relation)
+    and ``title``; ``lookup`` is ``"id"`` for foreign keys or ``"name"`` to
+    match codes across a many-to-many relation.
+    """
+
+    model = None
+    lookup = "id"
+
+    def lookups(self, request, model_admin):
+        data = reference_table(self.model).get()
+        return data.id_choices if self.lookup == "id" else data.code_choices
+
+    def queryset(self, request, queryset):
+        if not self.value():
+            return queryset
+        lookup = f"{self.parameter_name}__{self.lookup}"
+        return queryset.filter(**{lookup: self.value()}).distinct()
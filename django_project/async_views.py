@@ -0,0 +1,152 @@
+"""
+Async read path for the public API, for deployments on ASGI workers.
+
+Each async view mirrors a DRF view (``view_class``) and reuses its
+configuration: content negotiation, filters, pagination, serializers, cache
+namespaces and validators. What waits on the network (namespace versions,
+cached responses, counts and row fetches) goes through the async cache API and
+the async ORM, so one worker keeps serving other requests in the meantime.
+Building querysets and serializing instances can load a reference table
+(django_project.reference), which only has a sync loader, so those steps run
+through ``sync_to_async``.
+
+Responses are identical to those of the views mirrored, cache entries are
+shared with them, and schema generation describes the endpoints through them.
+Requests are not authenticated: the mirrored views are public and what they
+return does not depend on the user.
+"""
+
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.views import View
+from rest_framework.response import Response
+
+from .values_serialization import ValuesListMixin, ValuesSerializer
+
+
+class AsyncAPIView(View):
+    """
+    Async GET handler for the public DRF view ``view_class``.
+
+    Subclasses implement ``get``, wrapping a coroutine returning a DRF
+    Response in ``respond`` and decorating it like the mirrored view's handler
+    (``acache_response``, ``aconditional_get``).
+    """
+
+    view_class = None
+    http_method_names = ["get", "head", "options"]
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Lets drf-spectacular document the endpoint from the mirrored view.
+        view.cls, view.initkwargs = cls.view_class, {}
+        return view
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        api_view = self.view_class()
+        api_view.setup(request, *args, **kwargs)
+        api_view.format_kwarg = None
+        api_view.headers = api_view.default_response_headers
+        api_view.request = api_view.initialize_request(request, *args, **kwargs)
+        self.api_view = api_view
+
+    async def options(self, request, *args, **kwargs):
+        # DRF's metadata response, from the mirrored view itself.
+        view = self.view_class.as_view()
+        return await sync_to_async(view)(request, *args, **kwargs)
+
+    def get_cache_namespaces(self):
+        return self.api_view.get_cache_namespaces()
+
+    async def aget_validators(self):
+        return await self.api_view.aget_validators()
+
+    def initial(self):
+        """
+        ``APIView.initial()`` without authentication, permission and throttle
+        checks, none of which apply to public reads.
+        """
+        view, request = self.api_view, self.api_view.request
+        negotiated = view.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = negotiated
+        request.version, request.versioning_scheme = view.determine_version(
+            request, *view.args, **view.kwargs
+        )
+
+    async def respond(self, handler):
+        """
+        Await ``handler()`` and render its Response, or the error it raised,
+        the way ``APIView.dispatch()`` would.
+        """
+        view = self.api_view
+        try:
+            self.initial()
+            response = await handler()
+        except Exception as exc:
+            response = view.handle_exception(exc)
+        return view.finalize_response(view.request, response).render()
+
+    async def filtered_queryset(self):
+        view = self.api_view
+        return await sync_to_async(lambda: view.filter_queryset(view.get_queryset()))()
+
+    async def serialize(self, instance, many=False):
+        return await sync_to_async(
+            lambda: self.api_view.get_serializer(instance, many=many).data
+        )()
+
+
+class AsyncListView(AsyncAPIView):
+    """
+    ``ListModelMixin.list()`` for a ListAPIView, including its ValuesListMixin
+    fast path.
+    """
+
+    async def list(self):
+        view = self.api_view
+        queryset = await self.filtered_queryset()
+        if isinstance(view, ValuesListMixin) and view.use_values_serialization():
+            serializer = ValuesSerializer(
+                view.get_serializer_class(), context=view.get_serializer_context()
+            )
+            queryset = serializer.values_queryset(
+                queryset, *getattr(view, "keyset_ordering_fields", [])
+            )
+            serialize = serializer.aserialize
+        else:
+            serialize = partial(self.serialize, many=True)
+
+        page = None
+        if view.paginator is not None:
+            page = await view.paginator.apaginate_queryset(
+                queryset, view.request, view
+            )
+        if page is None:
+            return Response(await serialize([row async for row in queryset]))
+        return view.get_paginated_response(await serialize(page))
+
+
+class AsyncRetrieveView(AsyncAPIView):
+    """
+    ``RetrieveModelMixin.retrieve()`` for a RetrieveAPIView.
+    """
+
+    async def get_object(self):
+        view = self.api_view
+        queryset = await self.filtered_queryset()
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        try:
+            obj = await queryset.aget(
+                **{view.lookup_field: view.kwargs[lookup_url_kwarg]}
+            )
+        except queryset.model.DoesNotExist:
+            raise Http404
+        view.check_object_permissions(view.request, obj)
+        return obj
+
+    async def retrieve(self):
+        return Response(await self.serialize(await self.get_object()))
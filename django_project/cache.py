@@ -0,0 +1,484 @@
+"""
+Versioned cache namespaces for API responses.
+
+Every cached response is keyed by the current version of each namespace it
+depends on (a table, or a single object in it). Writes bump those versions
+from signal handlers, so entries can live for hours and still never be served
+after the data behind them changed: the next request simply misses under the
+new version, and the orphaned entries age out on their own.
+
+Helpers prefixed with ``a`` are the async twins of the ones without, for the
+views in django_project.async_views; they read and write the same entries.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+
+from .db_router import primary_reads
+from .metrics import record_cache_outcome
+
+NAMESPACE_PREFIX = "ns"
+RESPONSE_PREFIX = "response"
+LOCK_PREFIX = "lock"
+
+
+def model_namespace(model):
+    """
+    Namespace covering every row of a model, e.g. ``accomodations.amenity``.
+    """
+    return model._meta.label_lower
+
+
+def object_namespace(model, key):
+    """
+    Namespace covering one object, identified by its lookup value.
+    """
+    return f"{model_namespace(model)}:{key}"
+
+
+def version_key(namespace):
+    return f"{NAMESPACE_PREFIX}:{namespace}"
+
+
+def namespace_versions(namespaces):
+    """
+    Current version of each namespace, initialising the missing ones.
+
+    Fresh versions start from the clock rather than 1, so a version key that
+    was evicted can never come back to a number old entries were cached under.
+    """
+    keys = [version_key(namespace) for namespace in namespaces]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+async def anamespace_versions(namespaces):
+    keys = [version_key(namespace) for namespace in namespaces]
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, time.time_ns(), timeout=None)
+            versions[key] = await cache.aget(key)
+    return [versions[key] for key in keys]
+
+
+class LocalCache:
+    """
+    Bounded, thread-safe, per-process LRU cache with per-entry expiry.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.entries.get(key)
+            if item is None:
+                return None
+            if item[0] <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return item[1]
+
+    def set(self, key, value, timeout):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + timeout, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_versions = LocalCache(settings.API_LOCAL_CACHE_SIZE)
+local_responses = LocalCache(settings.API_LOCAL_CACHE_SIZE)
+
+
+def local_namespace_versions(namespaces):
+    """
+    Namespace versions remembered in process memory for
+    ``settings.API_LOCAL_VERSION_TTL`` seconds.
+
+    Other processes' writes show up once the memory expires; writes in this
+    process forget the bumped versions straight away.
+    """
+    versions = {namespace: local_versions.get(namespace) for namespace in namespaces}
+    missing = [namespace for namespace, version in versions.items() if version is None]
+    if missing:
+        for namespace, version in zip(missing, namespace_versions(missing)):
+            local_versions.set(namespace, version, settings.API_LOCAL_VERSION_TTL)
+            versions[namespace] = version
+    return [versions[namespace] for namespace in namespaces]
+
+
+async def alocal_namespace_versions(namespaces):
+    versions = {namespace: local_versions.get(namespace) for namespace in namespaces}
+    missing = [namespace for namespace, version in versions.items() if version is None]
+    if missing:
+        for namespace, version in zip(missing, await anamespace_versions(missing)):
+            local_versions.set(namespace, version, settings.API_LOCAL_VERSION_TTL)
+            versions[namespace] = version
+    return [versions[namespace] for namespace in namespaces]
+
+
+def bump_namespaces(*namespaces):
+    """
+    Invalidate everything cached under the given namespaces.
+
+    Versions only ever grow, and a bump moves them at least to the current
+    clock, so a version is also when its namespace last changed (see
+    ``version_time``).
+    """
+    now = time.time_ns()
+    for namespace in set(namespaces):
+        local_versions.delete(namespace)
+        key = version_key(namespace)
+        try:
+            version = cache.incr(key)
+        except ValueError:
+            cache.set(key, now, timeout=None)
+        else:
+            if version < now:
+                cache.incr(key, now - version)
+
+
+def version_time(version):
+    """
+    The time a namespace version was set, give or take the bumps made in the
+    same nanosecond.
+    """
+    return datetime.fromtimestamp(version / 1_000_000_000, tz=timezone.utc)
+
+
+def schedule_namespace_bump(*namespaces):
+    """
+    Bump namespaces once the surrounding transaction commits, so no request
+    can cache the old rows under the new version in the meantime.
+    """
+    transaction.on_commit(lambda: bump_namespaces(*namespaces))
+
+
+def namespaced_key(prefix, namespaces, *parts, local=False):
+    """
+    Cache key for ``parts`` under the current versions of ``namespaces``,
+    read from process memory when ``local`` is set.
+    """
+    if local:
+        versions = local_namespace_versions(namespaces)
+    else:
+        versions = namespace_versions(namespaces)
+    return versioned_key(prefix, namespaces, versions, parts)
+
+
+async def anamespaced_key(prefix, namespaces, *parts, local=False):
+    if local:
+        versions = await alocal_namespace_versions(namespaces)
+    else:
+        versions = await anamespace_versions(namespaces)
+    return versioned_key(prefix, namespaces, versions, parts)
+
+
+def changed_recently(versions):
+    """
+    Whether any of the namespace versions was set within
+    ``settings.DB_REPLICA_STICKY_SECONDS``, when replicas may not have
+    replayed the write behind it yet.
+    """
+    window = settings.DB_REPLICA_STICKY_SECONDS * 1_000_000_000
+    return max(versions, default=0) > time.time_ns() - window
+
+
+def fill_reads(namespaces, local=False):
+    """
+    Context for computing an entry to cache under ``namespaces``.
+
+    Shortly after one of them changed its reads go to the primary: a lagging
+    replica would return the old rows, to be cached under the new version for
+    the entry's whole lifetime.
+    """
+    if local:
+        versions = local_namespace_versions(namespaces)
+    else:
+        versions = namespace_versions(namespaces)
+    return primary_reads() if changed_recently(versions) else nullcontext()
+
+
+async def afill_reads(namespaces, local=False):
+    if local:
+        versions = await alocal_namespace_versions(namespaces)
+    else:
+        versions = await anamespace_versions(namespaces)
+    return primary_reads() if changed_recently(versions) else nullcontext()
+
+
+def versioned_key(prefix, namespaces, versions, parts):
+    raw = "|".join(
+        [f"{namespace}={version}" for namespace, version in zip(namespaces, versions)]
+        + [str(part) for part in parts]
+    )
+    return f"{prefix}:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def response_key_parts(request):
+    """
+    What a GET response varies on besides its namespaces: the full URL and
+    the Accept header (which picks the renderer and API version).
+    """
+    return request.get_full_path(), request.META.get("HTTP_ACCEPT", "")
+
+
+def response_cache_key(request, namespaces, local=False):
+    return namespaced_key(
+        RESPONSE_PREFIX, namespaces, *response_key_parts(request), local=local
+    )
+
+
+async def aresponse_cache_key(request, namespaces, local=False):
+    return await anamespaced_key(
+        RESPONSE_PREFIX, namespaces, *response_key_parts(request), local=local
+    )
+
+
+def freeze_response(response):
+    return (response.status_code, response.content, list(response.items()))
+
+
+def thaw_response(frozen):
+    status, content, headers = frozen
+    response = HttpResponse(content, status=status)
+    for header, value in headers:
+        response[header] = value
+    return response
+
+
+def acquire_lock(key):
+    """
+    Single-flight lock for recomputing ``key``; an atomic ``SET NX`` on Redis.
+    """
+    return cache.add(f"{LOCK_PREFIX}:{key}", 1, settings.API_CACHE_LOCK_TIMEOUT)
+
+
+async def aacquire_lock(key):
+    return await cache.aadd(
+        f"{LOCK_PREFIX}:{key}", 1, settings.API_CACHE_LOCK_TIMEOUT
+    )
+
+
+def release_lock(key):
+    cache.delete(f"{LOCK_PREFIX}:{key}")
+
+
+async def arelease_lock(key):
+    await cache.adelete(f"{LOCK_PREFIX}:{key}")
+
+
+def wait_for_entry(key):
+    """
+    Give the worker computing ``key`` one short wait of
+    ``settings.API_CACHE_LOCK_WAIT`` seconds, then read the entry once.
+
+    A single wait rather than a poll: a slow lock holder must not tie up this
+    worker's thread, which computes the response itself instead.
+    """
+    time.sleep(settings.API_CACHE_LOCK_WAIT)
+    return cache.get(key)
+
+
+async def await_for_entry(key):
+    await asyncio.sleep(settings.API_CACHE_LOCK_WAIT)
+    return await cache.aget(key)
+
+
+def remember_locally(key, entry):
+    """
+    Keep a fresh shared entry in process memory, never past its freshness.
+    """
+    remaining = entry[0] - time.time()
+    timeout = min(settings.API_LOCAL_CACHE_TIMEOUT, remaining)
+    if timeout > 0:
+        local_responses.set(key, entry[1], timeout)
+
+
+def cache_response(timeout=None, local=False):
+    """
+    Cache successful GET responses of a view method under the view's
+    ``get_cache_namespaces()``, with stale-while-revalidate.
+
+    With ``local`` set, fresh responses are also kept in process memory for up
+    to ``settings.API_LOCAL_CACHE_TIMEOUT`` seconds and namespace versions are
+    read through ``local_namespace_versions``, so repeat requests touch neither
+    Redis nor pickle. Meant for small, rarely changing reference data.
+
+    Entries are fresh for ``timeout`` seconds (``settings.API_CACHE_TIMEOUT``
+    by default) and kept ``settings.API_CACHE_GRACE`` seconds longer. Within
+    the grace window one worker, holding the lock, recomputes the entry while
+    the others keep serving the stale copy. On a plain miss, such as the first
+    request after a write bumped a namespace, the others give the lock holder
+    one short wait and compute the response themselves if it is not done.
+    Responses computed shortly after a write read from the primary
+    (``fill_reads``).
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return method(view, request, *args, **kwargs)
+
+            view_name = type(view).__name__
+            namespaces = view.get_cache_namespaces()
+            key = response_cache_key(request, namespaces, local)
+            if local:
+                frozen = local_responses.get(key)
+                if frozen is not None:
+                    record_cache_outcome(view_name, "local_hit")
+                    return thaw_response(frozen)
+
+            entry = cache.get(key)
+            if entry is not None and time.time() < entry[0]:
+                record_cache_outcome(view_name, "hit")
+                if local:
+                    remember_locally(key, entry)
+                return thaw_response(entry[1])
+
+            locked = acquire_lock(key)
+            if not locked:
+                if entry is not None:
+                    record_cache_outcome(view_name, "stale")
+                    return thaw_response(entry[1])
+                entry = wait_for_entry(key)
+                if entry is not None:
+                    record_cache_outcome(view_name, "coalesced")
+                    return thaw_response(entry[1])
+            record_cache_outcome(view_name, "miss")
+
+            try:
+                with fill_reads(namespaces, local):
+                    response = method(view, request, *args, **kwargs)
+            except Exception:
+                if locked:
+                    release_lock(key)
+                raise
+            if response.status_code != 200:
+                if locked:
+                    release_lock(key)
+                return response
+
+            ttl = settings.API_CACHE_TIMEOUT if timeout is None else timeout
+
+            def store(response):
+                entry = (time.time() + ttl, freeze_response(response))
+                cache.set(key, entry, ttl + settings.API_CACHE_GRACE)
+                if locked:
+                    release_lock(key)
+                if local:
+                    remember_locally(key, entry)
+
+            if getattr(response, "is_rendered", True):
+                store(response)
+            else:
+                response.add_post_render_callback(store)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def acache_response(timeout=None, local=False):
+    """
+    ``cache_response`` for async view methods, which must return rendered
+    responses.
+    """
+
+    def decorator(method):
+        @wraps(method)
+        async def wrapper(view, request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return await method(view, request, *args, **kwargs)
+
+            view_name = type(view).__name__
+            namespaces = view.get_cache_namespaces()
+            key = await aresponse_cache_key(request, namespaces, local)
+            if local:
+                frozen = local_responses.get(key)
+                if frozen is not None:
+                    record_cache_outcome(view_name, "local_hit")
+                    return thaw_response(frozen)
+
+            entry = await cache.aget(key)
+            if entry is not None and time.time() < entry[0]:
+                record_cache_outcome(view_name, "hit")
+                if local:
+                    remember_locally(key, entry)
+                return thaw_response(entry[1])
+
+            locked = await aacquire_lock(key)
+            if not locked:
+                if entry is not None:
+                    record_cache_outcome(view_name, "stale")
+                    return thaw_response(entry[1])
+                entry = await await_for_entry(key)
+                if entry is not None:
+                    record_cache_outcome(view_name, "coalesced")
+                    return thaw_response(entry[1])
+            record_cache_outcome(view_name, "miss")
+
+            try:
+                with await afill_reads(namespaces, local):
+                    response = await method(view, request, *args, **kwargs)
+            except Exception:
+                if locked:
+                    await arelease_lock(key)
+                raise
+            if response.status_code == 200:
+                ttl = settings.API_CACHE_TIMEOUT if timeout is None else timeout
+                entry = (time.time() + ttl, freeze_response(response))
+                await cache.aset(key, entry, ttl + settings.API_CACHE_GRACE)
+                if local:
+                    remember_locally(key, entry)
+            if locked:
+                await arelease_lock(key)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+class NamespacedCacheMixin:
+    """
+    View mixin declaring the cache namespaces a view's responses depend on.
+
+    ``cache_namespaces`` may use the view's URL kwargs as format fields, e.g.
+    ``"bursaries.bursary:{slug}"``.
+    """
+
+    cache_namespaces = []
+
+    def get_cache_namespaces(self):
+        return [namespace.format(**self.kwargs) for namespace in self.cache_namespaces]
@@ -0,0 +1,153 @@
+"""
+Conditional GETs: ETag and Last-Modified validators checked before a view
+does any serialization work.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .cache import (
+    alocal_namespace_versions,
+    anamespace_versions,
+    local_namespace_versions,
+    namespace_versions,
+    version_time,
+)
+
+
+def make_etag(request, *parts):
+    """
+    Strong ETag over ``parts`` and the request variant: the query string
+    (sparse fields, paging) and the Accept header (renderer, API version).
+    """
+    raw = "|".join(
+        [str(part) for part in parts]
+        + [request.get_full_path(), request.META.get("HTTP_ACCEPT", "")]
+    )
+    return f'"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+
+def conditional_get(method):
+    """
+    Answer GET and HEAD with 304 when the view's ``get_validators()`` match
+    the request's If-None-Match or If-Modified-Since, and otherwise attach
+    them to the response.
+
+    ``get_validators()`` returns ``(etag, last_modified)``, either of which may
+    be None, or None to skip the check (e.g. the object does not exist).
+    """
+
+    @wraps(method)
+    def wrapper(view, request, *args, **kwargs):
+        validators = None
+        if request.method in ("GET", "HEAD"):
+            validators = view.get_validators()
+        if validators is None:
+            return method(view, request, *args, **kwargs)
+
+        etag, timestamp = validator_values(validators)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = method(view, request, *args, **kwargs)
+        return set_validators(response, etag, timestamp)
+
+    return wrapper
+
+
+def aconditional_get(method):
+    """
+    ``conditional_get`` for async view methods, using ``aget_validators()``.
+    """
+
+    @wraps(method)
+    async def wrapper(view, request, *args, **kwargs):
+        validators = None
+        if request.method in ("GET", "HEAD"):
+            validators = await view.aget_validators()
+        if validators is None:
+            return await method(view, request, *args, **kwargs)
+
+        etag, timestamp = validator_values(validators)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = await method(view, request, *args, **kwargs)
+        return set_validators(response, etag, timestamp)
+
+    return wrapper
+
+
+def validator_values(validators):
+    etag, last_modified = validators
+    return etag, int(last_modified.timestamp()) if last_modified else None
+
+
+def set_validators(response, etag, timestamp):
+    if response.status_code in (200, 304):
+        # Overwrite validators replayed from a cached response.
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        if etag is not None:
+            response["ETag"] = etag
+    return response
+
+
+class UpdatedAtValidatorsMixin:
+    """
+    Detail view validators from the object's ``updated_at``, fetched on its
+    own with a single indexed lookup, and the versions of the view's cache
+    namespaces.
+
+    The namespaces cover what ``updated_at`` does not: relation changes bump
+    the object's namespace and lookup-table edits their table's, so the
+    validators follow everything the payload embeds without rewriting the
+    rows that embed it. Needs NamespacedCacheMixin; the versions are read
+    from the shared cache, never process memory, so a write is seen at once.
+    """
+
+    def updated_at_queryset(self):
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        return self.queryset.filter(**{self.lookup_field: lookup}).values_list(
+            "updated_at", flat=True
+        )
+
+    def validators_for(self, updated_at, versions):
+        last_modified = max(updated_at, *map(version_time, versions))
+        return make_etag(self.request, updated_at.isoformat(), *versions), last_modified
+
+    def get_validators(self):
+        updated_at = self.updated_at_queryset().first()
+        if updated_at is None:
+            return None
+        versions = namespace_versions(self.get_cache_namespaces())
+        return self.validators_for(updated_at, versions)
+
+    async def aget_validators(self):
+        updated_at = await self.updated_at_queryset().afirst()
+        if updated_at is None:
+            return None
+        versions = await anamespace_versions(self.get_cache_namespaces())
+        return self.validators_for(updated_at, versions)
+
+
+class NamespaceValidatorsMixin:
+    """
+    Collection validators from the view's cache namespace versions, which
+    change whenever the data behind the collection does (see
+    django_project.cache). Needs NamespacedCacheMixin; no query is run, and
+    the versions usually come from process memory.
+    """
+
+    def get_validators(self):
+        versions = local_namespace_versions(self.get_cache_namespaces())
+        return make_etag(self.request, *versions), None
+
+    async def aget_validators(self):
+        versions = await alocal_namespace_versions(self.get_cache_namespaces())
+        return make_etag(self.request, *versions), None
@@ -0,0 +1,259 @@
+"""
+Read-replica routing with read-your-writes stickiness.
+
+Reads go to the primary unless ReplicaRoutingMiddleware allowed replicas for
+the current request: a safe (GET, HEAD, OPTIONS) request from a client that has
+not written recently. A successful write keeps the client on the primary for
+``settings.DB_REPLICA_STICKY_SECONDS``, so landlords see their own edits before
+the replicas catch up: browsers through a cookie, and clients sending a JWT
+access token, which often keep no cookies, through a cache key for the user it
+was written by. Management commands and anything else outside a request always
+use the primary.
+
+Replicas that fail a health check, or lag more than
+``settings.DB_REPLICA_MAX_LAG_SECONDS`` behind, leave the rotation until a
+later check passes.
+"""
+
+import contextvars
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .metrics import REPLICA_HEALTHY, REPLICA_LAG
+
+logger = logging.getLogger(__name__)
+
+STICKY_COOKIE = "db_primary"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+# Seconds of replay lag; zero when the replica has replayed all it received.
+POSTGRES_LAG_QUERY = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+"""
+
+replicas_allowed = contextvars.ContextVar("replicas_allowed", default=False)
+
+
+def sticky_user_key(user_id):
+    return f"{STICKY_COOKIE}:{user_id}"
+
+
+def token_user_id(request):
+    """
+    The user id of the request's JWT access token, or None without a valid one.
+
+    Only the signature and expiry are checked, without a query: the view's own
+    authentication still loads the user.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = header and authentication.get_raw_token(header)
+    if not raw_token:
+        return None
+    try:
+        token = authentication.get_validated_token(raw_token)
+    except (InvalidToken, TokenError):
+        return None
+    return token.get(jwt_settings.USER_ID_CLAIM)
+
+
+@contextmanager
+def primary_reads():
+    """
+    Send the reads made inside the block to the primary, replicas allowed or
+    not.
+    """
+    token = replicas_allowed.set(False)
+    try:
+        yield
+    finally:
+        replicas_allowed.reset(token)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith("replica")]
+
+
+class ReplicaHealth:
+    """
+    Per-process health of the replicas, re-checked at most every
+    ``settings.DB_REPLICA_CHECK_INTERVAL`` seconds by whichever request
+    needs it first.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked_at = 0.0
+        self.healthy = []
+
+    def lag(self, alias):
+        connection = connections[alias]
+        with connection.cursor() as cursor:
+            if connection.vendor != "postgresql":
+                cursor.execute("SELECT 1")
+                return 0.0
+            cursor.execute(POSTGRES_LAG_QUERY)
+            return float(cursor.fetchone()[0])
+
+    def check(self):
+        healthy = []
+        for alias in replica_aliases():
+            try:
+                lag = self.lag(alias)
+            except Exception as error:  # Any failure takes it out of rotation.
+                logger.warning("Replica %s failed its health check: %s", alias, error)
+                connections[alias].close()
+                REPLICA_HEALTHY.labels(alias=alias).set(0)
+                continue
+            REPLICA_LAG.labels(alias=alias).set(lag)
+            fresh = lag <= settings.DB_REPLICA_MAX_LAG_SECONDS
+            REPLICA_HEALTHY.labels(alias=alias).set(int(fresh))
+            if fresh:
+                healthy.append(alias)
+            else:
+                logger.warning("Replica %s is %.1fs behind; skipping it.", alias, lag)
+        return healthy
+
+    def get(self):
+        if time.monotonic() - self.checked_at >= settings.DB_REPLICA_CHECK_INTERVAL:
+            if self.lock.acquire(blocking=False):
+                try:
+                    self.healthy = self.check()
+                    self.checked_at = time.monotonic()
+                finally:
+                    self.lock.release()
+        return self.healthy
+
+
+replica_health = ReplicaHealth()
+
+
+class ReplicaRouter:
+    """
+    Send reads to a random healthy replica when the request allows it, and
+    everything else to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if replicas_allowed.get():
+            healthy = replica_health.get()
+            if healthy:
+                return random.choice(healthy)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Allow replica reads for safe requests from clients that have not written
+    recently, and remember the client after a successful write: by the sticky
+    cookie, and by its user while it is authenticated.
+
+    Runs natively in both sync and async stacks, so async views under ASGI do
+    not pay for a thread switch here.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        allowed = self.allows_replicas(request)
+        token = replicas_allowed.set(allowed)
+        try:
+            response = self.get_response(request)
+        finally:
+            replicas_allowed.reset(token)
+        return self.process_response(request, response, allowed)
+
+    async def __acall__(self, request):
+        allowed = self.allows_replicas(request)
+        token = replicas_allowed.set(allowed)
+        try:
+            response = await self.get_response(request)
+        finally:
+            replicas_allowed.reset(token)
+        return self.process_response(request, response, allowed)
+
+    def allows_replicas(self, request):
+        if request.method not in SAFE_METHODS or STICKY_COOKIE in request.COOKIES:
+            return False
+        user_id = token_user_id(request)
+        return user_id is None or cache.get(sticky_user_key(user_id)) is None
+
+    def process_response(self, request, response, allowed):
+        if allowed and getattr(response, "streaming", False):
+            content = response.streaming_content
+            if response.is_async:
+                response.streaming_content = self.awith_replicas(content)
+            else:
+                response.streaming_content = self.with_replicas(content)
+
+        if request.method in WRITE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                STICKY_COOKIE,
+                "1",
+                max_age=settings.DB_REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+                secure=request.is_secure(),
+            )
+            # Set on the request by DRF once the view authenticated it.
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                user_id = getattr(user, jwt_settings.USER_ID_FIELD)
+                cache.set(
+                    sticky_user_key(user_id), 1, settings.DB_REPLICA_STICKY_SECONDS
+                )
+        return response
+
+    def with_replicas(self, content):
+        """
+        Keep replica reads allowed while a streaming response is consumed,
+        which happens after the middleware has returned.
+        """
+        replicas_allowed.set(True)
+        try:
+            yield from content
+        finally:
+            replicas_allowed.set(False)
+
+    async def awith_replicas(self, content):
+        replicas_allowed.set(True)
+        try:
+            async for chunk in content:
+                yield chunk
+        finally:
+            replicas_allowed.set(False)
@@ -0,0 +1,330 @@
+"""
+Application metrics, exported with django-prometheus' own at ``/metrics``.
+
+``RequestMetricsMiddleware`` records per-route request metrics. Their labels
+are the resolved URL name and the method, so their number is bounded by the
+URLconf whatever paths clients request.
+
+Under gunicorn with several workers, ``PROMETHEUS_MULTIPROC_DIR`` is set and
+prometheus_client records each worker's counters, histograms and gauges in
+files there, which ``export_metrics`` merges. Collectors reading process state
+at scrape time, like ``ConnectionPoolCollector``, only see the worker that
+answers the scrape.
+"""
+
+import contextvars
+import logging
+import os
+import time
+from collections import Counter as Tally
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django_prometheus.exports import ExportToDjangoView
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+logger = logging.getLogger("django.request.timing")
+
+ROUTE_LABELS = ["route", "method"]
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+SLOW_REQUEST_SECONDS = 1
+
+REQUEST_DURATION = Histogram(
+    "api_request_duration_seconds",
+    "Time to respond, by URL name and method.",
+    ROUTE_LABELS,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_DB_QUERIES = Histogram(
+    "api_request_db_queries",
+    "Database queries made per request.",
+    ROUTE_LABELS,
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+REQUEST_DB_DURATION = Histogram(
+    "api_request_db_duration_seconds",
+    "Time spent in database queries per request.",
+    ROUTE_LABELS,
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+REQUEST_SERIALIZER_DURATION = Histogram(
+    "api_request_serializer_duration_seconds",
+    "Time spent turning instances or rows into response data per request, "
+    "including the queries it triggers.",
+    ROUTE_LABELS,
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+REQUEST_CACHE_LOOKUPS = Counter(
+    "api_request_cache_lookups_total",
+    "Response cache lookups by URL name, method and result (hit or miss).",
+    ROUTE_LABELS + ["result"],
+)
+RESPONSE_SIZE = Histogram(
+    "api_response_size_bytes",
+    "Size of response bodies; streamed ones are left out.",
+    ROUTE_LABELS,
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+
+RESPONSE_CACHE_REQUESTS = Counter(
+    "api_response_cache_requests_total",
+    "Cacheable API requests by view and outcome: local_hit (process memory), "
+    "hit, stale (served while another worker revalidates), coalesced (waited "
+    "for another worker) or miss.",
+    ["view", "outcome"],
+)
+
+REPLICA_HEALTHY = Gauge(
+    "db_replica_healthy",
+    "1 while a read replica passes its health and lag checks, else 0.",
+    ["alias"],
+    multiprocess_mode="liveall",
+)
+REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds",
+    "Replay lag of a read replica at its last health check.",
+    ["alias"],
+    multiprocess_mode="liveall",
+)
+
+
+def record_cache_outcome(view, outcome):
+    RESPONSE_CACHE_REQUESTS.labels(view=view, outcome=outcome).inc()
+    stats = request_stats.get()
+    if stats is not None:
+        stats.cache_lookups["miss" if outcome == "miss" else "hit"] += 1
+
+
+class RequestStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializing = False
+        self.cache_lookups = Tally()
+
+
+# Stats of the request being handled. Threads running ``sync_to_async`` work
+# for an async view get a copy of the context, and so the same object.
+request_stats = contextvars.ContextVar("request_stats", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    stats = request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_queries += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    Add ``record_query`` to the execute wrappers of every connection, in
+    whichever thread it opens, the first time it connects.
+    """
+    if record_query not in connection.execute_wrappers:
+        # First, so it wraps and times any wrapper installed before it.
+        connection.execute_wrappers.insert(0, record_query)
+
+
+connection_created.connect(install_query_recorder)
+
+
+def serialization_timed(function):
+    """
+    Count the time ``function`` takes as serializer time of the current
+    request, unless it is called while serializing already.
+    """
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        stats = request_stats.get()
+        if stats is None or stats.serializing:
+            return function(*args, **kwargs)
+        stats.serializing = True
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats.serializer_seconds += time.perf_counter() - started
+            stats.serializing = False
+
+    return wrapper
+
+
+class SerializerTimingMixin:
+    """
+    Generic view mixin counting the serializers' rendering as serializer time.
+
+    Within a measured request, ``get_serializer(instance)`` renders the
+    serializer's ``data`` straight away, timed, for list() and retrieve() to
+    read next; serializers given ``data`` to validate are left alone.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if args and "data" not in kwargs and request_stats.get() is not None:
+            serialization_timed(lambda: serializer.data)()
+        return serializer
+
+
+class RequestMetricsMiddleware:
+    """
+    Record latency, database queries and time, response cache lookups,
+    serializer time and response size of each request by URL name and method,
+    and log requests slower than ``SLOW_REQUEST_SECONDS``.
+
+    Work done while a streaming response is consumed, after the middleware
+    has returned, is not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_stats.reset(token)
+        return self.record(request, response, stats)
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_stats.reset(token)
+        return self.record(request, response, stats)
+
+    def record(self, request, response, stats):
+        duration = time.perf_counter() - stats.started
+        match = request.resolver_match
+        labels = {
+            "route": match.view_name if match else "<unresolved>",
+            "method": request.method if request.method in METHODS else "other",
+        }
+        REQUEST_DURATION.labels(**labels).observe(duration)
+        REQUEST_DB_QUERIES.labels(**labels).observe(stats.db_queries)
+        REQUEST_DB_DURATION.labels(**labels).observe(stats.db_seconds)
+        REQUEST_SERIALIZER_DURATION.labels(**labels).observe(stats.serializer_seconds)
+        for result, count in stats.cache_lookups.items():
+            REQUEST_CACHE_LOOKUPS.labels(**labels, result=result).inc(count)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(**labels).observe(len(response.content))
+
+        response["X-Request-Duration"] = str(duration)
+        if duration > SLOW_REQUEST_SECONDS:
+            logger.warning(
+                f"Slow request ({duration:.2f}s): {request.method} {request.path}"
+            )
+        return response
+
+
+class ConnectionPoolCollector:
+    """
+    Usage of each database alias' psycopg connection pool in this process,
+    read from ``ConnectionPool.get_stats()`` at scrape time.
+    """
+
+    def pools(self):
+        for alias, settings_dict in settings.DATABASES.items():
+            if not settings_dict.get("OPTIONS", {}).get("pool"):
+                continue
+            pool = connections[alias].pool
+            # Pools open on first use; until then their stats are placeholders.
+            if not pool.closed:
+                yield alias, pool.get_stats()
+
+    def collect(self):
+        size = GaugeMetricFamily(
+            "db_pool_connections", "Open pooled connections.", labels=["alias"]
+        )
+        available = GaugeMetricFamily(
+            "db_pool_available_connections",
+            "Pooled connections idle and ready for checkout.",
+            labels=["alias"],
+        )
+        waiting = GaugeMetricFamily(
+            "db_pool_waiting_requests",
+            "Requests currently waiting for a connection.",
+            labels=["alias"],
+        )
+        saturation = GaugeMetricFamily(
+            "db_pool_saturation",
+            "Checked-out connections as a fraction of the pool's max size.",
+            labels=["alias"],
+        )
+        checkouts = CounterMetricFamily(
+            "db_pool_checkouts",
+            "Connections requested from the pool.",
+            labels=["alias"],
+        )
+        queued = CounterMetricFamily(
+            "db_pool_queued_checkouts",
+            "Checkouts that had to wait for a free connection.",
+            labels=["alias"],
+        )
+        wait = CounterMetricFamily(
+            "db_pool_wait_seconds",
+            "Time spent waiting for a connection.",
+            labels=["alias"],
+        )
+        errors = CounterMetricFamily(
+            "db_pool_errors",
+            "Checkouts that failed, including timeouts.",
+            labels=["alias"],
+        )
+        for alias, stats in self.pools():
+            in_use = stats["pool_size"] - stats["pool_available"]
+            size.add_metric([alias], stats["pool_size"])
+            available.add_metric([alias], stats["pool_available"])
+            waiting.add_metric([alias], stats["requests_waiting"])
+            saturation.add_metric([alias], in_use / stats["pool_max"])
+            checkouts.add_metric([alias], stats.get("requests_num", 0))
+            queued.add_metric([alias], stats.get("requests_queued", 0))
+            wait.add_metric([alias], stats.get("requests_wait_ms", 0) / 1000)
+            errors.add_metric([alias], stats.get("requests_errors", 0))
+        yield from [size, available, waiting, saturation]
+        yield from [checkouts, queued, wait, errors]
+
+
+pool_collector = ConnectionPoolCollector()
+REGISTRY.register(pool_collector)
+
+
+def export_metrics(request):
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return ExportToDjangoView(request)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(pool_collector)
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,305 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import F, Q
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Paginators here also implement ``apaginate_queryset``, which fetches the page
+# through the async ORM for django_project.async_views.
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    async def apaginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Paginator.count is a cached property; fill it without a sync query.
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+        self.page.object_list = [obj async for obj in self.page.object_list]
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return list(self.page)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a single ordering field plus the primary key.
+
+    Each cursor carries the ordering value and primary key of the row at the
+    edge of the current page, so the next page is a ``WHERE (field, pk) > ...``
+    seek on an index instead of an ``OFFSET`` scan, and no ``COUNT(*)`` is run.
+    Rows inserted while a client is paging never shift the pages it has not
+    read yet.
+
+    The ordering comes from the view's OrderingFilter and must be one of the
+    view's ``keyset_ordering_fields``; anything else falls back to the view's
+    default ordering. NULLs always sort last.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page([obj async for obj in queryset])
+
+    def get_page_queryset(self, queryset, request, view):
+        """
+        The rows of the requested page plus one, which tells whether another
+        page follows.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.field = self.ordering.lstrip("-")
+        self.descending = self.ordering.startswith("-")
+        meta = queryset.model._meta
+        self.model_field = (
+            meta.pk if self.field == "pk" else meta.get_field(self.field)
+        )
+        self.nullable = self.model_field.null
+
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor["r"])
+        if self.cursor is not None:
+            seek = self.seek_before if reverse else self.seek_after
+            queryset = queryset.filter(seek(self.cursor["v"], self.cursor["pk"]))
+
+        queryset = queryset.order_by(*self.get_order_by(reverse))
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if self.cursor and self.cursor["r"]:
+            self.page.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = self.cursor is not None, has_more
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Pick the first ordering term if the view allows keyset paging on it.
+        """
+        allowed = getattr(view, "keyset_ordering_fields", [])
+        default = getattr(view, "ordering", None) or ["-pk"]
+        if isinstance(default, str):
+            default = [default]
+
+        for backend in getattr(view, "filter_backends", []):
+            if hasattr(backend, "get_ordering"):
+                ordering = backend().get_ordering(request, queryset, view)
+                if ordering and ordering[0].lstrip("-") in allowed:
+                    return ordering[0]
+                break
+        return default[0]
+
+    def get_order_by(self, reverse=False):
+        nulls = {"nulls_first": True} if reverse else {"nulls_last": True}
+        if self.descending != reverse:
+            return [F(self.field).desc(**nulls), F("pk").desc()]
+        return [F(self.field).asc(**nulls), F("pk").asc()]
+
+    def seek_after(self, value, pk):
+        """
+        Rows that come after ``(value, pk)`` in the forward ordering.
+        """
+        op = "lt" if self.descending else "gt"
+        if value is None:
+            return Q(**{f"{self.field}__isnull": True, f"pk__{op}": pk})
+        condition = Q(**{f"{self.field}__{op}": value}) | Q(
+            **{self.field: value, f"pk__{op}": pk}
+        )
+        if self.nullable:
+            condition |= Q(**{f"{self.field}__isnull": True})
+        return condition
+
+    def seek_before(self, value, pk):
+        """
+        Rows that come before ``(value, pk)`` in the forward ordering.
+        """
+        op = "gt" if self.descending else "lt"
+        if value is None:
+            return Q(**{f"{self.field}__isnull": False}) | Q(
+                **{f"{self.field}__isnull": True, f"pk__{op}": pk}
+            )
+        return Q(**{f"{self.field}__{op}": value}) | Q(
+            **{self.field: value, f"pk__{op}": pk}
+        )
+
+    def get_position(self, item):
+        if isinstance(item, dict):
+            value, pk = item[self.field], item.get("pk", item.get("id"))
+        else:
+            value, pk = getattr(item, self.field), item.pk
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        return value, pk
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        value, pk = self.get_position(self.page[-1])
+        return self.encode_cursor({"o": self.ordering, "v": value, "pk": pk, "r": 0})
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        value, pk = self.get_position(self.page[0])
+        return self.encode_cursor({"o": self.ordering, "v": value, "pk": pk, "r": 1})
+
+    def encode_cursor(self, cursor):
+        encoded = urlsafe_b64encode(json.dumps(cursor).encode()).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            if cursor["o"] != self.ordering or not isinstance(cursor["pk"], int):
+                raise ValueError
+            cursor["r"] = int(cursor.get("r", 0))
+            if cursor["v"] is not None:
+                cursor["v"] = self.model_field.to_python(cursor["v"])
+        except (TypeError, ValueError, KeyError, UnicodeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            }
+        ]
+
+
+class ListingPagination(BasePagination):
+    """
+    Page-number pagination by default, keyset pagination when asked for.
+
+    Clients opt in with ``?pagination=cursor`` (or by following a link that
+    already carries ``?cursor=``), so existing page-number clients keep the
+    same response shape. Keyset pages cannot follow search relevance, so they
+    are refused together with ``?search=``.
+    """
+
+    mode_query_param = "pagination"
+    page_number_class = PageNumberPagination
+    keyset_class = KeysetPagination
+
+    def __init__(self):
+        self.paginator = self.page_number_class()
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, "display_page_controls", False)
+
+    def get_paginator(self, request):
+        keyset = self.keyset_class
+        if (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or keyset.cursor_query_param in request.query_params
+        ):
+            if request.query_params.get(api_settings.SEARCH_PARAM):
+                message = "Cursor pagination cannot be combined with search."
+                raise ValidationError({self.mode_query_param: [message]})
+            return keyset()
+        return self.page_number_class()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request)
+        return await self.paginator.apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = self.paginator.get_paginated_response(data)
+        if isinstance(self.paginator, self.keyset_class):
+            # Page-number links do not apply to keyset pages and vice versa.
+            for key in ("next", "previous"):
+                if response.data[key]:
+                    response.data[key] = remove_query_param(
+                        response.data[key], self.page_number_class.page_query_param
+                    )
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number_class().get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *self.page_number_class().get_schema_operation_parameters(view),
+            *self.keyset_class().get_schema_operation_parameters(view),
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    "Set to 'cursor' for keyset pagination: next/previous "
+                    "links without a total count."
+                ),
+                "schema": {"type": "string", "enum": ["page", "cursor"]},
+            },
+        ]
@@ -0,0 +1,35 @@
+"""
+Request parsers matching django_project.renderers.
+"""
+
+import msgpack
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+
+class ORJSONParser(JSONParser):
+    """
+    Drop-in ``JSONParser`` built on orjson; bodies must be UTF-8.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parses ``Content-Type: application/msgpack`` bodies, as the
+    MessagePackRenderer writes them.
+    """
+
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError("MessagePack parse error - %s" % str(exc))
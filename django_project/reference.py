@@ -0,0 +1,175 @@
+"""
+In-process registry of the small lookup tables: institutions, property types,
+amenities, payment methods, fields of study, study levels and education levels.
+
+Each table is loaded once per process and reused until its cache namespace
+version (django_project.cache) changes, which every write to the table bumps;
+writes made in this process drop the local copy straight away. Filters
+validate codes, nested serializers render lookups and the admin shows labels
+from here without touching the database.
+"""
+
+import threading
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework import serializers
+
+from .cache import local_namespace_versions, model_namespace
+from .db_router import primary_reads
+
+CODE_FIELD = "name"
+
+
+class ReferenceData:
+    """
+    One loaded snapshot of a lookup table.
+    """
+
+    def __init__(self, objects, reloaded_on_miss=False):
+        self.objects = {obj.pk: obj for obj in objects}
+        self.positions = {pk: position for position, pk in enumerate(self.objects)}
+        self.labels = {pk: str(obj) for pk, obj in self.objects.items()}
+        self.ids_by_code = {}
+        for obj in objects:
+            self.ids_by_code.setdefault(getattr(obj, CODE_FIELD), []).append(obj.pk)
+        self.code_choices = [
+            (code, self.labels[ids[0]]) for code, ids in self.ids_by_code.items()
+        ]
+        self.id_choices = [(str(pk), label) for pk, label in self.labels.items()]
+        # Serializer class -> {pk: representation}, filled on first use.
+        self.representations = {}
+        # Whether a lookup of a missing row reloaded this snapshot already.
+        self.reloaded_on_miss = reloaded_on_miss
+
+
+class ReferenceTable:
+    def __init__(self, model):
+        self.model = model
+        self.namespace = model_namespace(model)
+        self.lock = threading.Lock()
+        self.data = None
+        self.version = None
+        post_save.connect(self.invalidate, sender=model, weak=False)
+        post_delete.connect(self.invalidate, sender=model, weak=False)
+
+    def invalidate(self, using=None, **kwargs):
+        self.clear()
+        # Again once the write commits: until then other threads reload the
+        # old rows, and would keep them.
+        transaction.on_commit(self.clear, using=using)
+
+    def clear(self):
+        self.data = None
+
+    def get(self):
+        """
+        The current snapshot, reloaded if the table changed since it was taken.
+        """
+        version = local_namespace_versions([self.namespace])[0]
+        data = self.data
+        if data is None or self.version != version:
+            data = self.reload(version)
+        return data
+
+    def reload(self, version=None, reloaded_on_miss=False):
+        # From the primary: a lagging replica would return the rows from
+        # before the write that moved the version on.
+        with self.lock, primary_reads():
+            objects = list(self.model._default_manager.all())
+            data = ReferenceData(objects, reloaded_on_miss)
+            self.data, self.version = data, version
+        return data
+
+    def find(self, pk):
+        """
+        The current snapshot and its row ``pk``, or None for the row.
+
+        A row created by another process since the last version poll is not in
+        the snapshot yet, so the first miss reloads it; later misses at the same
+        version are taken as rows that do not exist.
+        """
+        data = self.get()
+        obj = data.objects.get(pk)
+        if obj is None and not data.reloaded_on_miss:
+            data = self.reload(self.version, reloaded_on_miss=True)
+            obj = data.objects.get(pk)
+        return data, obj
+
+
+tables = {}
+tables_lock = threading.Lock()
+
+
+def reference_table(model):
+    table = tables.get(model)
+    if table is None:
+        with tables_lock:
+            table = tables.setdefault(model, ReferenceTable(model))
+    return table
+
+
+def code_choices(model):
+    """
+    Callable ``(code, label)`` choices for a filter on the lookup's code.
+    """
+    return lambda: reference_table(model).get().code_choices
+
+
+def id_choices(model):
+    """
+    Callable ``(id, label)`` choices for a filter on the lookup's primary key.
+    """
+    return lambda: reference_table(model).get().id_choices
+
+
+class ReferenceSerializer(serializers.ModelSerializer):
+    """
+    Read-only serializer for a lookup model, rendered once per row and process
+    from the registry rather than field by field on every request.
+
+    Nested as a single field it reads the foreign key id alone, so the related
+    row needs neither ``select_related`` nor a query.
+    """
+
+    def get_attribute(self, instance):
+        return getattr(instance, instance._meta.get_field(self.source).attname)
+
+    def to_representation(self, instance):
+        pk = getattr(instance, "pk", instance)
+        data, obj = reference_table(self.Meta.model).find(pk)
+        if obj is None:
+            # Deleted meanwhile: render the instance we were given, if any.
+            if instance is pk:
+                return None
+            return super().to_representation(instance)
+        rendered = data.representations.setdefault(type(self), {})
+        if pk not in rendered:
+            rendered[pk] = dict(super().to_representation(obj))
+        # A copy: callers may change what they are given.
+        return dict(rendered[pk])
+
+
+class ReferencePrimaryKeyField(serializers.PrimaryKeyRelatedField):
+    """
+    Writable primary key of a lookup row, resolved from the registry instead
+    of one query per value. Set as ``serializer_related_field`` on model
+    serializers whose relations all point at lookup tables.
+    """
+
+    def to_internal_value(self, data):
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        model = self.queryset.model
+        try:
+            if isinstance(data, bool):
+                raise TypeError
+            pk = model._meta.pk.to_python(data)
+        except (TypeError, ValueError, ValidationError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        _, obj = reference_table(model).find(pk)
+        if obj is None:
+            self.fail("does_not_exist", pk_value=data)
+        return obj
+
@@ -0,0 +1,66 @@
+"""
+Fast JSON and MessagePack renderers for the API.
+
+Both encode through C extensions but hand dates, datetimes, decimals and lazy
+strings back to DRF's JSONEncoder, so values come out exactly as they did with
+the stock ``JSONRenderer``.
+"""
+
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+encoder = JSONEncoder()
+
+
+def encode_default(obj):
+    """
+    Fallback for the types orjson and msgpack leave to the caller.
+    """
+    return encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in ``JSONRenderer`` built on orjson.
+
+    Output is compact; any requested indent (``Accept: application/json;
+    indent=4`` or the browsable API) pretty-prints with two spaces, the only
+    width orjson supports.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        options = ORJSON_OPTIONS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        ret = orjson.dumps(data, default=encode_default, option=options)
+        # Escape U+2028 and U+2029 like JSONRenderer, keeping the output a
+        # strict JavaScript subset.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders MessagePack for clients sending ``Accept: application/msgpack``.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(
+            data, default=encode_default, use_bin_type=True, datetime=False
+        )
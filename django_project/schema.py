@@ -0,0 +1,104 @@
+"""
+The OpenAPI schema, served from files built by ``manage.py
+build_openapi_schema``.
+
+Generating the schema introspects every view, serializer and filterset, so it
+is done once at build or deploy time: one file per API version in
+``ALLOWED_VERSIONS`` and format (YAML, JSON) under ``OPENAPI_SCHEMA_DIR``.
+``/api/schema/`` serves the file for the version and format it negotiates,
+with a strong ETag over its content. Without a file it generates the schema
+live in DEBUG, and fails otherwise.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+from drf_spectacular.utils import extend_schema
+from rest_framework.settings import api_settings
+
+from .conditional import conditional_get
+
+RENDERERS = [OpenApiYamlRenderer, OpenApiJsonRenderer]
+
+# Path -> (content, ETag) of the files read by this process.
+artefacts = {}
+
+
+def schema_path(version, format):
+    name = f"openapi-{version}.{format}" if version else f"openapi.{format}"
+    return settings.OPENAPI_SCHEMA_DIR / name
+
+
+def build_schemas():
+    """
+    Generate the schema of every API version and write it in every format,
+    returning the paths written.
+    """
+    settings.OPENAPI_SCHEMA_DIR.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for version in api_settings.ALLOWED_VERSIONS or [None]:
+        generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(api_version=version)
+        schema = generator.get_schema(request=None, public=True)
+        for renderer_class in RENDERERS:
+            path = schema_path(version, renderer_class.format)
+            path.write_bytes(renderer_class().render(schema))
+            artefacts.pop(path, None)
+            paths.append(path)
+    return paths
+
+
+def load_artefact(path):
+    """
+    The content and ETag of the schema file at ``path``, or None without one.
+    """
+    if path not in artefacts:
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        artefacts[path] = content, f'"{hashlib.sha256(content).hexdigest()}"'
+    return artefacts[path]
+
+
+class SchemaView(SpectacularAPIView):
+    def get_version(self, request):
+        return (
+            self.api_version or request.version or self._get_version_parameter(request)
+        )
+
+    def get_artefact(self):
+        request = self.request
+        path = schema_path(self.get_version(request), request.accepted_renderer.format)
+        return load_artefact(path)
+
+    def get_validators(self):
+        artefact = self.get_artefact()
+        return None if artefact is None else (artefact[1], None)
+
+    @extend_schema(**SCHEMA_KWARGS)
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        artefact = self.get_artefact()
+        if artefact is None:
+            if not settings.DEBUG:
+                raise ImproperlyConfigured(
+                    "No prebuilt OpenAPI schema in OPENAPI_SCHEMA_DIR, run "
+                    "`manage.py build_openapi_schema`."
+                )
+            return super().get(request, *args, **kwargs)
+
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        filename = self._get_filename(request, self.get_version(request))
+        return HttpResponse(
+            artefact[0],
+            content_type=content_type,
+            headers={"Content-Disposition": f'inline; filename="{filename}"'},
+        )
@@ -4,8 +4,6 @@ from django.core.exceptions import ImproperlyConfigured
 import logging
 from datetime import timedelta
 
-import time
-
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -67,10 +65,28 @@ INSTALLED_APPS = [
     "bursaries.apps.BursariesConfig",
 ]
 
+# What this process serves: "web" (the default) everything, "api" the API
+# alone, without the admin, the API docs or the development tools and without
+# importing them at every start (see `manage.py startup_profile`).
+DJANGO_ROLE = os.environ.get("DJANGO_ROLE", "web")
+if DJANGO_ROLE not in ("web", "api"):
+    raise ImproperlyConfigured(f"DJANGO_ROLE must be web or api, not {DJANGO_ROLE}")
+
+excluded_apps = set()
+if DJANGO_ROLE == "api":
+    excluded_apps |= {"django.contrib.admin", "drf_spectacular", "django_ckeditor_5"}
+if not DEBUG or DJANGO_ROLE != "web":
+    excluded_apps.add("debug_toolbar")
+if os.environ.get("USE_R2", "") != "True":
+    excluded_apps.add("storages")
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in excluded_apps]
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django_prometheus.middleware.PrometheusBeforeMiddleware",  # Add Prometheus monitoring
+    "django_project.metrics.RequestMetricsMiddleware",
+    "django_project.db_router.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
@@ -81,29 +97,8 @@ MIDDLEWARE = [
     "allauth.account.middleware.AccountMiddleware",
     "django_prometheus.middleware.PrometheusAfterMiddleware",  # Add Prometheus monitoring
 ]
-
-
-# Custom Middleware for Request Timing
-class RequestTimingMiddleware:
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
-        start_time = time.time()
-        response = self.get_response(request)
-        duration = time.time() - start_time
-        response["X-Request-Duration"] = str(duration)
-
-        # Log if request is slow (> 1 second)
-        if duration > 1:
-            logger = logging.getLogger("django.request.timing")
-            logger.warning(
-                f"Slow request ({duration:.2f}s): {request.method} {request.path}"
-            )
-        return response
-
-
-MIDDLEWARE += ["django_project.settings.RequestTimingMiddleware"]
+if "debug_toolbar" not in INSTALLED_APPS:
+    MIDDLEWARE.remove("debug_toolbar.middleware.DebugToolbarMiddleware")
 
 ROOT_URLCONF = "django_project.urls"
 
@@ -138,6 +133,49 @@ DATABASES = {
     }
 }
 
+# Connection pooling (PostgreSQL only): each worker process keeps between
+# DB_POOL_MIN_SIZE and DB_POOL_MAX_SIZE connections per database alias, checks
+# them on checkout and replaces them after DB_POOL_MAX_LIFETIME seconds, or
+# DB_POOL_MAX_IDLE seconds unused. A request waits up to DB_POOL_TIMEOUT
+# seconds for a free connection. Pool usage is exported to Prometheus.
+if "postgresql" in DATABASES["default"]["ENGINE"] and (
+    os.environ.get("DB_POOL", "True") == "True"
+):
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "10")),
+            "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+            "max_lifetime": float(os.environ.get("DB_POOL_MAX_LIFETIME", "1800")),
+            "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", "300")),
+        }
+    }
+
+# Read replicas: one alias per host in SQL_REPLICA_HOSTS, sharing the primary's
+# database name, credentials and port. Safe requests read from a healthy one;
+# clients stay on the primary for DB_REPLICA_STICKY_SECONDS after a write, and
+# replicas more than DB_REPLICA_MAX_LAG_SECONDS behind are skipped. Health is
+# re-checked every DB_REPLICA_CHECK_INTERVAL seconds (django_project.db_router).
+for index, host in enumerate(
+    filter(None, os.environ.get("SQL_REPLICA_HOSTS", "").split(","))
+):
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    if "postgresql" in DATABASES["default"]["ENGINE"]:
+        DATABASES[f"replica_{index}"]["OPTIONS"] = {
+            **DATABASES["default"].get("OPTIONS", {}),
+            "connect_timeout": 2,
+        }
+
+DATABASE_ROUTERS = ["django_project.db_router.ReplicaRouter"]
+DB_REPLICA_STICKY_SECONDS = int(os.environ.get("DB_REPLICA_STICKY_SECONDS", "15"))
+DB_REPLICA_MAX_LAG_SECONDS = float(os.environ.get("DB_REPLICA_MAX_LAG_SECONDS", "10"))
+DB_REPLICA_CHECK_INTERVAL = 5
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -225,13 +263,28 @@ if not DEBUG:
         }
     }
 
-# Django Debug Toolbar
-if DEBUG:
-    import socket
-
-    hostname, _, ips = socket.gethostbyname_ex(socket.gethostname())
-    INTERNAL_IPS = [ip[: ip.rfind(".")] + ".1" for ip in ips]
-    INTERNAL_IPS.append("127.0.0.1")
+# Lifetime of cached API responses. Entries are invalidated through versioned
+# namespaces (django_project.cache) as soon as their data changes, so this only
+# bounds how long unused entries linger.
+API_CACHE_TIMEOUT = int(os.environ.get("API_CACHE_TTL_HOURS", "6")) * 60 * 60
+# Expired entries are served for this much longer while one worker, holding
+# a lock for at most API_CACHE_LOCK_TIMEOUT seconds, recomputes them. Workers
+# finding no entry at all wait API_CACHE_LOCK_WAIT seconds once for it, then
+# compute it themselves.
+API_CACHE_GRACE = int(os.environ.get("API_CACHE_GRACE_SECONDS", "300"))
+API_CACHE_LOCK_TIMEOUT = 30
+API_CACHE_LOCK_WAIT = 0.05
+# Per-process tier for reference data: up to API_LOCAL_CACHE_SIZE responses
+# and namespace versions, kept API_LOCAL_CACHE_TIMEOUT seconds. Versions are
+# re-read from Redis every API_LOCAL_VERSION_TTL seconds, which bounds how long
+# another process's write can go unseen.
+API_LOCAL_CACHE_SIZE = 256
+API_LOCAL_CACHE_TIMEOUT = 300
+API_LOCAL_VERSION_TTL = 1
+
+# Django Debug Toolbar, which also recognises requests from the Docker host
+# by itself.
+INTERNAL_IPS = ["127.0.0.1"]
 
 # Custom user model
 AUTH_USER_MODEL = "accounts.CustomUser"
@@ -258,8 +311,10 @@ CRISPY_TEMPLATE_PACK = "bootstrap5"
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
-# Application Performance Monitoring
-if not DEBUG:
+# Application Performance Monitoring, when a DSN is configured. Integrations
+# are listed explicitly: by default sentry_sdk tries every one it ships,
+# importing e.g. botocore at every start.
+if not DEBUG and os.environ.get("SENTRY_DSN"):
     import sentry_sdk
     from sentry_sdk.integrations.django import DjangoIntegration
     from sentry_sdk.integrations.redis import RedisIntegration
@@ -282,6 +337,7 @@ if not DEBUG:
             os.environ.get("SENTRY_PROFILES_SAMPLE_RATE", "0.1")
         ),
         send_default_pii=True,
+        auto_enabling_integrations=False,
         before_send=lambda event, hint: event if not DEBUG else None,
     )
 
@@ -378,13 +434,39 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_RENDERER_CLASSES": [
+        "django_project.renderers.ORJSONRenderer",
+        "django_project.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "django_project.parsers.ORJSONParser",
+        "django_project.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    "DEFAULT_PAGINATION_CLASS": "django_project.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_VERSIONING_CLASS": "rest_framework.versioning.AcceptHeaderVersioning",
     "DEFAULT_VERSION": "1.0",
     "ALLOWED_VERSIONS": ["1.0"],
 }
 
+# Serve public accommodation reads from the AccommodationListing read model.
+# Run `manage.py rebuild_listings` once before turning this on.
+ACCOMMODATION_READ_MODEL = os.environ.get("ACCOMMODATION_READ_MODEL", "") == "True"
+
+# Render the public accommodation and bursary lists from values() rows instead
+# of model instances (django_project.values_serialization).
+VALUES_LIST_SERIALIZATION = (
+    os.environ.get("VALUES_LIST_SERIALIZATION", "") == "True"
+)
+
+# Route the public list and detail endpoints to their async twins
+# (django_project.async_views). Only worth it on ASGI workers, e.g.
+# `gunicorn django_project.asgi:application -k uvicorn.workers.UvicornWorker`.
+ASYNC_PUBLIC_API = os.environ.get("ASYNC_PUBLIC_API", "") == "True"
+
 # Spectacular Settings
 SPECTACULAR_SETTINGS = {
     "TITLE": "Student Connect API",
@@ -399,6 +481,9 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# Prebuilt OpenAPI schemas served by /api/schema/ (django_project.schema).
+OPENAPI_SCHEMA_DIR = BASE_DIR / "openapi"
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -0,0 +1,109 @@
+"""
+Sparse fieldsets (``?fields=``) and opt-in expansion (``?expand=``).
+
+Without either parameter responses keep their full shape. With them, scalar
+fields are limited to ``fields`` (all scalars when only ``expand`` is given)
+and nested fields are only rendered, and only fetched, when named in
+``fields`` or ``expand``.
+"""
+
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def split_param(request, name):
+    value = request.query_params.get(name, "")
+    return {part.strip() for part in value.split(",") if part.strip()}
+
+
+def get_sparse_fields(request, names, nested):
+    """
+    The field names a request asks for, or None to keep every field.
+    """
+    if request is None:
+        return None
+    fields = split_param(request, FIELDS_PARAM)
+    expand = split_param(request, EXPAND_PARAM)
+    if not fields and not expand:
+        return None
+    keep = set(fields) if fields else set(names) - set(nested)
+    return (keep | (expand & set(nested))) & set(names)
+
+
+def nested_field_names(serializer_class):
+    """
+    Declared fields of a serializer class that are themselves serializers.
+    """
+    return {
+        name
+        for name, field in serializer_class._declared_fields.items()
+        if isinstance(field, BaseSerializer)
+    }
+
+
+def sparse_representation(data, request, nested):
+    """
+    Apply the request's fieldset to an already rendered representation.
+    """
+    keep = get_sparse_fields(request, data.keys(), nested)
+    if keep is None:
+        return data
+    return {name: value for name, value in data.items() if name in keep}
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin honouring ``?fields=`` and ``?expand=`` on the request.
+
+    Only the top-level serializer (or the child of a top-level list) is
+    trimmed; nested serializers always render in full.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        top_level = parent is None or (
+            isinstance(parent, ListSerializer) and parent.parent is None
+        )
+        if not top_level:
+            return fields
+        nested = nested_field_names(type(self))
+        keep = get_sparse_fields(self.context.get("request"), fields, nested)
+        if keep is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in keep}
+
+
+class SparseQuerysetMixin:
+    """
+    View mixin that only joins or prefetches the nested fields requested.
+
+    Views list the relations backing nested serializer fields in
+    ``sparse_select_related`` and ``sparse_prefetch_related`` instead of
+    adding them to ``queryset`` directly.
+    """
+
+    sparse_select_related = []
+    sparse_prefetch_related = []
+
+    def get_requested_nested_fields(self):
+        serializer_class = self.get_serializer_class()
+        nested = nested_field_names(serializer_class)
+        names = getattr(serializer_class.Meta, "fields", nested)
+        keep = get_sparse_fields(getattr(self, "request", None), names, nested)
+        return nested if keep is None else nested & keep
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        requested = self.get_requested_nested_fields()
+        select = [name for name in self.sparse_select_related if name in requested]
+        prefetch = [
+            name for name in self.sparse_prefetch_related if name in requested
+        ]
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
@@ -0,0 +1,116 @@
+"""
+Cold-start profiling, behind ``manage.py startup_profile``.
+
+``profile()`` starts a fresh interpreter with ``-X importtime`` which runs
+``main()``: it times each startup phase (settings, app registry, URLconf,
+request handler) and each app's ``ready()``, and prints them as JSON. The
+import times reported on stderr are added per module and per top-level
+package. Nothing is imported at module level, so running ``main()`` measures
+the project's imports alone.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+
+def main():
+    started = time.perf_counter()
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_project.settings")
+    phases = {}
+    ready = {}
+
+    def phase(name, step):
+        phase_started = time.perf_counter()
+        result = step()
+        phases[name] = time.perf_counter() - phase_started
+        return result
+
+    def setup_with_timed_ready():
+        import django
+        from django.apps.config import AppConfig
+
+        create = AppConfig.create.__func__
+
+        def create_timed(cls, entry):
+            app_config = create(cls, entry)
+            app_ready = app_config.ready
+
+            def timed_ready():
+                ready_started = time.perf_counter()
+                app_ready()
+                ready[app_config.label] = time.perf_counter() - ready_started
+
+            app_config.ready = timed_ready
+            return app_config
+
+        AppConfig.create = classmethod(create_timed)
+        django.setup()
+
+    def load_urlconf():
+        from django.urls import get_resolver
+
+        return get_resolver().url_patterns
+
+    def load_handler():
+        from django.core.wsgi import get_wsgi_application
+
+        return get_wsgi_application()
+
+    phase("settings", lambda: __import__("django.conf").conf.settings.DEBUG)
+    phase("apps", setup_with_timed_ready)
+    phase("urlconf", load_urlconf)
+    phase("handler", load_handler)
+    json.dump(
+        {
+            "total": time.perf_counter() - started,
+            "phases": phases,
+            "ready": ready,
+            "packages": sorted({name.partition(".")[0] for name in sys.modules}),
+        },
+        sys.stdout,
+    )
+
+
+def parse_importtime(lines):
+    """
+    ``{module: (self seconds, cumulative seconds)}`` from ``-X importtime``.
+    """
+    modules = {}
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if self_us.strip().isdigit():
+            modules[name.strip()] = (
+                int(self_us) / 1_000_000,
+                int(cumulative_us) / 1_000_000,
+            )
+    return modules
+
+
+def profile(role=None):
+    """
+    Start the project in a new interpreter, as DJANGO_ROLE ``role`` if given,
+    and return what ``main()`` measured plus its ``modules`` import times and
+    the self time of every top-level ``package``.
+    """
+    env = dict(os.environ)
+    if role:
+        env["DJANGO_ROLE"] = role
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {__name__} as m; m.main()"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    result = json.loads(process.stdout)
+    result["modules"] = parse_importtime(process.stderr.splitlines())
+    result["import_times"] = defaultdict(float)
+    for name, (self_time, _) in result["modules"].items():
+        result["import_times"][name.partition(".")[0]] += self_time
+    return result
@@ -0,0 +1,264 @@
+"""
+Values-based fast path for read-only list serializers.
+
+``ValuesSerializer`` produces the representation of a ModelSerializer with
+nested read-only serializers without building model instances or walking
+field objects per row. Scalar columns and forward foreign keys come from one
+``values()`` query, and each many-to-many relation from one more query grouped
+into a dict by row id. How each value is converted is decided once per request
+from the serializer's own fields, so decimals, dates and datetimes are
+formatted exactly as the serializer would format them.
+"""
+
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import fields as drf_fields
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+from .metrics import serialization_timed
+from .reference import ReferenceSerializer, reference_table
+
+# Fields whose to_representation returns the value values() already gives.
+PASSTHROUGH_FIELDS = (
+    drf_fields.BooleanField,
+    drf_fields.CharField,
+    drf_fields.ChoiceField,
+    drf_fields.IntegerField,
+    drf_fields.ReadOnlyField,
+)
+
+
+def scalar_plan(field):
+    """
+    The values() lookup behind a scalar field and its converter, if any.
+    """
+    if len(field.source_attrs) != 1 or isinstance(
+        field, (BaseSerializer, drf_fields.SerializerMethodField)
+    ):
+        raise ImproperlyConfigured(
+            f"ValuesSerializer cannot render field {field.field_name!r}."
+        )
+    if isinstance(field, PASSTHROUGH_FIELDS):
+        return field.source, None
+    return field.source, field.to_representation
+
+
+def represent(values, plan):
+    return {
+        name: value if convert is None or value is None else convert(value)
+        for (name, convert), value in zip(plan, values)
+    }
+
+
+class ValuesSerializer:
+    """
+    Render rows fetched with ``values()`` the way ``serializer_class`` would.
+
+    Supports scalar model fields, nested serializers over forward foreign keys
+    and ``many=True`` nested serializers over forward many-to-many relations,
+    all of whose fields are themselves scalar. Nested ReferenceSerializers
+    only fetch ids (the foreign key column, or the through table's id pairs)
+    and render the rows from the reference registry.
+    """
+
+    def __init__(self, serializer_class, context=None):
+        self.model = serializer_class.Meta.model
+        self.columns = []
+        self.plan = []
+        fields = serializer_class(context=context or {}).fields
+        for name, field in fields.items():
+            if isinstance(field, ListSerializer):
+                if isinstance(field.child, ReferenceSerializer):
+                    relation = self.many_relation(field)
+                    self.plan.append((name, "references", (relation, field.child)))
+                else:
+                    self.plan.append((name, "many", self.many_plan(field)))
+            elif isinstance(field, ReferenceSerializer):
+                self.columns.append(field.source)
+                self.plan.append((name, "reference", (field.source, field)))
+            elif isinstance(field, BaseSerializer):
+                self.plan.append((name, "one", self.one_plan(field)))
+            else:
+                lookup, convert = scalar_plan(field)
+                self.columns.append(lookup)
+                self.plan.append((name, "scalar", (lookup, convert)))
+
+    def one_plan(self, field):
+        lookups, plan = [], []
+        for name, child in field.fields.items():
+            lookup, convert = scalar_plan(child)
+            lookups.append(f"{field.source}__{lookup}")
+            plan.append((name, convert))
+        self.columns.extend([field.source, *lookups])
+        return field.source, lookups, plan
+
+    def many_relation(self, field):
+        relation = self.model._meta.get_field(field.source)
+        if not relation.many_to_many or relation.auto_created:
+            raise ImproperlyConfigured(
+                f"ValuesSerializer cannot render relation {field.field_name!r}."
+            )
+        return relation
+
+    def many_plan(self, field):
+        relation = self.many_relation(field)
+        lookups, plan = [], []
+        for name, child in field.child.fields.items():
+            lookup, convert = scalar_plan(child)
+            lookups.append(lookup)
+            plan.append((name, convert))
+        return relation, lookups, plan
+
+    def values_queryset(self, queryset, *extra):
+        """
+        The values() queryset to paginate; ``extra`` adds columns the caller
+        needs, such as the ordering field a keyset cursor is built from.
+        """
+        columns = dict.fromkeys(["pk", *self.columns, *extra])
+        return queryset.prefetch_related(None).values(*columns)
+
+    def related_queries(self, ids):
+        """
+        The query behind each many-to-many field, for the rows ``ids``.
+
+        ``many`` fields fetch ``(row id, *lookups)`` from the related table and
+        ``references`` fields ``(row id, related id)`` pairs from the through
+        table.
+        """
+        queries = {}
+        for name, kind, payload in self.plan:
+            if kind == "many":
+                relation, lookups, _ = payload
+                query_name = relation.related_query_name()
+                queries[name] = relation.related_model._default_manager.filter(
+                    **{f"{query_name}__in": ids}
+                ).values_list(query_name, *lookups)
+            elif kind == "references":
+                relation, _ = payload
+                source = relation.m2m_field_name()
+                target = relation.m2m_reverse_field_name()
+                queries[name] = relation.remote_field.through.objects.filter(
+                    **{f"{source}__in": ids}
+                ).values_list(f"{source}_id", f"{target}_id")
+        return queries
+
+    def group_many(self, payload, rows):
+        """
+        Represented related rows per row id, in the related model's ordering.
+        """
+        _, _, plan = payload
+        related = defaultdict(list)
+        for row_id, *values in rows:
+            related[row_id].append(represent(values, plan))
+        return related
+
+    def group_references(self, payload, pairs):
+        """
+        Registry representations per row id, sorted into the related model's
+        ordering.
+        """
+        relation, child = payload
+        related_ids = defaultdict(list)
+        for row_id, related_id in pairs:
+            related_ids[row_id].append(related_id)
+
+        positions = reference_table(relation.related_model).get().positions
+        return {
+            row_id: [
+                child.to_representation(pk)
+                for pk in sorted(pks, key=lambda pk: positions.get(pk, len(positions)))
+            ]
+            for row_id, pks in related_ids.items()
+        }
+
+    def serialize(self, rows):
+        rows = list(rows)
+        ids = [row["pk"] for row in rows]
+        fetched = {}
+        if ids:
+            fetched = {
+                name: list(query) for name, query in self.related_queries(ids).items()
+            }
+        return self.assemble(rows, fetched)
+
+    async def aserialize(self, rows):
+        """
+        ``serialize`` fetching the many-to-many rows through the async ORM.
+
+        Rendering may load a reference table, so it runs in a thread.
+        """
+        ids = [row["pk"] for row in rows]
+        fetched = {}
+        if ids:
+            for name, query in self.related_queries(ids).items():
+                fetched[name] = [row async for row in query]
+        return await sync_to_async(self.assemble)(rows, fetched)
+
+    @serialization_timed
+    def assemble(self, rows, fetched):
+        """
+        Render ``values()`` rows, given the rows fetched by ``related_queries``.
+        """
+        groupers = {"many": self.group_many, "references": self.group_references}
+        related = {
+            name: groupers[kind](payload, fetched[name])
+            for name, kind, payload in self.plan
+            if name in fetched
+        }
+        data = []
+        for row in rows:
+            item = {}
+            for name, kind, payload in self.plan:
+                if kind == "scalar":
+                    lookup, convert = payload
+                    value = row[lookup]
+                    if convert is not None and value is not None:
+                        value = convert(value)
+                elif kind == "one":
+                    source, lookups, plan = payload
+                    value = None
+                    if row[source] is not None:
+                        value = represent([row[lookup] for lookup in lookups], plan)
+                elif kind == "reference":
+                    source, field = payload
+                    value = None
+                    if row[source] is not None:
+                        value = field.to_representation(row[source])
+                else:
+                    value = related[name].get(row["pk"], [])
+                item[name] = value
+            data.append(item)
+        return data
+
+
+class ValuesListMixin:
+    """
+    List view mixin serving ``list()`` through ValuesSerializer when
+    ``settings.VALUES_LIST_SERIALIZATION`` is on.
+
+    Filtering, ordering and pagination are unchanged; the paginator receives
+    a values() queryset, so pages hold dicts instead of model instances.
+    """
+
+    def use_values_serialization(self):
+        return settings.VALUES_LIST_SERIALIZATION
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_values_serialization():
+            return super().list(request, *args, **kwargs)
+
+        serializer = ValuesSerializer(
+            self.get_serializer_class(), context=self.get_serializer_context()
+        )
+        queryset = serializer.values_queryset(
+            self.filter_queryset(self.get_queryset()),
+            *getattr(self, "keyset_ordering_fields", []),
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(queryset))
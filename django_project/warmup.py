@@ -0,0 +1,88 @@
+"""
+Process warmup, run from the gunicorn hooks in gunicorn.conf.py so a fresh
+worker does not make its first requests pay for lazy initialisation.
+
+``warm_up(database=False)`` only touches in-memory state: the URL resolver's
+compiled patterns and reverse tables, the views and serializers they import
+and the model metadata serializers introspect. Run in the master before
+forking, that work is shared copy-on-write by every worker.
+``warm_up(database=True)`` also loads the reference registry, which needs a
+database connection and so must only run in the workers.
+"""
+
+import logging
+import time
+
+from django.db import connections
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+from .reference import ReferenceSerializer, reference_table
+
+logger = logging.getLogger(__name__)
+
+
+def view_classes(patterns):
+    """
+    Classes of the DRF views in ``patterns``, compiling each pattern's regex
+    on the way.
+    """
+    for pattern in patterns:
+        pattern.pattern.regex
+        if isinstance(pattern, URLResolver):
+            yield from view_classes(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, "cls", None)
+            if view_class is not None:
+                yield view_class
+
+
+def warm_serializers(serializer_classes):
+    """
+    Build the fields of each serializer and its nested serializers, returning
+    the lookup models their ReferenceSerializers render.
+    """
+    models = set()
+    pending = [serializer_class() for serializer_class in serializer_classes]
+    while pending:
+        serializer = pending.pop()
+        for field in serializer.fields.values():
+            if isinstance(field, ListSerializer):
+                field = field.child
+            if isinstance(field, ReferenceSerializer):
+                models.add(field.Meta.model)
+            elif isinstance(field, BaseSerializer):
+                pending.append(field)
+    return models
+
+
+def close_connections():
+    """
+    Close the connections and pools this process opened, so that a master
+    about to fork leaves none for its workers to share.
+    """
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+        if hasattr(connection, "close_pool"):
+            connection.close_pool()
+
+
+def warm_up(database=True):
+    started = time.perf_counter()
+    resolver = get_resolver()
+    resolver.reverse_dict
+    serializer_classes = {
+        view_class.serializer_class
+        for view_class in view_classes(resolver.url_patterns)
+        if getattr(view_class, "serializer_class", None) is not None
+    }
+    models = warm_serializers(serializer_classes)
+    if database:
+        for model in models:
+            reference_table(model).get()
+    logger.info(
+        "Warmed up %d serializers%s in %.0f ms",
+        len(serializer_classes),
+        f" and {len(models)} reference tables" if database else "",
+        (time.perf_counter() - started) * 1000,
+    )
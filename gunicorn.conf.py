@@ -0,0 +1,126 @@
+"""
+Gunicorn configuration for the web containers: ``gunicorn -c gunicorn.conf.py``.
+
+Every setting can be overridden from the environment. The application is
+preloaded in the master, so workers share the modules it imported
+copy-on-write, and the master warms what needs no database before forking
+(django_project.warmup). Each worker then loads the reference data once it has
+loaded the app, before it accepts requests. The master must not hold database
+connections or pools when it forks: workers would share their sockets.
+"""
+
+import glob
+import math
+import os
+import tempfile
+
+
+def available_cpus():
+    """
+    CPUs the server may use: the ones its affinity mask allows, capped by the
+    container's cgroup v2 CPU quota when it has one. ``os.cpu_count()`` sees
+    every CPU of the host.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Not on Linux.
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+wsgi_app = os.environ.get("GUNICORN_APP", "django_project.wsgi:application")
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+# Only used by the gthread worker class.
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+preload_app = os.environ.get("GUNICORN_PRELOAD", "True") == "True"
+
+# Every worker may open DB_POOL_MAX_SIZE connections to the primary and as
+# many to each replica; without the pool, one per thread. DB_MAX_CONNECTIONS,
+# when set, is this server's share of each database's max_connections: the
+# default worker count is capped to fit it, and an explicit one must fit.
+# (Not named worker_connections: gunicorn reads that as the gthread worker's
+# limit on client connections, keep-alive ones included.)
+if os.environ.get("DB_POOL", "True") == "True":
+    db_connections_per_worker = int(os.environ.get("DB_POOL_MAX_SIZE", "10"))
+else:
+    db_connections_per_worker = threads
+connection_budget = os.environ.get("DB_MAX_CONNECTIONS")
+if "GUNICORN_WORKERS" in os.environ:
+    workers = int(os.environ["GUNICORN_WORKERS"])
+else:
+    workers = available_cpus() * 2 + 1
+    if connection_budget:
+        workers = max(
+            1, min(workers, int(connection_budget) // db_connections_per_worker)
+        )
+if connection_budget and workers * db_connections_per_worker > int(connection_budget):
+    raise RuntimeError(
+        f"{workers} workers may open {workers * db_connections_per_worker} "
+        f"connections per database, more than DB_MAX_CONNECTIONS={connection_budget}: "
+        "lower GUNICORN_WORKERS or DB_POOL_MAX_SIZE."
+    )
+
+# Restart workers after a number of requests to bound slow memory growth,
+# staggered by the jitter so they do not all restart at once.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 200))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+# Worker heartbeats on tmpfs rather than the container's overlay filesystem.
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+errorlog = "-"
+
+# With several workers, prometheus_client keeps each worker's metrics in files
+# here and /metrics merges them (django_project.metrics.export_metrics). Set
+# before the app, which imports prometheus_client, is loaded; files left by a
+# previous run would be merged into this one's metrics.
+if workers > 1:
+    os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR",
+        os.path.join(tempfile.gettempdir(), "prometheus-multiproc"),
+    )
+prometheus_multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+if prometheus_multiproc_dir:
+    os.makedirs(prometheus_multiproc_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(prometheus_multiproc_dir, "*.db")):
+        os.remove(path)
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from django_project.warmup import close_connections, warm_up
+
+    warm_up(database=False)
+    close_connections()
+
+
+def post_worker_init(worker):
+    # Runs in the worker once the app is loaded, before its first request.
+    from django_project.warmup import warm_up
+
+    try:
+        warm_up()
+    except Exception:
+        # The worker still serves: whatever failed loads on first use instead.
+        worker.log.exception("Worker warmup failed")
+
+
+def child_exit(server, worker):
+    if prometheus_multiproc_dir:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,3 +1,496 @@
-from django.test import TestCase
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import msgpack
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils.translation import gettext_lazy
+from drf_spectacular.views import SpectacularAPIView
+from gunicorn.app.base import Application
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accomodations.models import Amenity, Institution
+
+from django_project.cache import (
+    acquire_lock,
+    bump_namespaces,
+    cache_response,
+    freeze_response,
+    local_responses,
+    local_versions,
+    response_cache_key,
+    version_key,
+)
+from django_project.db_router import (
+    STICKY_COOKIE,
+    ReplicaRouter,
+    ReplicaRoutingMiddleware,
+    replica_health,
+    replicas_allowed,
+)
+from django_project.metrics import ConnectionPoolCollector
+from django_project.reference import reference_table, tables
+from django_project.renderers import ORJSONRenderer
+from django_project.schema import SchemaView, build_schemas
+from django_project.startup import profile
+from django_project.warmup import warm_up
+
+
+@mock.patch.object(replica_health, "get", return_value=["replica_0"])
+class ReplicaRoutingTests(SimpleTestCase):
+    def route(self, request):
+        """
+        The alias a read made while handling ``request`` goes to, and the
+        response.
+        """
+        aliases = []
+
+        def view(request):
+            aliases.append(ReplicaRouter().db_for_read(None))
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(view)(request)
+        return aliases[0], response
+
+    def test_safe_requests_read_from_replicas(self, health):
+        alias, _ = self.route(RequestFactory().get("/"))
+        self.assertEqual(alias, "replica_0")
+        self.assertEqual(ReplicaRouter().db_for_read(None), "default")
+
+    def test_writes_stick_to_primary(self, health):
+        alias, response = self.route(RequestFactory().post("/"))
+        self.assertEqual(alias, "default")
+        self.assertIn(STICKY_COOKIE, response.cookies)
+
+        request = RequestFactory().get("/")
+        request.COOKIES[STICKY_COOKIE] = "1"
+        alias, _ = self.route(request)
+        self.assertEqual(alias, "default")
+
+    def test_token_writes_stick_to_primary_without_cookies(self, health):
+        cache.clear()
+        writer, other = AccessToken(), AccessToken()
+        writer["user_id"], other["user_id"] = 7, 8
+
+        def write(request):
+            # What DRF does once JWTAuthentication accepted the token.
+            request.user = SimpleNamespace(id=7, is_authenticated=True)
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(write)(RequestFactory().post("/"))
+
+        for token, expected in [(writer, "default"), (other, "replica_0")]:
+            request = RequestFactory().get(
+                "/", headers={"authorization": f"Bearer {token}"}
+            )
+            alias, _ = self.route(request)
+            self.assertEqual(alias, expected)
+
+    def test_unhealthy_replicas_fall_back_to_primary(self, health):
+        health.return_value = []
+        alias, _ = self.route(RequestFactory().get("/"))
+        self.assertEqual(alias, "default")
+
+
+class CachedView:
+    def __init__(self):
+        self.calls = 0
+
+    def get_cache_namespaces(self):
+        return ["tests.cached"]
+
+    @cache_response()
+    def get(self, request):
+        self.calls += 1
+        return HttpResponse(f"computed {self.calls}")
+
+
+class ResponseCacheTests(SimpleTestCase):
+    """
+    Misses compute once, stale entries are served while another worker
+    revalidates, and a worker finding the lock held waits once, not until
+    the holder is done.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.view = CachedView()
+        self.request = RequestFactory().get("/cached/")
+        self.key = response_cache_key(self.request, ["tests.cached"])
+
+    def get(self):
+        return self.view.get(self.request).content.decode()
+
+    def store(self, content, fresh_for):
+        entry = (time.time() + fresh_for, freeze_response(HttpResponse(content)))
+        cache.set(self.key, entry, 60)
+
+    def test_miss_computes_then_hits(self):
+        self.assertEqual(self.get(), "computed 1")
+        self.assertEqual(self.get(), "computed 1")
+        self.assertEqual(self.view.calls, 1)
+
+    def test_stale_entry_served_while_locked(self):
+        self.store("stale", fresh_for=-1)
+        acquire_lock(self.key)
+        self.assertEqual(self.get(), "stale")
+        self.assertEqual(self.view.calls, 0)
+
+    def test_stale_entry_revalidated_by_lock_holder(self):
+        self.store("stale", fresh_for=-1)
+        self.assertEqual(self.get(), "computed 1")
+        self.assertEqual(self.get(), "computed 1")
+
+    def test_coalesced_with_lock_holder(self):
+        acquire_lock(self.key)
+        with mock.patch(
+            "django_project.cache.time.sleep",
+            side_effect=lambda seconds: self.store("coalesced", fresh_for=60),
+        ) as sleep:
+            self.assertEqual(self.get(), "coalesced")
+        sleep.assert_called_once_with(settings.API_CACHE_LOCK_WAIT)
+        self.assertEqual(self.view.calls, 0)
+
+    def test_slow_lock_holder_is_not_waited_for(self):
+        acquire_lock(self.key)
+        with mock.patch("django_project.cache.time.sleep") as sleep:
+            self.assertEqual(self.get(), "computed 1")
+        sleep.assert_called_once_with(settings.API_CACHE_LOCK_WAIT)
+
+
+class LocalCachedView(CachedView):
+    @cache_response(local=True)
+    def get(self, request):
+        self.calls += 1
+        return HttpResponse(f"computed {self.calls}")
+
+
+class LocalResponseCacheTests(SimpleTestCase):
+    """
+    Views caching locally answer repeat requests from process memory until
+    their namespace version moves on.
+    """
+
+    def setUp(self):
+        cache.clear()
+        local_responses.clear()
+        local_versions.clear()
+        self.view = LocalCachedView()
+
+    def get(self):
+        return self.view.get(RequestFactory().get("/cached/")).content.decode()
+
+    def test_local_hit_skips_shared_cache(self):
+        self.assertEqual(self.get(), "computed 1")
+        with mock.patch("django_project.cache.cache") as shared:
+            self.assertEqual(self.get(), "computed 1")
+        self.assertEqual(shared.mock_calls, [])
+
+    def test_version_bump_drops_local_entry(self):
+        self.assertEqual(self.get(), "computed 1")
+        bump_namespaces("tests.cached")
+        self.assertEqual(self.get(), "computed 2")
+
+    def test_other_process_bump_seen_once_versions_expire(self):
+        self.assertEqual(self.get(), "computed 1")
+        # Another process' bump reaches the shared cache only.
+        cache.incr(version_key("tests.cached"))
+        self.assertEqual(self.get(), "computed 1")
+
+        local_versions.clear()  # API_LOCAL_VERSION_TTL elapsed.
+        self.assertEqual(self.get(), "computed 2")
+
+
+class StaleReplicaView(CachedView):
+    @cache_response()
+    def get(self, request):
+        # A lagging replica still returns the rows from before the write.
+        if ReplicaRouter().db_for_read(None) == "default":
+            return HttpResponse("fresh")
+        return HttpResponse("stale")
+
+
+@mock.patch.object(replica_health, "get", return_value=["replica_0"])
+class ReplicaCacheFillTests(TestCase):
+    """
+    What is cached under a namespace version that just changed is read from
+    the primary, never from a replica that may not have the write yet.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self):
+        middleware = ReplicaRoutingMiddleware(StaleReplicaView().get)
+        return middleware(RequestFactory().get("/cached/")).content.decode()
+
+    def test_fill_after_write_reads_primary(self, health):
+        bump_namespaces("tests.cached")
+        self.assertEqual(self.get(), "fresh")
+        self.assertEqual(self.get(), "fresh")
+
+    def test_fill_long_after_write_reads_replica(self, health):
+        window = settings.DB_REPLICA_STICKY_SECONDS + 1
+        version = time.time_ns() - window * 1_000_000_000
+        cache.set(version_key("tests.cached"), version, timeout=None)
+        self.assertEqual(self.get(), "stale")
+
+    def test_registry_reloads_from_primary(self, health):
+        Amenity.objects.create(name="wifi")
+        token = replicas_allowed.set(True)
+        try:
+            data = reference_table(Amenity).reload()
+        finally:
+            replicas_allowed.reset(token)
+        self.assertEqual(list(data.ids_by_code), ["wifi"])
+
+
+class WarmupTests(TestCase):
+    def setUp(self):
+        for table in tables.values():
+            table.clear()
+
+    def test_master_warmup_needs_no_database(self):
+        with self.assertNumQueries(0):
+            warm_up(database=False)
+
+    def test_worker_warmup_loads_reference_tables(self):
+        warm_up()
+        for model in [Amenity, Institution]:
+            self.assertIsNotNone(reference_table(model).data)
+
+
+# A cold start takes about 0.6 s on a development machine; the budget leaves
+# room for slower ones and still catches a heavy import added to startup.
+STARTUP_BUDGET_SECONDS = 2
+
+
+# The project's admin-side modules, which the api role must not import.
+ADMIN_MODULES = [
+    "django_project.admin_filters",
+    "accomodations.admin",
+    "bursaries.admin",
+]
+
+SHARED_MODULES = [
+    f"django_project.{name}"
+    for name in [
+        "cache",
+        "conditional",
+        "db_router",
+        "metrics",
+        "pagination",
+        "parsers",
+        "reference",
+        "renderers",
+        "sparse_fields",
+        "values_serialization",
+    ]
+]
+
+
+class StartupTests(SimpleTestCase):
+    def test_cold_start_within_budget(self):
+        result = profile()
+        self.assertLess(result["total"], STARTUP_BUDGET_SECONDS, result["phases"])
+
+    def test_api_role_leaves_out_web_only_apps(self):
+        result = profile("api")
+        self.assertNotIn("debug_toolbar", result["packages"])
+        self.assertNotIn("drf_spectacular.views", result["modules"])
+        self.assertNotIn("admin", result["ready"])
+        for module in ADMIN_MODULES:
+            self.assertNotIn(module, result["modules"])
+
+    def test_shared_modules_leave_out_admin(self):
+        # DRF's views import django.contrib.admin through admindocs, so the api
+        # role loads it anyway; the project's shared modules must not add it.
+        code = (
+            "import sys, django; django.setup(); "
+            + "; ".join(f"import {module}" for module in SHARED_MODULES)
+            + "; print(sorted(m for m in sys.modules if m.startswith("
+            "'django.contrib.admin')))"
+        )
+        process = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "DJANGO_ROLE": "api"},
+            check=True,
+        )
+        self.assertEqual(process.stdout.strip(), "[]")
+
+
+class GunicornConfig(Application):
+    """
+    gunicorn's settings as loaded from the project's gunicorn.conf.py.
+    """
+
+    def init(self, parser, opts, args):
+        pass
+
+    def load_config(self):
+        self.load_config_from_module_name_or_filename(
+            str(settings.BASE_DIR / "gunicorn.conf.py")
+        )
+
+    def load(self):
+        pass
+
+
+class GunicornConfigTests(SimpleTestCase):
+    def load(self, **environ):
+        with mock.patch.dict(os.environ, {"GUNICORN_WORKERS": "1", **environ}):
+            return GunicornConfig().cfg
+
+    def test_keeps_gthread_keepalive_slots(self):
+        for pool in ["True", "False"]:
+            with self.subTest(pool=pool):
+                cfg = self.load(DB_POOL=pool, DB_POOL_MAX_SIZE="10")
+                self.assertEqual(cfg.worker_connections, 1000)
+                self.assertGreater(cfg.worker_connections - cfg.threads, 0)
+
+
+class SchemaTests(SimpleTestCase):
+    def setUp(self):
+        schema_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(schema_dir.cleanup)
+        settings_override = override_settings(OPENAPI_SCHEMA_DIR=Path(schema_dir.name))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def get(self, view_class, **headers):
+        request = RequestFactory().get("/api/schema/", headers=headers)
+        return view_class.as_view()(request)
+
+    def test_serves_prebuilt_schema(self):
+        build_schemas()
+        for accept in ["application/vnd.oai.openapi", "application/json"]:
+            with self.subTest(accept=accept):
+                response = self.get(SchemaView, accept=accept)
+                live = self.get(SpectacularAPIView, accept=accept).render()
+                self.assertEqual(response.content, live.content)
+                self.assertEqual(response["Content-Type"], live["Content-Type"])
+
+                response = self.get(
+                    SchemaView, accept=accept, if_none_match=response["ETag"]
+                )
+                self.assertEqual(response.status_code, 304)
+
+    def test_generates_live_only_in_debug(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.get(SchemaView)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.get(SchemaView).status_code, 200)
+
+
+class ConnectionPoolCollectorTests(SimpleTestCase):
+    stats = {
+        "pool_min": 2,
+        "pool_max": 20,
+        "pool_size": 10,
+        "pool_available": 4,
+        "requests_waiting": 2,
+        "requests_num": 100,
+        "requests_queued": 5,
+        "requests_wait_ms": 1500,
+        "requests_errors": 1,
+    }
+
+    def samples(self):
+        return {
+            sample.name: sample.value
+            for family in ConnectionPoolCollector().collect()
+            for sample in family.samples
+        }
+
+    def test_nothing_without_pool(self):
+        self.assertEqual(self.samples(), {})
+
+    def test_reports_pool_stats(self):
+        pool = mock.Mock(closed=False, get_stats=mock.Mock(return_value=self.stats))
+        with mock.patch.dict(
+            settings.DATABASES["default"], {"OPTIONS": {"pool": True}}
+        ), mock.patch.object(connections["default"], "pool", pool, create=True):
+            samples = self.samples()
+            pool.closed = True
+            self.assertEqual(self.samples(), {})
+
+        self.assertEqual(samples["db_pool_connections"], 10)
+        self.assertEqual(samples["db_pool_available_connections"], 4)
+        self.assertEqual(samples["db_pool_waiting_requests"], 2)
+        # Six of the ten open connections are checked out, of twenty at most.
+        self.assertEqual(samples["db_pool_saturation"], 0.3)
+        self.assertEqual(samples["db_pool_checkouts_total"], 100)
+        self.assertEqual(samples["db_pool_queued_checkouts_total"], 5)
+        self.assertEqual(samples["db_pool_wait_seconds_total"], 1.5)
+        self.assertEqual(samples["db_pool_errors_total"], 1)
+
+
+class EchoView(APIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        return Response(request.data)
+
+
+class RendererParserTests(SimpleTestCase):
+    """
+    The default renderers and parsers answer exactly as DRF's JSON ones do,
+    and malformed bodies are client errors.
+    """
+
+    def post(self, body, content_type, **headers):
+        request = APIRequestFactory().post(
+            "/", body, content_type=content_type, headers=headers
+        )
+        return EchoView.as_view()(request).render()
+
+    def test_orjson_matches_json_renderer(self):
+        data = {
+            "rent": Decimal("4500.50"),
+            "created_at": datetime(2027, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+            "available_from": date(2027, 1, 1),
+            "label": gettext_lazy("Apartment"),
+            "text": "Kaapstad \u2028 caf\u00e9 \u2029",
+            "rows": [1, None, True, {2: "two"}],
+        }
+        rendered = ORJSONRenderer().render(data)
+        self.assertEqual(rendered, JSONRenderer().render(data))
+        self.assertIn(b"\\u2028", rendered)
+        self.assertNotIn("\u2029".encode(), rendered)
+
+    def test_msgpack_round_trip(self):
+        data = {"title": "Room 1", "amenities": ["wifi", "parking"], "rooms": 2}
+        response = self.post(
+            msgpack.packb(data), "application/msgpack", accept="application/msgpack"
+        )
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content), data)
+
+    def test_malformed_bodies_are_bad_requests(self):
+        for body, content_type in [
+            (b'{"title": ', "application/json"),
+            (b"\xc1", "application/msgpack"),
+            (b"\x92\x01", "application/msgpack"),
+        ]:
+            with self.subTest(content_type=content_type, body=body):
+                self.assertEqual(self.post(body, content_type).status_code, 400)